@@ -0,0 +1,28 @@
+#! /usr/bin/env python
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import click
+
+from src.app.core.api_keys import generate_api_key, hash_api_key
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command("generate-api-key")
+@click.argument("name")
+@click.option("--role", type=click.Choice(["user", "admin"]), default="user")
+def generate_api_key_command(name: str, role: str):
+    """Print a new API key and the line to add to API_KEYS_FILE."""
+    api_key = generate_api_key()
+    print(f"API key (shown once): {api_key}")
+    print(f"API_KEYS_FILE line:   {name} {hash_api_key(api_key)} {role}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,211 @@
+#! /usr/bin/env python
+import asyncio
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import click
+
+from src.app.core.config import settings
+from src.app.core.db.database import DatabaseSessionManager
+from src.app.core.security import get_password_hash, password_hasher, verify_password
+from src.app.crud.webhook_usage import WebhookUsageCRUD
+from src.app.helpers.url_matcher import UrlMatcher
+from src.app.models.webhook import Webhook
+from src.app.schemas.webhook_usage import WebhookUsageCreate
+
+
+def generate_url_regexes(n: int, rng: random.Random) -> list[str]:
+    """Mostly prefix patterns, like the ones users create from the extension."""
+    url_regexes: list[str] = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.90:
+            url_regexes.append(f"https://site{i}\\.example\\.com/.*")
+        elif roll < 0.99:
+            url_regexes.append(f"https://site{i}\\.example\\.com/articles/\\d+")
+        else:
+            url_regexes.append(f".*/ref-{i}(/|$)")
+    return url_regexes
+
+
+def generate_urls(n_patterns: int, n_urls: int, rng: random.Random) -> list[str]:
+    return [
+        f"https://site{rng.randrange(n_patterns * 2)}.example.com/articles/{i}"
+        for i in range(n_urls)
+    ]
+
+
+def time_per_url(fn, urls: list[str]) -> tuple[float, int]:
+    matches = 0
+    start = time.perf_counter()
+    for url in urls:
+        matches += fn(url)
+    return (time.perf_counter() - start) / len(urls), matches
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command("url-matcher")
+@click.option("--sizes", default="10000,100000,1000000", show_default=True)
+@click.option("--urls", "n_urls", default=50, show_default=True)
+@click.option("--seed", default=42, show_default=True)
+def url_matcher(sizes: str, n_urls: int, seed: int):
+    """Compare UrlMatcher with one re.match per trigger."""
+    for size in [int(size) for size in sizes.split(",")]:
+        rng = random.Random(seed)
+        url_regexes = generate_url_regexes(size, rng)
+        urls = generate_urls(size, n_urls, rng)
+
+        start = time.perf_counter()
+        compiled = [re.compile(url_regex) for url_regex in url_regexes]
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = UrlMatcher()
+        for i, url_regex in enumerate(url_regexes):
+            matcher.add(str(i), url_regex)
+        build_time = time.perf_counter() - start
+
+        loop_time, loop_matches = time_per_url(
+            lambda url: sum(1 for pattern in compiled if pattern.match(url)), urls
+        )
+        matcher_time, matcher_matches = time_per_url(
+            lambda url: len(matcher.match(url)), urls
+        )
+        assert loop_matches == matcher_matches, "matchers disagree"
+
+        print(
+            f"{size:>9} patterns | "
+            f"loop: {loop_time * 1e3:10.3f} ms/url (compile {compile_time:6.2f}s) | "
+            f"matcher: {matcher_time * 1e3:8.3f} ms/url (build {build_time:6.2f}s) | "
+            f"speedup x{loop_time / matcher_time:,.0f}"
+        )
+
+
+async def record_events(
+    manager: DatabaseSessionManager, n_events: int, concurrency: int
+) -> float:
+    """Write the usage rows of ``n_events`` webhook calls, as trigger_event does."""
+    async with manager.connect() as connection:
+        await manager.create_all(connection)
+    async with manager.session() as session:
+        webhook = Webhook(
+            name="bench", url="https://example.com/hook", auth_token="bench"
+        )
+        session.add(webhook)
+        await session.commit()
+        webhook_id = webhook.id
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def record_event() -> None:
+        async with semaphore, manager.session() as session:
+            crud = WebhookUsageCRUD(session)
+            webhook_usage = await crud.create(
+                WebhookUsageCreate(
+                    webhook_id=webhook_id,
+                    event="page_opened",
+                    payload={"url": "https://example.com"},
+                )
+            )
+            await crud.record_attempt(webhook_usage.id, "success", 1)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[record_event() for _ in range(n_events)])
+    return n_events / (time.perf_counter() - start)
+
+
+@cli.command("sqlite-events")
+@click.option("--events", "n_events", default=2000, show_default=True)
+@click.option("--concurrency", default=20, show_default=True)
+def sqlite_events(n_events: int, concurrency: int):
+    """Event write throughput with the default engine and the tuned profile."""
+
+    async def run(tuned: bool) -> float:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            manager = DatabaseSessionManager()
+            host = f"{settings.SQLITE_ASYNC_PREFIX}{tmp_dir}/bench.db"
+            manager.init(host, settings if tuned else None)
+            try:
+                return await record_events(manager, n_events, concurrency)
+            finally:
+                await manager.close()
+
+    default = asyncio.run(run(tuned=False))
+    tuned = asyncio.run(run(tuned=True))
+    print(
+        f"{n_events} events, concurrency {concurrency} | "
+        f"default: {default:8.0f} events/s | "
+        f"tuned: {tuned:8.0f} events/s | "
+        f"speedup x{tuned / default:.1f}"
+    )
+
+
+async def measure_loop_lag(
+    storm: Callable[[], Awaitable[None]], tick: float = 0.01
+) -> tuple[float, float]:
+    """Run ``storm`` while a ticker measures how late the event loop wakes it.
+
+    Returns the storm duration and the worst wake-up delay, in seconds.
+    """
+    max_lag = 0.0
+    done = False
+
+    async def ticker() -> None:
+        nonlocal max_lag
+        while not done:
+            expected = time.perf_counter() + tick
+            await asyncio.sleep(tick)
+            max_lag = max(max_lag, time.perf_counter() - expected)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await storm()
+    duration = time.perf_counter() - start
+    done = True
+    await ticker_task
+    return duration, max_lag
+
+
+@cli.command("login-storm")
+@click.option("--logins", "n_logins", default=20, show_default=True)
+def login_storm(n_logins: int):
+    """Event-loop lag while verifying passwords inline and in the hasher pool."""
+    hashed_password = get_password_hash("password")
+
+    async def inline() -> None:
+        async def login() -> None:
+            verify_password("password", hashed_password)
+
+        await asyncio.gather(*[login() for _ in range(n_logins)])
+
+    async def pooled() -> None:
+        await asyncio.gather(
+            *[
+                password_hasher.verify("password", hashed_password)
+                for _ in range(n_logins)
+            ]
+        )
+
+    for name, storm in [("inline", inline), ("pool", pooled)]:
+        duration, max_lag = asyncio.run(measure_loop_lag(storm))
+        print(
+            f"{n_logins} logins | {name:>6}: {duration * 1e3:8.1f} ms total | "
+            f"max event-loop lag {max_lag * 1e3:8.1f} ms"
+        )
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    cli()
@@ -2,6 +2,9 @@
 import sys
 import os
 import asyncio
+import contextlib
+from datetime import datetime
+from typing import BinaryIO
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -10,24 +13,78 @@ from src.app.seeders.webhook import WebhookSeeder
 from src.app.seeders.trigger import TriggerSeeder
 from src.app.core.db.database import session_manager
 from src.app.core.config import settings
+from src.app.controllers.webhook_usage import (
+    export_webhook_usages,
+    purge_expired_usages,
+)
+from src.app.core.retention import usage_archive
 
 
 import click
+from sqlalchemy.ext.asyncio import create_async_engine
 
 
 async def reinit_db() -> None:
-    session_manager.init(settings.SQLITE_URI)
+    session_manager.init(settings.DATABASE_URI, settings)
     async with session_manager.connect() as connection:
         await session_manager.drop_all(connection)
         await session_manager.create_all(connection)
 
 
+async def migrate_db() -> list[str]:
+    session_manager.init(settings.DATABASE_URI, settings)
+    async with session_manager.connect() as connection:
+        return await session_manager.migrate(connection)
+
+
 async def apply_seed() -> None:
     await reinit_db()
     async with session_manager.session() as session:
         await seed_database(session)
 
 
+async def export_db(output: BinaryIO, format: str, compress: bool, **filters) -> None:
+    # Keep stdout for the export itself
+    with contextlib.redirect_stdout(sys.stderr):
+        session_manager.init(settings.DATABASE_URI, settings)
+    try:
+        async for chunk in export_webhook_usages(format, compress, **filters):
+            output.write(chunk)
+    finally:
+        await session_manager.close()
+
+
+async def purge_db() -> int:
+    session_manager.init(settings.DATABASE_URI, settings)
+    usage_archive.init(settings)
+    try:
+        return await purge_expired_usages()
+    finally:
+        await session_manager.close()
+
+
+async def vacuum_db() -> None:
+    # VACUUM cannot run inside a transaction
+    engine = create_async_engine(settings.DATABASE_URI, isolation_level="AUTOCOMMIT")
+    try:
+        async with engine.connect() as connection:
+            if connection.dialect.name == "sqlite":
+                await connection.exec_driver_sql(
+                    f"PRAGMA auto_vacuum={settings.SQLITE_AUTO_VACUUM}"
+                )
+                await connection.exec_driver_sql("VACUUM")
+            elif connection.dialect.name == "postgresql":
+                # Autovacuum already reuses freed space; refresh the planner
+                # statistics as well after a large purge
+                await connection.exec_driver_sql("VACUUM ANALYZE")
+            else:
+                raise click.ClickException(
+                    f"Cannot vacuum a {connection.dialect.name} database"
+                )
+    finally:
+        await engine.dispose()
+
+
 @click.group()
 def cli():
     pass
@@ -47,5 +104,69 @@ def reset():
     print("Database reset successfully!")
 
 
+@cli.command()
+def migrate():
+    print("Migrating database...")
+    added = asyncio.run(migrate_db())
+    for name in added:
+        print(f"  added {name}")
+    print("Database migrated successfully!")
+
+
+@cli.command()
+@click.option("--output", "-o", type=click.File("wb"), default="-")
+@click.option("--format", type=click.Choice(["ndjson", "csv"]), default="ndjson")
+@click.option("--gzip", "compress", is_flag=True, help="Gzip the output")
+@click.option("--webhook-id")
+@click.option("--status")
+@click.option("--event")
+@click.option("--created-after", type=click.DateTime())
+@click.option("--created-before", type=click.DateTime())
+def export(
+    output: BinaryIO,
+    format: str,
+    compress: bool,
+    webhook_id: str | None,
+    status: str | None,
+    event: str | None,
+    created_after: datetime | None,
+    created_before: datetime | None,
+):
+    """Write the webhook usage history as NDJSON or CSV."""
+    click.echo("Exporting webhook usage...", err=True)
+    asyncio.run(
+        export_db(
+            output,
+            format,
+            compress,
+            webhook_id=webhook_id,
+            status=status,
+            event=event,
+            created_after=created_after,
+            created_before=created_before,
+        )
+    )
+    click.echo("Webhook usage exported successfully!", err=True)
+
+
+@cli.command()
+def purge():
+    """Delete (and archive) webhook usages past their retention."""
+    print("Purging expired webhook usages...")
+    deleted = asyncio.run(purge_db())
+    print(f"Deleted {deleted} webhook usages")
+
+
+@cli.command()
+def vacuum():
+    """Rebuild the SQLite file, applying SQLITE_AUTO_VACUUM.
+
+    On PostgreSQL, runs VACUUM ANALYZE instead.
+    """
+    print("Vacuuming database...")
+    asyncio.run(vacuum_db())
+    print("Database vacuumed successfully!")
+
+
 if __name__ == "__main__":
     cli()
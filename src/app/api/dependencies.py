@@ -1,33 +1,71 @@
-from typing import Annotated
+from typing import Annotated, TypeVar
 
-from fastapi import Depends, HTTPException, Security, status
+from fastapi import Depends, HTTPException, Query, Response, Security, status
 from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.controllers.auth import AuthController
+from src.app.controllers.user import ANONYMOUS_USER
+from src.app.core.api_keys import api_key_store
 from src.app.core.config import settings
 from src.app.core.db.database import async_get_db
+from src.app.crud.pagination import Page
 from src.app.schemas.user import User as UserSchema
 
-header_scheme = APIKeyHeader(name="X-Hercule-Secret-Key")
+header_scheme = APIKeyHeader(name="X-Hercule-Secret-Key", auto_error=False)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
 
+T = TypeVar("T")
+
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
+    api_key: Annotated[str | None, Security(header_scheme)],
     db: Annotated[AsyncSession, Depends(async_get_db)],
 ) -> UserSchema:
-    auth_ctrl = AuthController(db)
     if not settings.AUTH_REQUIRED:
-        return auth_ctrl.get_anon_user()
+        return ANONYMOUS_USER
+
+    if api_key:
+        user = api_key_store.authenticate(api_key)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key"
+            )
+        return user
 
-    return await auth_ctrl.get_current_user(token)
+    return await AuthController(db).get_current_user(token)
 
 
 async def get_current_admin_user(
     current_user: Annotated[UserSchema, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)],
 ) -> UserSchema:
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
     return current_user
+
+
+class Pagination:
+    """``cursor`` and ``limit`` query parameters of the list endpoints.
+
+    The page after the returned one is fetched by passing back the
+    ``X-Next-Cursor`` response header as ``cursor``; the header is absent on
+    the last page.
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        cursor: str | None = None,
+        limit: Annotated[int | None, Query(ge=1)] = None,
+    ):
+        self.response = response
+        self.cursor = cursor
+        self.limit = min(
+            limit or settings.API_PAGE_DEFAULT_LIMIT, settings.API_PAGE_MAX_LIMIT
+        )
+
+    def items(self, page: Page[T]) -> list[T]:
+        if page.next_cursor is not None:
+            self.response.headers["X-Next-Cursor"] = page.next_cursor
+        return page.items
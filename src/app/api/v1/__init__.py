@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from .auth import router as auth_router
+from .blob import router as blob_router
 from .system import router as system_router
 from .trigger import router as trigger_router
 from .user import router as user_router
@@ -10,6 +11,7 @@ from .webpush import router as webpush_router
 
 router = APIRouter(prefix="/v1")
 router.include_router(auth_router)
+router.include_router(blob_router)
 router.include_router(system_router)
 router.include_router(webhook_router)
 router.include_router(webhook_usage_router)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from src.app.core.blob_store import blob_store, is_blob_digest
+
+# No user authentication: the signature of the URL handed to the webhook is
+router = APIRouter(tags=["blob"])
+
+
+@router.get("/blobs/{digest}")
+async def get_blob(digest: str, expires: int, signature: str) -> FileResponse:
+    if not is_blob_digest(digest) or not blob_store.verify(digest, expires, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired signature")
+
+    path = blob_store.path(digest)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Blob not found")
+
+    return FileResponse(
+        path,
+        media_type="text/html; charset=utf-8",
+        headers={
+            "Cache-Control": "private, max-age=86400, immutable",
+            "ETag": digest,
+            # Caller-supplied HTML: never run it with the API's origin
+            "Content-Security-Policy": "sandbox",
+            "X-Content-Type-Options": "nosniff",
+        },
+    )
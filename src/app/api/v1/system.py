@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 
-from src.app.api.dependencies import get_current_user
+from src.app.api.dependencies import get_current_admin_user, get_current_user
+from src.app.helpers.cache import CacheStats, user_cache
 
 router = APIRouter(tags=["system"])
 
@@ -18,3 +19,8 @@ async def ping_secured():
 @router.get("/version")
 async def version():
     return {"version": "0.1.0"}
+
+
+@router.get("/cache-stats", dependencies=[Depends(get_current_admin_user)])
+async def cache_stats() -> dict[str, CacheStats]:
+    return {"auth": user_cache.stats()}
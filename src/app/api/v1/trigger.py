@@ -1,13 +1,22 @@
 from typing import Annotated, Any, Mapping, cast
 
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Response, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.api.dependencies import get_current_admin_user, get_current_user
+from src.app.api.dependencies import (
+    Pagination,
+    get_current_admin_user,
+    get_current_user,
+)
 from src.app.controllers.trigger import TriggerController
+from src.app.core.config import settings
 from src.app.core.db.database import async_get_db
-from src.app.schemas.trigger import TriggerCreateClient, TriggerUpdate
+from src.app.schemas.trigger import (
+    TriggerCreateClient,
+    TriggerEventPayload,
+    TriggerUpdate,
+)
 from src.app.schemas.user import User as UserSchema
 from src.app.types.events import EventContext, EventType
 
@@ -36,11 +45,15 @@ async def get_trigger(
 @router.get("/triggers")
 async def get_triggers(
     db: Annotated[AsyncSession, Depends(async_get_db)],
+    pagination: Annotated[Pagination, Depends()],
     event: EventType | None = None,
     url: str | None = None,
 ):
     trigger_ctrl = TriggerController(db)
-    return await trigger_ctrl.list(event=event, url=url)
+    page = await trigger_ctrl.list(
+        pagination.cursor, pagination.limit, event=event, url=url
+    )
+    return pagination.items(page)
 
 
 @router.put("/trigger/{trigger_id}")
@@ -82,20 +95,18 @@ async def run_trigger(
     )
 
 
-class TriggerEventPayload(BaseModel):
-    event: EventType
-    context: EventContext
-    web_push_subscription: dict[str, Any] | None = None
-
-
 @router.post("/triggers/event")
 async def trigger_event(
     payload: TriggerEventPayload,
+    response: Response,
     current_user: Annotated[UserSchema, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(async_get_db)],
 ):
     trigger_ctrl = TriggerController(db)
 
+    if settings.WEBHOOK_DISPATCH_MODE == "async":
+        response.status_code = status.HTTP_202_ACCEPTED
+
     events_results = await trigger_ctrl.trigger_event(
         event=payload.event,
         current_user=current_user,
@@ -103,3 +114,20 @@ async def trigger_event(
         web_push_subscription=payload.web_push_subscription,
     )
     return events_results
+
+
+@router.post("/triggers/events")
+async def trigger_events(
+    payloads: Annotated[
+        list[TriggerEventPayload], Body(max_length=settings.EVENTS_BATCH_MAX_SIZE)
+    ],
+    response: Response,
+    current_user: Annotated[UserSchema, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+):
+    trigger_ctrl = TriggerController(db)
+
+    if settings.WEBHOOK_DISPATCH_MODE == "async":
+        response.status_code = status.HTTP_202_ACCEPTED
+
+    return await trigger_ctrl.trigger_events(payloads, current_user)
@@ -3,7 +3,7 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.api.dependencies import get_current_admin_user
+from src.app.api.dependencies import Pagination, get_current_admin_user
 from src.app.controllers.user import UserController
 from src.app.core.db.database import async_get_db
 from src.app.schemas.user import User as UserSchema
@@ -22,6 +22,8 @@ async def get_user(
 @router.get("/users", status_code=status.HTTP_200_OK)
 async def get_users(
     db: Annotated[AsyncSession, Depends(async_get_db)],
+    pagination: Annotated[Pagination, Depends()],
 ) -> list[UserSchema]:
     user_ctrl = UserController(db)
-    return await user_ctrl.list()
+    page = await user_ctrl.list(pagination.cursor, pagination.limit)
+    return pagination.items(page)
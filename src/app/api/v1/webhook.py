@@ -3,9 +3,14 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.api.dependencies import get_current_admin_user, get_current_user
+from src.app.api.dependencies import (
+    Pagination,
+    get_current_admin_user,
+    get_current_user,
+)
 from src.app.controllers.webhook import WebhookController
 from src.app.core.db.database import async_get_db
+from src.app.helpers.circuit_breaker import CircuitBreakerSnapshot, circuit_breakers
 from src.app.schemas.user import User as UserSchema
 from src.app.schemas.webhook import WebhookCreate, WebhookUpdate
 
@@ -34,9 +39,18 @@ async def get_webhook(
 @router.get("/webhooks")
 async def get_webhooks(
     db: Annotated[AsyncSession, Depends(async_get_db)],
+    pagination: Annotated[Pagination, Depends()],
 ):
     webhook_ctrl = WebhookController(db)
-    return await webhook_ctrl.list()
+    page = await webhook_ctrl.list(pagination.cursor, pagination.limit)
+    return pagination.items(page)
+
+
+@router.get(
+    "/webhooks/circuit-breakers", dependencies=[Depends(get_current_admin_user)]
+)
+async def get_circuit_breakers() -> list[CircuitBreakerSnapshot]:
+    return circuit_breakers.snapshots()
 
 
 @router.put("/webhook/{webhook_id}")
@@ -1,21 +1,82 @@
+from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.api.dependencies import get_current_user
-from src.app.controllers.webhook_usage import WebhookUsageController
+from src.app.api.dependencies import (
+    Pagination,
+    get_current_admin_user,
+    get_current_user,
+)
+from src.app.controllers.webhook_usage import (
+    WebhookUsageController,
+    export_webhook_usages,
+)
 from src.app.core.config import Settings
 from src.app.core.db.database import async_get_db
+from src.app.helpers.export import MEDIA_TYPES, ExportFormat, export_filename
+from src.app.models.webhook_usage import WebhookUsageStatus
 from src.app.schemas.user import User as UserSchema
 from src.app.schemas.webhook_usage import WebhookUsage as WebhookUsageSchema
 from src.app.schemas.webhook_usage import WebhookUsageCallbackPayload
+from src.app.types.events import EventType
 
 settings = Settings()
 router = APIRouter(tags=["webhook_usage"], dependencies=[Depends(get_current_user)])
 
 
+@router.get("/webhook-usages", dependencies=[Depends(get_current_admin_user)])
+async def get_webhook_usages(
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+    pagination: Annotated[Pagination, Depends()],
+    webhook_id: str | None = None,
+    status: WebhookUsageStatus | None = None,
+    event: EventType | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> list[WebhookUsageSchema]:
+    webhook_usage_ctrl = WebhookUsageController(db)
+    page = await webhook_usage_ctrl.list(
+        pagination.cursor,
+        pagination.limit,
+        webhook_id=webhook_id,
+        status=status,
+        event=event,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    return pagination.items(page)
+
+
+@router.get("/webhook-usages/export", dependencies=[Depends(get_current_admin_user)])
+async def get_webhook_usages_export(
+    format: ExportFormat = "ndjson",
+    gzip: bool = False,
+    webhook_id: str | None = None,
+    status: WebhookUsageStatus | None = None,
+    event: EventType | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> StreamingResponse:
+    chunks = export_webhook_usages(
+        format,
+        gzip,
+        webhook_id=webhook_id,
+        status=status,
+        event=event,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    filename = export_filename("webhook_usage", format, gzip)
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/webhook-usage/{webhook_usage_id}")
 async def get_webhook_usage(
     webhook_usage_id: str,
@@ -28,7 +28,5 @@ class SendWebpushBody(BaseModel):
 async def send_webpush(
     payload: SendWebpushBody,
 ):
-    success = await send_webpush_helper(
-        payload.subscription.model_dump(), payload.payload
-    )
+    success = await send_webpush_helper(payload.subscription, payload.payload)
     return JSONResponse(content={"success": success})
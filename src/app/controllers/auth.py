@@ -2,7 +2,9 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.controllers.user import UserController
-from src.app.core.security import create_access_token, verify_password, verify_token
+from src.app.core.config import settings
+from src.app.core.security import create_access_token, decode_token, password_hasher
+from src.app.helpers.cache import user_cache
 from src.app.schemas.auth import AuthLogin, AuthLoginResponse, Token
 from src.app.schemas.user import User as UserSchema
 from src.app.schemas.user import UserUnsafe
@@ -27,7 +29,7 @@ class AuthController:
         if not user:
             raise credentials_exception
 
-        if not verify_password(auth_login.password, user.hashed_password):
+        if not await password_hasher.verify(auth_login.password, user.hashed_password):
             raise credentials_exception
 
         access_token = create_access_token(data={"sub": user.email})
@@ -57,12 +59,20 @@ class AuthController:
         if not token:
             raise credentials_exception
 
-        email = verify_token(token)
-        if not email:
+        if settings.AUTH_CACHE_ENABLED:
+            cached_user = user_cache.get(token)
+            if cached_user is not None:
+                return cached_user
+
+        payload = decode_token(token)
+        if not payload or not payload.get("sub"):
             raise credentials_exception
         user_ctrl = UserController(self.db)
 
-        user = await user_ctrl.get_by_email(email)
+        user = await user_ctrl.get_by_email(payload["sub"])
         if not user:
             raise credentials_exception
+
+        if settings.AUTH_CACHE_ENABLED:
+            user_cache.set(token, user, expires_at=payload.get("exp"))
         return user
@@ -0,0 +1,65 @@
+import math
+import time
+
+from fastapi import HTTPException
+
+from src.app.core.config import settings
+from src.app.core.db.database import session_manager
+from src.app.crud.rate_limit import RateLimitCRUD
+from src.app.helpers.rate_limit import rate_limiter
+from src.app.schemas.user import User as UserSchema
+from src.app.schemas.webhook import Webhook as WebhookSchema
+
+
+def retry_after_header(retry_after: float) -> dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(retry_after)))}
+
+
+class RateLimitController:
+    """Token-bucket limits on events per user and deliveries per webhook.
+
+    Buckets live in process by default. With ``RATE_LIMIT_BACKEND=database``
+    they are shared by every worker through the ``rate_limit_buckets`` table,
+    at the cost of one write per check.
+    """
+
+    async def take(
+        self, key: str, rate: float, burst: float, cost: float = 1.0
+    ) -> float:
+        """Take ``cost`` tokens, or return the seconds until there are enough."""
+        if not settings.RATE_LIMIT_ENABLED or rate <= 0:
+            return 0.0
+
+        if settings.RATE_LIMIT_BACKEND == "database":
+            async with session_manager.session() as session:
+                return await RateLimitCRUD(session).take(
+                    key, rate, burst, cost, time.time()
+                )
+        return rate_limiter.take(key, rate, burst, cost)
+
+    async def check_user(self, user: UserSchema, events: int = 1) -> None:
+        rate, burst = settings.RATE_LIMIT_USER_RATE, settings.RATE_LIMIT_USER_BURST
+        if settings.RATE_LIMIT_ENABLED and rate > 0 and events > burst:
+            # Could never be granted, however long the client waits
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch larger than the rate limit burst of {burst} events",
+            )
+        retry_after = await self.take(f"user:{user.id}", rate, burst, events)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded",
+                headers=retry_after_header(retry_after),
+            )
+
+    async def take_webhook(self, webhook: WebhookSchema, deliveries: int = 1) -> float:
+        rate = webhook.rate_limit_per_second
+        if rate is None:
+            rate = settings.RATE_LIMIT_WEBHOOK_RATE
+        burst = webhook.rate_limit_burst or settings.RATE_LIMIT_WEBHOOK_BURST
+        # A batch is one request to the receiver, sized by the webhook's owner:
+        # a full bucket lets it through
+        return await self.take(
+            f"webhook:{webhook.id}", rate, burst, min(deliveries, burst)
+        )
@@ -1,22 +1,57 @@
+import asyncio
 import logging
-import re
-from typing import Any, List, Literal, Mapping, TypedDict, cast, overload
+from dataclasses import dataclass
+from typing import Any, Callable, List, Mapping, Sequence, TypeAlias, cast
 
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.controllers.base import BaseController
-from src.app.controllers.webhook import WebhookCallResult, WebhookController
+from src.app.controllers.rate_limit import RateLimitController
+from src.app.controllers.webhook import (
+    WebhookCallError,
+    WebhookCallQueued,
+    WebhookCallResult,
+    WebhookController,
+)
+from src.app.controllers.webhook_usage import WebhookUsageController
+from src.app.core.config import settings
+from src.app.core.db.database import session_manager
+from src.app.core.delivery import DeliveryQueueFull, WebhookDelivery, delivery_queue
+from src.app.core.outbox import lease_keeper
+from src.app.crud.pagination import Page
 from src.app.crud.trigger import TriggerCRUD
+from src.app.helpers import canonical_json
+from src.app.helpers.trigger_index import compile_url_regex, trigger_index
 from src.app.models.trigger import Trigger as TriggerModel
 from src.app.schemas.trigger import Trigger as TriggerSchema
-from src.app.schemas.trigger import TriggerCreate, TriggerCreateClient, TriggerUpdate
+from src.app.schemas.trigger import (
+    TriggerCreate,
+    TriggerCreateClient,
+    TriggerEventPayload,
+    TriggerUpdate,
+)
+from src.app.schemas.webhook import Webhook as WebhookSchema
 from src.app.schemas.webhook import WebhookCreate
 from src.app.schemas.user import User as UserSchema
 from src.app.types.events import EventContext, EventType
 
 logger = logging.getLogger(__name__)
 
+TriggerEventResult: TypeAlias = WebhookCallResult | WebhookCallError | WebhookCallQueued
+
+
+@dataclass(slots=True)
+class BatchDelivery:
+    """One webhook call of a batch, and where its result goes."""
+
+    event_index: int
+    slot: int
+    trigger: TriggerSchema
+    payload: TriggerEventPayload
+    context_json: bytes | None = None
+    webhook_usage_id: str | None = None
+
 
 class TriggerController(BaseController[TriggerSchema, TriggerModel]):
     def __init__(self, db: AsyncSession):
@@ -51,10 +86,13 @@ class TriggerController(BaseController[TriggerSchema, TriggerModel]):
         return await self.crud.read_safe(trigger_id)
 
     async def list(
-        self, event: EventType | None = None, url: str | None = None
-    ) -> list[TriggerSchema]:
-        event_triggers = await self.crud.list(event=event)
-        return event_triggers
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+        event: EventType | None = None,
+        url: str | None = None,
+    ) -> Page[TriggerSchema]:
+        return await self.crud.list(cursor, limit, event=event)
 
     async def update(self, trigger_id: str, trigger: TriggerUpdate) -> TriggerSchema:
         return await self.crud.update(trigger_id, trigger)
@@ -62,11 +100,42 @@ class TriggerController(BaseController[TriggerSchema, TriggerModel]):
     async def delete(self, trigger_id: str) -> None:
         return await self.crud.delete(trigger_id)
 
+    async def load_index(self) -> None:
+        await trigger_index.ensure_fresh(
+            self.crud.list_all,
+            self.crud.version,
+            settings.TRIGGER_INDEX_REFRESH_INTERVAL,
+        )
+
+    async def read_indexed(self, trigger_id: str) -> TriggerSchema:
+        await self.load_index()
+        trigger = trigger_index.get(trigger_id)
+        if trigger is None:
+            raise HTTPException(status_code=404, detail="Trigger not found")
+        return trigger
+
+    async def match(
+        self, event: EventType, context: EventContext
+    ) -> List[TriggerSchema]:
+        await self.load_index()
+        return trigger_index.match(event, context.get("user_id"), context.get("url"))
+
+    async def match_event(
+        self, event: EventType, context: EventContext
+    ) -> List[TriggerSchema]:
+        if "trigger_id" in context:
+            trigger = await self.read_indexed(context["trigger_id"])
+            return [trigger] if self.should_trigger(trigger, context) else []
+
+        return await self.match(event, context)
+
     def should_trigger(self, trigger: TriggerSchema, context: EventContext) -> bool:
         if trigger.url_regex is not None:
             url = context.get("url")
-            if url is not None and not re.match(trigger.url_regex, url):
-                return False
+            if url is not None:
+                pattern = compile_url_regex(trigger.url_regex)
+                if pattern is None or not pattern.match(url):
+                    return False
 
         if trigger.user_id is not None and trigger.user_id != context.get("user_id"):
             return False
@@ -84,16 +153,35 @@ class TriggerController(BaseController[TriggerSchema, TriggerModel]):
         web_push_subscription: dict[str, Any] | None = None,
     ) -> WebhookCallResult:
         trigger = await self.read_safe(trigger_id)
-        webhook_ctrl = WebhookController(self.db)
-
-        if trigger.webhook_id is None:
-            raise HTTPException(status_code=422, detail="Trigger should have a webhook")
 
         if not self.should_trigger(trigger, context):
             raise HTTPException(status_code=422, detail="Trigger has been filtered out")
 
+        webpush_subscription_id = await WebhookUsageController(
+            self.db
+        ).resolve_subscription(web_push_subscription)
+        return await self.dispatch(trigger, event, context, webpush_subscription_id)
+
+    async def dispatch(
+        self,
+        trigger: TriggerSchema,
+        event: EventType,
+        context: EventContext,
+        webpush_subscription_id: str | None = None,
+        context_json: bytes | None = None,
+        on_usage: Callable[[str], None] | None = None,
+    ) -> WebhookCallResult:
+        if trigger.webhook_id is None:
+            raise HTTPException(status_code=422, detail="Trigger should have a webhook")
+
+        webhook_ctrl = WebhookController(self.db)
         return await webhook_ctrl.call(
-            trigger.webhook_id, event, context, web_push_subscription
+            trigger.webhook_id,
+            event,
+            context,
+            webpush_subscription_id,
+            context_json,
+            on_usage=on_usage,
         )
 
     async def trigger_event(
@@ -102,26 +190,397 @@ class TriggerController(BaseController[TriggerSchema, TriggerModel]):
         context: EventContext,
         current_user: UserSchema,
         web_push_subscription: dict[str, Any] | None = None,
-    ) -> List[WebhookCallResult]:
-        triggers_results: list[WebhookCallResult] = []
-
-        if "trigger_id" in context:
-            triggers = [await self.read_safe(context["trigger_id"])]
-        else:
-            triggers = await self.list(event=event)
+    ) -> List[WebhookCallResult | WebhookCallError | WebhookCallQueued]:
+        await RateLimitController().check_user(current_user)
+        context["user_id"] = current_user.id
+        triggers_to_trigger = await self.match_event(event, context)
+        if not triggers_to_trigger:
+            return []
 
-        triggers_to_trigger: list[TriggerSchema] = []
+        # Encoded once for all the webhooks, however large the page content
+        context_json = canonical_json.dumps(context)
+        # Stored once for all the webhooks' usages
+        webpush_subscription_id = await WebhookUsageController(
+            self.db
+        ).resolve_subscription(web_push_subscription)
 
-        context["user_id"] = current_user.id
+        if settings.WEBHOOK_DISPATCH_MODE == "async":
+            return await self.enqueue(
+                triggers_to_trigger,
+                event,
+                context,
+                webpush_subscription_id,
+                context_json,
+            )
 
-        for trigger in triggers:
-            if self.should_trigger(trigger, context):
-                triggers_to_trigger.append(trigger)
+        if settings.WEBHOOK_DISPATCH_MODE == "concurrent":
+            return await self.dispatch_concurrently(
+                triggers_to_trigger,
+                event,
+                context,
+                webpush_subscription_id,
+                context_json,
+            )
 
+        triggers_results: list[
+            WebhookCallResult | WebhookCallError | WebhookCallQueued
+        ] = []
         for trigger in triggers_to_trigger:
-            trigger_result = await self.trigger(
-                trigger.id, event, context, web_push_subscription
+            trigger_result = await self.dispatch(
+                trigger, event, context, webpush_subscription_id, context_json
             )
             triggers_results.append(trigger_result)
 
         return triggers_results
+
+    async def enqueue(
+        self,
+        triggers: List[TriggerSchema],
+        event: EventType,
+        context: EventContext,
+        webpush_subscription_id: str | None = None,
+        context_json: bytes | None = None,
+    ) -> List[WebhookCallResult | WebhookCallError | WebhookCallQueued]:
+        """Record a pending ``webhook_usage`` per trigger and queue its delivery.
+
+        The request is refused with a 429 only while nothing is recorded yet.
+        Once usages exist, a queue that fills up in the meantime gives the
+        remaining triggers an error entry, as ``enqueue_batch`` does, so that a
+        retrying client does not deliver the queued ones twice.
+        """
+        triggers = [trigger for trigger in triggers if trigger.webhook_id is not None]
+        if len(triggers) > delivery_queue.free_slots:
+            raise HTTPException(
+                status_code=429,
+                detail="Webhook delivery queue is full",
+                headers={"Retry-After": "1"},
+            )
+
+        webhook_ctrl = WebhookController(self.db)
+        queued: list[WebhookCallResult | WebhookCallError | WebhookCallQueued] = []
+        for trigger in triggers:
+            webhook_id = cast(str, trigger.webhook_id)
+            webhook_usage = await webhook_ctrl.create_usage(
+                webhook_id, event, webpush_subscription_id, context
+            )
+            try:
+                delivery_queue.enqueue(
+                    WebhookDelivery(
+                        webhook_usage_id=webhook_usage.id,
+                        webhook_id=webhook_id,
+                        event=event,
+                        context=context,
+                        context_json=context_json,
+                    )
+                )
+            except DeliveryQueueFull:
+                await webhook_ctrl.webhook_usage_ctrl.update_status(
+                    webhook_usage.id, "error"
+                )
+                queued.append(
+                    WebhookCallError(
+                        status="error",
+                        trigger_id=trigger.id,
+                        detail="Webhook delivery queue is full",
+                    )
+                )
+                continue
+            # Kept leased while queued, released by deliver_queued
+            lease_keeper.hold(webhook_usage.id)
+
+            queued.append(
+                WebhookCallQueued(
+                    status="pending",
+                    trigger_id=trigger.id,
+                    webhook_usage_id=webhook_usage.id,
+                )
+            )
+
+        return queued
+
+    async def dispatch_concurrently(
+        self,
+        triggers: List[TriggerSchema],
+        event: EventType,
+        context: EventContext,
+        webpush_subscription_id: str | None = None,
+        context_json: bytes | None = None,
+    ) -> List[WebhookCallResult | WebhookCallError | WebhookCallQueued]:
+        """Call the webhooks of ``triggers`` in parallel.
+
+        Results keep the order of ``triggers``. A failing webhook gets a
+        ``WebhookCallError`` entry instead of aborting the other calls. A call
+        cut by the dispatch deadline after its usage was recorded is left
+        ``pending`` for the outbox, and reported as such.
+        """
+        if not triggers:
+            return []
+
+        semaphore = asyncio.Semaphore(max(1, settings.WEBHOOK_MAX_CONCURRENCY))
+        usage_ids: dict[int, str] = {}
+
+        async def run(index: int, trigger: TriggerSchema) -> WebhookCallResult:
+            def record_usage(usage_id: str) -> None:
+                usage_ids[index] = usage_id
+
+            async with semaphore:
+                # Sessions cannot be shared between concurrent tasks
+                async with session_manager.session() as session:
+                    trigger_ctrl = TriggerController(session)
+                    return await trigger_ctrl.dispatch(
+                        trigger,
+                        event,
+                        context,
+                        webpush_subscription_id,
+                        context_json,
+                        on_usage=record_usage,
+                    )
+
+        tasks = [
+            asyncio.create_task(run(index, trigger))
+            for index, trigger in enumerate(triggers)
+        ]
+        _, pending = await asyncio.wait(
+            tasks, timeout=settings.WEBHOOK_DISPATCH_DEADLINE
+        )
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+        triggers_results: list[
+            WebhookCallResult | WebhookCallError | WebhookCallQueued
+        ] = []
+        for index, (trigger, task) in enumerate(zip(triggers, tasks)):
+            if task in pending and index in usage_ids:
+                triggers_results.append(
+                    WebhookCallQueued(
+                        status="pending",
+                        trigger_id=trigger.id,
+                        webhook_usage_id=usage_ids[index],
+                    )
+                )
+                continue
+            if task in pending:
+                detail: Any = "Webhook call exceeded the dispatch deadline"
+            elif (error := task.exception()) is None:
+                triggers_results.append(task.result())
+                continue
+            elif isinstance(error, HTTPException):
+                detail = error.detail
+            else:
+                logger.error(f"Webhook call for trigger {trigger.id} failed: {error}")
+                detail = str(error)
+
+            triggers_results.append(
+                WebhookCallError(status="error", trigger_id=trigger.id, detail=detail)
+            )
+
+        return triggers_results
+
+    async def trigger_events(
+        self, payloads: Sequence[TriggerEventPayload], current_user: UserSchema
+    ) -> List[List[TriggerEventResult]]:
+        """Handle a batch of events sent by ``current_user``.
+
+        All events are matched first. The webhooks of every match are read in
+        one query and their usage rows written in one transaction. Results
+        come back per event in the order of ``payloads``, and a failing
+        delivery gets a ``WebhookCallError`` instead of failing the batch.
+        """
+        await RateLimitController().check_user(current_user, len(payloads))
+        await self.load_index()
+
+        results: list[list[TriggerEventResult | None]] = []
+        deliveries: list[BatchDelivery] = []
+        for event_index, payload in enumerate(payloads):
+            payload.context["user_id"] = current_user.id
+            try:
+                triggers = await self.match_event(payload.event, payload.context)
+            except HTTPException as e:
+                trigger_id = cast(str, payload.context.get("trigger_id", ""))
+                results.append(
+                    [
+                        WebhookCallError(
+                            status="error", trigger_id=trigger_id, detail=e.detail
+                        )
+                    ]
+                )
+                continue
+
+            results.append([None] * len(triggers))
+            if not triggers:
+                continue
+            context_json = canonical_json.dumps(payload.context)
+            deliveries.extend(
+                BatchDelivery(event_index, slot, trigger, payload, context_json)
+                for slot, trigger in enumerate(triggers)
+            )
+
+        webhook_ctrl = WebhookController(self.db)
+        webhooks = await webhook_ctrl.read_many(
+            cast(str, delivery.trigger.webhook_id)
+            for delivery in deliveries
+            if delivery.trigger.webhook_id is not None
+        )
+
+        deliverable: list[BatchDelivery] = []
+        for delivery in deliveries:
+            if delivery.trigger.webhook_id is None:
+                detail = "Trigger should have a webhook"
+            elif delivery.trigger.webhook_id not in webhooks:
+                detail = "Webhook not found"
+            else:
+                deliverable.append(delivery)
+                continue
+            results[delivery.event_index][delivery.slot] = WebhookCallError(
+                status="error", trigger_id=delivery.trigger.id, detail=detail
+            )
+
+        is_async = settings.WEBHOOK_DISPATCH_MODE == "async"
+        if is_async and len(deliverable) > delivery_queue.free_slots:
+            raise HTTPException(
+                status_code=429,
+                detail="Webhook delivery queue is full",
+                headers={"Retry-After": "1"},
+            )
+
+        webhook_usage_ctrl = webhook_ctrl.webhook_usage_ctrl
+        webpush_subscription_ids = await webhook_usage_ctrl.resolve_subscriptions(
+            [delivery.payload.web_push_subscription for delivery in deliverable]
+        )
+        webhook_usages = await webhook_usage_ctrl.create_many(
+            [
+                webhook_ctrl.build_usage(
+                    cast(str, delivery.trigger.webhook_id),
+                    delivery.payload.event,
+                    webpush_subscription_id,
+                    delivery.payload.context,
+                )
+                for delivery, webpush_subscription_id in zip(
+                    deliverable, webpush_subscription_ids
+                )
+            ]
+        )
+        for delivery, webhook_usage in zip(deliverable, webhook_usages):
+            delivery.webhook_usage_id = webhook_usage.id
+
+        if is_async:
+            await self.enqueue_batch(deliverable, results)
+        else:
+            await self.deliver_batch(deliverable, webhooks, results)
+
+        return cast(List[List[TriggerEventResult]], results)
+
+    async def enqueue_batch(
+        self,
+        deliveries: List[BatchDelivery],
+        results: List[List[TriggerEventResult | None]],
+    ) -> None:
+        webhook_usage_ctrl = WebhookUsageController(self.db)
+        for delivery in deliveries:
+            webhook_usage_id = cast(str, delivery.webhook_usage_id)
+            try:
+                delivery_queue.enqueue(
+                    WebhookDelivery(
+                        webhook_usage_id=webhook_usage_id,
+                        webhook_id=cast(str, delivery.trigger.webhook_id),
+                        event=delivery.payload.event,
+                        context=delivery.payload.context,
+                        context_json=delivery.context_json,
+                    )
+                )
+            except DeliveryQueueFull:
+                await webhook_usage_ctrl.update_status(webhook_usage_id, "error")
+                result: TriggerEventResult = WebhookCallError(
+                    status="error",
+                    trigger_id=delivery.trigger.id,
+                    detail="Webhook delivery queue is full",
+                )
+            else:
+                lease_keeper.hold(webhook_usage_id)
+                result = WebhookCallQueued(
+                    status="pending",
+                    trigger_id=delivery.trigger.id,
+                    webhook_usage_id=webhook_usage_id,
+                )
+            results[delivery.event_index][delivery.slot] = result
+
+    async def deliver_batch(
+        self,
+        deliveries: List[BatchDelivery],
+        webhooks: Mapping[str, WebhookSchema],
+        results: List[List[TriggerEventResult | None]],
+    ) -> None:
+        """Send ``deliveries`` grouped by webhook.
+
+        Each group is sent in order over one session, groups run in parallel
+        (one at a time in sequential mode) until the dispatch deadline.
+        """
+        groups: dict[str, list[BatchDelivery]] = {}
+        for delivery in deliveries:
+            groups.setdefault(cast(str, delivery.trigger.webhook_id), []).append(
+                delivery
+            )
+
+        concurrency = settings.WEBHOOK_MAX_CONCURRENCY
+        if settings.WEBHOOK_DISPATCH_MODE == "sequential":
+            concurrency = 1
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(webhook: WebhookSchema, group: List[BatchDelivery]) -> None:
+            async with semaphore, session_manager.session() as session:
+                webhook_ctrl = WebhookController(session)
+
+                async def deliver(delivery: BatchDelivery) -> None:
+                    try:
+                        result: TriggerEventResult = await webhook_ctrl.deliver(
+                            webhook,
+                            cast(str, delivery.webhook_usage_id),
+                            delivery.payload.event,
+                            delivery.payload.context,
+                            context_json=delivery.context_json,
+                        )
+                    except Exception as e:
+                        if not isinstance(e, HTTPException):
+                            logger.error(
+                                f"Webhook call for trigger {delivery.trigger.id} "
+                                f"failed: {e}"
+                            )
+                        result = WebhookCallError(
+                            status="error",
+                            trigger_id=delivery.trigger.id,
+                            detail=e.detail if isinstance(e, HTTPException) else str(e),
+                        )
+                    results[delivery.event_index][delivery.slot] = result
+
+                if (webhook.batch_max_size or 1) > 1:
+                    # Batched deliveries don't use the session: submit them
+                    # together so they can share a request.
+                    await asyncio.gather(*[deliver(delivery) for delivery in group])
+                else:
+                    for delivery in group:
+                        await deliver(delivery)
+
+        tasks = [
+            asyncio.create_task(run(webhooks[webhook_id], group))
+            for webhook_id, group in groups.items()
+        ]
+        if not tasks:
+            return
+
+        _, pending = await asyncio.wait(
+            tasks, timeout=settings.WEBHOOK_DISPATCH_DEADLINE
+        )
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+        for delivery in deliveries:
+            if results[delivery.event_index][delivery.slot] is None:
+                results[delivery.event_index][delivery.slot] = WebhookCallError(
+                    status="error",
+                    trigger_id=delivery.trigger.id,
+                    detail="Webhook call exceeded the dispatch deadline",
+                )
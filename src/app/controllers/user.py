@@ -4,6 +4,7 @@ from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.controllers.base import BaseController
+from src.app.crud.pagination import Page
 from src.app.crud.user import UserCRUD
 from src.app.models.user import User as UserModel
 from src.app.schemas.user import User as UserSchema
@@ -11,6 +12,16 @@ from src.app.schemas.user import UserCreate
 
 logger = logging.getLogger(__name__)
 
+# Principal of every request when AUTH_REQUIRED is off, built once
+ANONYMOUS_USER = UserSchema(
+    id="anonymous",
+    email="anonymous@example.com",
+    role="user",
+    hashed_password="",
+    created_at=datetime.now(),
+    updated_at=datetime.now(),
+)
+
 
 class UserController(BaseController[UserSchema, UserModel]):
     def __init__(self, db: AsyncSession):
@@ -18,14 +29,7 @@ class UserController(BaseController[UserSchema, UserModel]):
         self.crud = UserCRUD(db)
 
     def get_anon_user(self) -> UserSchema:
-        return UserSchema(
-            id="anonymous",
-            email="anonymous@example.com",
-            role="user",
-            hashed_password="",
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
-        )
+        return ANONYMOUS_USER
 
     async def read(self, user_id: str, allow_none: bool = False) -> UserSchema | None:
         return await self.crud.read(user_id, allow_none)
@@ -40,5 +44,7 @@ class UserController(BaseController[UserSchema, UserModel]):
     async def get_by_email(self, email: str) -> UserSchema | None:
         return await self.crud.get_by_email(email)
 
-    async def list(self) -> list[UserSchema]:
-        return await self.crud.list()
+    async def list(
+        self, cursor: str | None = None, limit: int = 100
+    ) -> Page[UserSchema]:
+        return await self.crud.list(cursor, limit)
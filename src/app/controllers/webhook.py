@@ -1,29 +1,67 @@
+import asyncio
 import datetime
+import gzip
 import hashlib
 import hmac
-import json
-from typing import Any, Literal, Mapping, TypedDict, cast, overload
+import logging
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    TypedDict,
+    overload,
+)
 
 import httpx
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.controllers.base import BaseController
+from src.app.controllers.rate_limit import RateLimitController, retry_after_header
 from src.app.controllers.webhook_usage import WebhookUsageController
+from src.app.core.batcher import BatchedEvent, webhook_batcher
+from src.app.core.blob_store import blob_store
+from src.app.core.config import settings
+from src.app.core.db.database import session_manager
+from src.app.core.delivery import WebhookDelivery
+from src.app.core.http import http_client_manager
+from src.app.core.outbox import is_retryable_status, lease_keeper, utc_now
+from src.app.core.usage_buffer import UsageAttempt
+from src.app.crud.pagination import Page
 from src.app.crud.webhook import WebhookCRUD
+from src.app.helpers import canonical_json
+from src.app.helpers.circuit_breaker import CircuitBreaker, circuit_breakers
 from src.app.models.webhook import Webhook as WebhookModel
 from src.app.schemas.webhook import Webhook as WebhookSchema
 from src.app.schemas.webhook import WebhookCreate, WebhookUpdate
+from src.app.schemas.webhook_usage import WebhookUsage as WebhookUsageSchema
 from src.app.schemas.webhook_usage import WebhookUsageCreate
 from src.app.types.actions import Action
 from src.app.types.events import EventType
 
+logger = logging.getLogger(__name__)
+
 
 class WebhookCallResult(TypedDict):
     status: int
     actions: list[Action]
 
 
+class WebhookCallError(TypedDict):
+    status: Literal["error"]
+    trigger_id: str
+    detail: Any
+
+
+class WebhookCallQueued(TypedDict):
+    status: Literal["pending"]
+    trigger_id: str
+    webhook_usage_id: str
+
+
 class WebhookController(BaseController[WebhookSchema, WebhookModel]):
     def __init__(self, db: AsyncSession):
         super().__init__(db)
@@ -42,8 +80,13 @@ class WebhookController(BaseController[WebhookSchema, WebhookModel]):
     async def read_safe(self, webhook_id: str) -> WebhookSchema:
         return await self.crud.read_safe(webhook_id)
 
-    async def list(self) -> list[WebhookSchema]:
-        return await self.crud.list()
+    async def read_many(self, webhook_ids: Iterable[str]) -> dict[str, WebhookSchema]:
+        return await self.crud.read_many(webhook_ids)
+
+    async def list(
+        self, cursor: str | None = None, limit: int = 100
+    ) -> Page[WebhookSchema]:
+        return await self.crud.list(cursor, limit)
 
     async def update(self, webhook_id: str, webhook: WebhookUpdate) -> WebhookSchema:
         return await self.crud.update(webhook_id, webhook)
@@ -51,60 +94,391 @@ class WebhookController(BaseController[WebhookSchema, WebhookModel]):
     async def delete(self, webhook_id: str) -> None:
         return await self.crud.delete(webhook_id)
 
-    def create_auth_key(self, auth_token: str, payload: Mapping[str, Any]) -> str:
-        payload_json = json.dumps(payload)
-        key = cast(str, hmac.new(auth_token.encode(), payload_json.encode(), hashlib.sha256).hexdigest())  # type: ignore
-        return key
+    def get_circuit_breaker(self, webhook: WebhookSchema) -> CircuitBreaker | None:
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return None
+
+        if settings.CIRCUIT_BREAKER_SCOPE == "host":
+            key = httpx.URL(webhook.url).netloc.decode()
+        else:
+            key = webhook.id
+        return circuit_breakers.get(
+            key,
+            failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+        )
+
+    def create_auth_key(self, auth_token: str, content: bytes) -> str:
+        """HMAC-SHA256 of the exact body bytes sent to the webhook."""
+        return hmac.new(auth_token.encode(), content, hashlib.sha256).hexdigest()
 
     async def call(
         self,
         webhook_id: str,
         event: EventType,
         payload: Mapping[str, Any],
-        web_push_subscription: dict[str, Any] | None = None,
+        webpush_subscription_id: str | None = None,
+        context_json: bytes | None = None,
+        on_usage: Callable[[str], None] | None = None,
     ) -> WebhookCallResult:
+        """Record a usage of the webhook and deliver ``payload`` to it.
+
+        ``on_usage`` is given the usage's id as soon as it is stored, before
+        the delivery, for callers that may cancel it.
+        """
         webhook = await self.read_safe(webhook_id)
 
-        webhook_usage = await self.webhook_usage_ctrl.create(
-            WebhookUsageCreate(
-                webhook_id=webhook_id,
-                event=event,
-                webpush_subscription_data=web_push_subscription,
-            )
+        webhook_usage = await self.create_usage(
+            webhook_id, event, webpush_subscription_id, payload
         )
+        if on_usage is not None:
+            on_usage(webhook_usage.id)
 
-        webhook_usage_callback_id = webhook_usage.id
+        return await self.deliver(
+            webhook, webhook_usage.id, event, payload, context_json=context_json
+        )
 
-        body = {
-            "event": event,
-            "context": payload,
-            "webhook_usage_id": webhook_usage_callback_id,
-        }
+    async def create_usage(
+        self,
+        webhook_id: str,
+        event: EventType,
+        webpush_subscription_id: str | None = None,
+        payload: Mapping[str, Any] | None = None,
+    ) -> WebhookUsageSchema:
+        return await self.webhook_usage_ctrl.create(
+            self.build_usage(webhook_id, event, webpush_subscription_id, payload)
+        )
+
+    def build_usage(
+        self,
+        webhook_id: str,
+        event: EventType,
+        webpush_subscription_id: str | None = None,
+        payload: Mapping[str, Any] | None = None,
+    ) -> WebhookUsageCreate:
+        # The row is leased to the caller that is about to deliver it. If the
+        # process dies before recording the outcome, the outbox dispatcher
+        # picks the delivery up once the lease expires.
+        lease_until = utc_now() + datetime.timedelta(
+            seconds=settings.OUTBOX_LEASE_SECONDS
+        )
+        return WebhookUsageCreate(
+            webhook_id=webhook_id,
+            event=event,
+            webpush_subscription_id=webpush_subscription_id,
+            payload=dict(payload) if payload is not None else None,
+            next_attempt_at=lease_until,
+        )
 
-        async with httpx.AsyncClient() as client:
-            auth_key = self.create_auth_key(webhook.auth_token, body)
+    async def deliver(
+        self,
+        webhook: WebhookSchema,
+        webhook_usage_id: str,
+        event: EventType,
+        payload: Mapping[str, Any],
+        attempts: int = 0,
+        context_json: bytes | None = None,
+    ) -> WebhookCallResult:
+        """Send one event to ``webhook``, through the batcher if it opted in.
 
-            headers = {
-                "X-Hercule-Auth-Key": auth_key,
-                "X-Hercule-Timestamp": str(datetime.datetime.now().timestamp()),
-            }
+        ``context_json`` is ``payload`` already encoded by canonical_json, so
+        an event fanned out to several webhooks is only encoded once.
+        """
+        delivery = BatchedEvent(
+            webhook_usage_id, event, payload, attempts, context_json
+        )
+        lease_keeper.hold(webhook_usage_id)
+        try:
+            if (webhook.batch_max_size or 1) > 1 and webhook_batcher.is_running:
+                return await webhook_batcher.submit(webhook, delivery)
 
-            timeout = httpx.Timeout(10.0, connect=5.0)
+            [result] = await self.send(webhook, [delivery], batched=False)
+        finally:
+            lease_keeper.release(webhook_usage_id)
+        if isinstance(result, HTTPException):
+            raise result
+        return result
 
-            response = await client.post(
-                webhook.url, json=body, headers=headers, timeout=timeout
+    async def send(
+        self, webhook: WebhookSchema, deliveries: List[BatchedEvent], batched: bool
+    ) -> List[WebhookCallResult | HTTPException]:
+        """Send ``deliveries`` in one request and record their outcome.
+
+        A batched request carries a JSON array of event bodies, signed as a
+        whole. Returns one result per delivery, or the HTTPException to raise
+        for it.
+        """
+        retry_after = await RateLimitController().take_webhook(webhook, len(deliveries))
+        if retry_after > 0:
+            # Dropped for good: the outbox does not retry rate limited deliveries
+            await self.webhook_usage_ctrl.record_attempts(
+                [
+                    UsageAttempt(
+                        delivery.webhook_usage_id,
+                        "rate_limited",
+                        delivery.attempts,
+                        last_error="Rate limit exceeded",
+                    )
+                    for delivery in deliveries
+                ]
             )
+            return [
+                HTTPException(
+                    status_code=429,
+                    detail={
+                        "status": None,
+                        "message": f"Rate limit exceeded for webhook {webhook.id}",
+                    },
+                    headers=retry_after_header(retry_after),
+                )
+                for _ in deliveries
+            ]
+
+        breaker = self.get_circuit_breaker(webhook)
+        if breaker is not None and not breaker.allow():
+            retry_after = breaker.retry_after
+            await self.webhook_usage_ctrl.record_attempts(
+                [
+                    self.webhook_usage_ctrl.defer_attempt(
+                        delivery.webhook_usage_id,
+                        delivery.attempts,
+                        retry_after,
+                        "Circuit breaker open",
+                    )
+                    for delivery in deliveries
+                ]
+            )
+            return [
+                HTTPException(
+                    status_code=503,
+                    detail={
+                        "status": None,
+                        "message": f"Circuit breaker open for {breaker.key}",
+                    },
+                    headers={"Retry-After": str(max(1, round(retry_after)))},
+                )
+                for _ in deliveries
+            ]
 
-            if response.status_code >= 400:
-                await self.webhook_usage_ctrl.update_status(webhook_usage.id, "error")
-                raise HTTPException(
+        try:
+            response = await self.post(webhook, deliveries, batched)
+        except httpx.HTTPError as e:
+            if breaker is not None:
+                breaker.record_failure()
+            error = f"{type(e).__name__}: {e}"
+            await self.record_outcomes(deliveries, error, retryable=True)
+            return [
+                HTTPException(
+                    status_code=400, detail={"status": None, "message": error}
+                )
+                for _ in deliveries
+            ]
+        except asyncio.CancelledError:
+            # Cancelled by the caller's deadline: says nothing of the receiver,
+            # a slow but healthy one must not trip the circuit
+            if breaker is not None:
+                breaker.release_trial()
+            raise
+        except BaseException:
+            # Failed before any answer: still a failure, or a half-open
+            # circuit would wait on its trial
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+
+        retryable = is_retryable_status(response.status_code)
+        if breaker is not None:
+            # Only errors hinting the receiver is down or overloaded count
+            # against the circuit; a 4xx means the host answered fine.
+            if retryable:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+        if response.status_code >= 400:
+            await self.record_outcomes(
+                deliveries,
+                f"HTTP {response.status_code}: {response.text[:1000]}",
+                retryable=retryable,
+            )
+            return [
+                HTTPException(
                     status_code=400,
                     detail={
                         "status": response.status_code,
                         "message": response.text,
                     },
                 )
+                for _ in deliveries
+            ]
+
+        await self.record_outcomes(deliveries)
+
+        result = response.json()
+        if not batched:
+            return [result]
+        # A receiver may answer each event of the batch in order; otherwise
+        # its answer applies to all of them.
+        if isinstance(result, list) and len(result) == len(deliveries):
+            return result
+        return [result for _ in deliveries]
+
+    async def encode_body(
+        self, webhook: WebhookSchema, delivery: BatchedEvent
+    ) -> bytes:
+        context_json = delivery.context_json
+        if webhook.html_by_reference and blob_store.is_enabled:
+            context = await self.reference_html(delivery.payload)
+            if context is not None:
+                context_json = canonical_json.dumps(context)
+        if context_json is None:
+            context_json = canonical_json.dumps(delivery.payload)
+        return canonical_json.join_object(
+            {
+                "context": context_json,
+                "event": canonical_json.dumps(delivery.event),
+                "webhook_usage_id": canonical_json.dumps(delivery.webhook_usage_id),
+            }
+        )
+
+    async def reference_html(self, payload: Mapping[str, Any]) -> dict[str, Any] | None:
+        """Move a large ``html_content`` to the blob store.
+
+        Returns the context with ``html_content_ref`` (digest, size and a
+        signed fetch URL) in place of the HTML, or None to send it inline.
+        """
+        html_content = payload.get("html_content")
+        if not isinstance(html_content, str):
+            return None
+        html = html_content.encode()
+        if len(html) < settings.BLOB_MIN_SIZE:
+            return None
+
+        digest = await blob_store.put(html)
+        context = {k: v for k, v in payload.items() if k != "html_content"}
+        context["html_content_ref"] = {
+            "sha256": digest,
+            "size": len(html),
+            "url": blob_store.signed_url(digest),
+        }
+        return context
+
+    async def post(
+        self, webhook: WebhookSchema, deliveries: List[BatchedEvent], batched: bool
+    ) -> httpx.Response:
+        """Encode, sign and send the body of ``deliveries``."""
+        encoded = [await self.encode_body(webhook, delivery) for delivery in deliveries]
+        content = canonical_json.join_array(encoded) if batched else encoded[0]
+
+        headers = {
+            "Content-Type": "application/json",
+            "X-Hercule-Auth-Key": self.create_auth_key(webhook.auth_token, content),
+            "X-Hercule-Timestamp": str(datetime.datetime.now().timestamp()),
+        }
+        if batched:
+            headers["X-Hercule-Batch-Size"] = str(len(deliveries))
+        if webhook.gzip_body and len(content) >= settings.WEBHOOK_GZIP_MIN_SIZE:
+            # The signature stays the one of the uncompressed body
+            content = await asyncio.to_thread(
+                gzip.compress, content, settings.WEBHOOK_GZIP_LEVEL
+            )
+            headers["Content-Encoding"] = "gzip"
+
+        return await http_client_manager.post(
+            webhook.url, content=content, headers=headers
+        )
+
+    async def record_outcomes(
+        self,
+        deliveries: List[BatchedEvent],
+        error: str | None = None,
+        retryable: bool = False,
+    ) -> None:
+        """Record one attempt per delivery: a success, or a failure with ``error``."""
+        if error is None:
+            attempts = [
+                UsageAttempt(
+                    delivery.webhook_usage_id, "success", delivery.attempts + 1
+                )
+                for delivery in deliveries
+            ]
+        else:
+            attempts = [
+                self.webhook_usage_ctrl.failure_attempt(
+                    delivery.webhook_usage_id, delivery.attempts + 1, error, retryable
+                )
+                for delivery in deliveries
+            ]
+        await self.webhook_usage_ctrl.record_attempts(attempts)
+
+
+async def deliver_queued(delivery: WebhookDelivery) -> None:
+    """Worker handler of the delivery queue."""
+    try:
+        await deliver_from_queue(delivery)
+    finally:
+        # Held since the delivery was queued, see TriggerController.enqueue
+        lease_keeper.release(delivery.webhook_usage_id)
+
+
+async def deliver_from_queue(delivery: WebhookDelivery) -> None:
+    async with session_manager.session() as session:
+        webhook_ctrl = WebhookController(session)
+        webhook = await webhook_ctrl.read(delivery.webhook_id, allow_none=True)
+        if webhook is None:
+            await webhook_ctrl.webhook_usage_ctrl.record_failure(
+                delivery.webhook_usage_id, 1, "Webhook not found", retryable=False
+            )
+            return
+
+        try:
+            await webhook_ctrl.deliver(
+                webhook,
+                delivery.webhook_usage_id,
+                delivery.event,
+                delivery.context,
+                context_json=delivery.context_json,
+            )
+        except HTTPException as e:
+            logger.info(f"Webhook delivery {delivery.webhook_usage_id} failed: {e}")
+
+
+async def dispatch_outbox_batch() -> int:
+    """Claim due outbox deliveries and send them. Returns the batch size."""
+    async with session_manager.session() as session:
+        claimed = await WebhookUsageController(session).claim_due()
+
+    async def redeliver(webhook_usage: WebhookUsageSchema) -> None:
+        async with session_manager.session() as session:
+            webhook_ctrl = WebhookController(session)
+            webhook = await webhook_ctrl.read(webhook_usage.webhook_id, allow_none=True)
+            if webhook is None:
+                await webhook_ctrl.webhook_usage_ctrl.record_failure(
+                    webhook_usage.id,
+                    webhook_usage.attempts,
+                    "Webhook not found",
+                    retryable=False,
+                )
+                return
+
+            try:
+                await webhook_ctrl.deliver(
+                    webhook,
+                    webhook_usage.id,
+                    webhook_usage.event,
+                    webhook_usage.payload or {},
+                    attempts=webhook_usage.attempts,
+                )
+            except HTTPException as e:
+                logger.info(f"Outbox delivery {webhook_usage.id} failed: {e}")
+
+    await asyncio.gather(*[redeliver(webhook_usage) for webhook_usage in claimed])
+    return len(claimed)
 
-            await self.webhook_usage_ctrl.update_status(webhook_usage.id, "success")
 
-            return response.json()
+async def send_webhook_batch(
+    webhook: WebhookSchema, deliveries: list[BatchedEvent]
+) -> list[WebhookCallResult | HTTPException]:
+    """Sender of the webhook batcher."""
+    async with session_manager.session() as session:
+        return await WebhookController(session).send(webhook, deliveries, batched=True)
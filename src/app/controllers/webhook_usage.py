@@ -1,14 +1,29 @@
+import asyncio
 import json
 import logging
-from typing import cast
+from datetime import UTC, datetime, timedelta
+from typing import Any, AsyncIterator, List, Sequence, cast
 
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from webpush import WebPushSubscription  # type: ignore
 
 from src.app.controllers.base import BaseController
 from src.app.core.config import settings
+from src.app.core.db.database import session_manager
+from src.app.core.db.sqlite import incremental_vacuum
+from src.app.core.outbox import compute_backoff, utc_now
+from src.app.core.retention import retention_cutoffs, usage_archive
+from src.app.core.usage_buffer import UsageAttempt, usage_write_buffer
+from src.app.crud.pagination import Page
 from src.app.crud.webhook_usage import WebhookUsageCRUD
-from src.app.helpers.webpush import send_webpush
+from src.app.crud.webpush_subscription import (
+    WebPushSubscriptionCRUD,
+    subscription_endpoint,
+)
+from src.app.helpers.cache import webpush_subscription_cache
+from src.app.helpers.export import ExportFormat, encode_rows
+from src.app.helpers.webpush import parse_subscription, send_webpush
 from src.app.models.webhook_usage import WebhookUsage as WebhookUsageModel
 from src.app.models.webhook_usage import WebhookUsageStatus
 from src.app.schemas.webhook_usage import WebhookUsage as WebhookUsageSchema
@@ -16,18 +31,60 @@ from src.app.schemas.webhook_usage import (
     WebhookUsageCallbackPayload,
     WebhookUsageCreate,
 )
+from src.app.types.events import EventType
 
 logger = logging.getLogger(__name__)
 
+# Columns of webhook usage exports, in CSV order
+EXPORT_FIELDS = (
+    "id",
+    "webhook_id",
+    "event",
+    "status",
+    "attempts",
+    "next_attempt_at",
+    "last_error",
+    "created_at",
+    "updated_at",
+)
+
 
 class WebhookUsageController(BaseController[WebhookUsageSchema, WebhookUsageModel]):
     def __init__(self, db: AsyncSession):
         super().__init__(db)
         self.crud = WebhookUsageCRUD(db)
+        self.subscription_crud = WebPushSubscriptionCRUD(db)
 
     async def create(self, webhook_usage: WebhookUsageCreate) -> WebhookUsageSchema:
         return await self.crud.create(webhook_usage)
 
+    async def create_many(
+        self, webhook_usages: Sequence[WebhookUsageCreate]
+    ) -> List[WebhookUsageSchema]:
+        return await self.crud.create_many(webhook_usages)
+
+    async def resolve_subscriptions(
+        self, subscriptions: Sequence[dict[str, Any] | None]
+    ) -> List[str | None]:
+        """Store the webpush subscriptions of new usages and return their IDs.
+
+        Usages of the same browser share one stored subscription. Those
+        without an endpoint cannot be pushed to and resolve to ``None``.
+        """
+        usable = [data for data in subscriptions if subscription_endpoint(data)]
+        if not usable:
+            return [None] * len(subscriptions)
+
+        ids = iter(await self.subscription_crud.get_or_create_many(usable))
+        return [
+            next(ids) if subscription_endpoint(data) else None for data in subscriptions
+        ]
+
+    async def resolve_subscription(
+        self, subscription: dict[str, Any] | None
+    ) -> str | None:
+        return (await self.resolve_subscriptions([subscription]))[0]
+
     async def read(self, webhook_usage_id: str) -> WebhookUsageSchema | None:
         return await self.crud.read(webhook_usage_id)
 
@@ -36,10 +93,93 @@ class WebhookUsageController(BaseController[WebhookUsageSchema, WebhookUsageMode
             WebhookUsageSchema, await self.crud.read(webhook_usage_id, allow_none=False)
         )
 
+    async def list(
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+        webhook_id: str | None = None,
+        status: WebhookUsageStatus | None = None,
+        event: EventType | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> Page[WebhookUsageSchema]:
+        return await self.crud.list(
+            cursor,
+            limit,
+            webhook_id=webhook_id,
+            status=status,
+            event=event,
+            created_after=created_after,
+            created_before=created_before,
+        )
+
     async def update_status(
         self, webhook_usage_id: str, status: WebhookUsageStatus
-    ) -> WebhookUsageSchema:
-        return await self.crud.update_status(webhook_usage_id, status)
+    ) -> None:
+        await self.crud.update_status(webhook_usage_id, status)
+
+    async def record_attempt(self, attempt: UsageAttempt) -> None:
+        """Record a delivery outcome, grouped with concurrent ones if buffered."""
+        if usage_write_buffer.is_running:
+            await usage_write_buffer.record(attempt)
+            return
+
+        await self.crud.record_attempt(
+            attempt.webhook_usage_id,
+            attempt.status,
+            attempt.attempts,
+            attempt.next_attempt_at,
+            attempt.last_error,
+        )
+
+    async def record_attempts(self, attempts: Sequence[UsageAttempt]) -> None:
+        """Record the outcomes of several deliveries sent together."""
+        if usage_write_buffer.is_running:
+            await asyncio.gather(*[usage_write_buffer.record(a) for a in attempts])
+            return
+
+        await self.crud.record_attempts(attempts)
+
+    async def record_success(self, webhook_usage_id: str, attempts: int) -> None:
+        await self.record_attempt(UsageAttempt(webhook_usage_id, "success", attempts))
+
+    async def record_failure(
+        self, webhook_usage_id: str, attempts: int, error: str, retryable: bool
+    ) -> WebhookUsageStatus:
+        """Schedule a retry with backoff, or mark the usage as error for good."""
+        attempt = self.failure_attempt(webhook_usage_id, attempts, error, retryable)
+        await self.record_attempt(attempt)
+        return attempt.status
+
+    def failure_attempt(
+        self, webhook_usage_id: str, attempts: int, error: str, retryable: bool
+    ) -> UsageAttempt:
+        if retryable and attempts < settings.OUTBOX_MAX_ATTEMPTS:
+            next_attempt_at = utc_now() + compute_backoff(
+                attempts, settings.OUTBOX_BACKOFF_BASE, settings.OUTBOX_BACKOFF_MAX
+            )
+            return UsageAttempt(
+                webhook_usage_id, "pending", attempts, next_attempt_at, error
+            )
+
+        return UsageAttempt(webhook_usage_id, "error", attempts, last_error=error)
+
+    def defer_attempt(
+        self, webhook_usage_id: str, attempts: int, delay: float, reason: str
+    ) -> UsageAttempt:
+        """Push a pending delivery back without counting it as an attempt."""
+        next_attempt_at = utc_now() + timedelta(seconds=delay)
+        return UsageAttempt(
+            webhook_usage_id, "pending", attempts, next_attempt_at, reason
+        )
+
+    async def claim_due(self) -> List[WebhookUsageSchema]:
+        now = utc_now()
+        return await self.crud.claim_due(
+            now,
+            now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+            settings.OUTBOX_BATCH_SIZE,
+        )
 
     def get_callback_url(self, webhook_usage_id: str) -> str:
         return f"{settings.API_URL}/webhook-usage/{webhook_usage_id}/callback"
@@ -49,13 +189,92 @@ class WebhookUsageController(BaseController[WebhookUsageSchema, WebhookUsageMode
     ) -> bool:
         webhook_usage = await self.read_safe(webhook_usage_id)
 
-        webpush_sub_data = webhook_usage.webpush_subscription_data
+        subscription = await self.get_subscription(
+            webhook_usage.webpush_subscription_id
+        )
 
-        if not webpush_sub_data:
+        if subscription is None:
             raise HTTPException(
                 status_code=400, detail="Invalid webpush subscription data"
             )
 
-        await send_webpush(webpush_sub_data, payload.model_dump())
+        await send_webpush(subscription, payload.model_dump())
 
         return True
+
+    async def get_subscription(
+        self, subscription_id: str | None
+    ) -> WebPushSubscription | None:
+        """The subscription ``subscription_id``, read and validated once per TTL."""
+        if subscription_id is None:
+            return None
+
+        subscription = webpush_subscription_cache.get(subscription_id)
+        if subscription is None:
+            data = await self.subscription_crud.read_data(subscription_id)
+            subscription = parse_subscription(data) if data else None
+            if subscription is not None:
+                webpush_subscription_cache.set(subscription_id, subscription)
+        return subscription
+
+
+async def flush_usage_attempts(attempts: list[UsageAttempt]) -> None:
+    """Write-behind handler: store a batch of delivery outcomes at once."""
+    async with session_manager.session() as session:
+        await WebhookUsageCRUD(session).record_attempts(attempts)
+
+
+async def renew_usage_leases(webhook_usage_ids: list[str]) -> None:
+    """Lease renewer of the outbox lease keeper."""
+    lease_until = utc_now() + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+    async with session_manager.session() as session:
+        await WebhookUsageCRUD(session).renew_leases(webhook_usage_ids, lease_until)
+
+
+async def export_webhook_usages(
+    format: ExportFormat, compress: bool = False, **filters: Any
+) -> AsyncIterator[bytes]:
+    """The matching webhook usage history, encoded chunk by chunk.
+
+    Reads in a session of its own: a streamed response is sent after the
+    request's session has been closed.
+    """
+    async with session_manager.session() as session:
+        usages = WebhookUsageCRUD(session).stream(**filters)
+        async for chunk in encode_rows(usages, EXPORT_FIELDS, format, compress):
+            yield chunk
+
+
+async def purge_expired_usages(now: datetime | None = None) -> int:
+    """Delete (and archive) webhook usages past their retention, oldest first.
+
+    Each batch is read, archived and deleted in a short transaction of its
+    own, with a pause in between so the SQLite write lock is never held for
+    long. Returns how many usages were deleted.
+    """
+    # Aware, as created_at is a timestamptz column (unlike the outbox times)
+    now = now or datetime.now(UTC)
+    callback_before = now - timedelta(days=settings.RETENTION_CALLBACK_DAYS)
+    batch_size = settings.RETENTION_BATCH_SIZE
+
+    deleted = 0
+    for status, before in retention_cutoffs(settings, now).items():
+        while True:
+            async with session_manager.session() as session:
+                crud = WebhookUsageCRUD(session)
+                usages = await crud.expired(status, before, callback_before, batch_size)
+                if not usages:
+                    break
+                if usage_archive.is_enabled:
+                    await usage_archive.write(usages, EXPORT_FIELDS)
+                deleted += await crud.delete_many([usage.id for usage in usages])
+
+            if len(usages) < batch_size:
+                break
+            await asyncio.sleep(settings.RETENTION_BATCH_PAUSE)
+
+    if deleted:
+        async with session_manager.connect() as connection:
+            if connection.dialect.name == "sqlite":
+                await incremental_vacuum(connection, settings.RETENTION_VACUUM_PAGES)
+    return deleted
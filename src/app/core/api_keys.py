@@ -0,0 +1,84 @@
+import hashlib
+import secrets
+from datetime import datetime
+from typing import cast
+
+from src.app.core.config import Settings
+from src.app.core.logger import logging
+from src.app.models.user import UserRole
+from src.app.schemas.user import User as UserSchema
+
+logger = logging.getLogger(__name__)
+
+API_KEY_EPOCH = datetime(1970, 1, 1)
+
+
+def hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def generate_api_key() -> str:
+    return secrets.token_urlsafe(32)
+
+
+class ApiKeyStore:
+    """In-memory set of hashed API keys for server-to-server callers.
+
+    Keys are read at startup from ``API_KEYS_FILE``, one ``<name> <sha256 hex
+    digest of the key> [role]`` per line, and never kept in clear. Each key
+    authenticates as a principal built once at load time, so API-key requests
+    never touch the database.
+    """
+
+    def __init__(self):
+        self._principals: dict[str, UserSchema] = {}
+
+    def __len__(self) -> int:
+        return len(self._principals)
+
+    def load(self, settings: Settings) -> None:
+        self._principals = {}
+        if not settings.API_KEYS_FILE:
+            return
+
+        with open(settings.API_KEYS_FILE) as api_keys_file:
+            for line_number, line in enumerate(api_keys_file, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+
+                fields = line.split()
+                if len(fields) not in (2, 3) or fields[2:] not in (
+                    [],
+                    ["admin"],
+                    ["user"],
+                ):
+                    raise ValueError(
+                        f"{settings.API_KEYS_FILE}:{line_number}: expected "
+                        "'<name> <sha256> [role]'"
+                    )
+                name, key_hash, *role = fields
+                self.add(
+                    name, key_hash.lower(), cast(UserRole, role[0] if role else "user")
+                )
+
+        logger.info(f"Loaded {len(self)} API keys")
+
+    def add(self, name: str, key_hash: str, role: UserRole = "user") -> None:
+        self._principals[key_hash] = UserSchema(
+            id=f"api-key:{name}",
+            email=f"api-key-{name}@example.com",
+            role=role,
+            hashed_password="",
+            created_at=API_KEY_EPOCH,
+            updated_at=API_KEY_EPOCH,
+        )
+
+    def authenticate(self, api_key: str) -> UserSchema | None:
+        return self._principals.get(hash_api_key(api_key))
+
+    def clear(self) -> None:
+        self._principals = {}
+
+
+api_key_store = ApiKeyStore()
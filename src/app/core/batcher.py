@@ -0,0 +1,115 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Mapping
+
+from src.app.core.logger import logging
+from src.app.schemas.webhook import Webhook as WebhookSchema
+from src.app.types.events import EventType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class BatchedEvent:
+    webhook_usage_id: str
+    event: EventType
+    payload: Mapping[str, Any]
+    attempts: int = 0
+    # ``payload`` encoded by canonical_json, shared by the event's deliveries
+    context_json: bytes | None = None
+
+
+# Sends one batch and returns one result (or exception) per event, in order
+BatchSender = Callable[[WebhookSchema, list[BatchedEvent]], Awaitable[list[Any]]]
+
+
+@dataclass(slots=True)
+class _WebhookBuffer:
+    webhook: WebhookSchema
+    entries: list[tuple[BatchedEvent, asyncio.Future[Any]]] = field(
+        default_factory=list
+    )
+    timer: asyncio.TimerHandle | None = None
+
+
+class WebhookBatcher:
+    """Coalesces deliveries to webhooks that opted into batching.
+
+    Events for a webhook are buffered until ``batch_max_size`` of them are
+    waiting or the oldest one has waited ``batch_linger_ms``, then sent in one
+    request by ``sender``. ``submit`` resolves with the event's own result.
+    """
+
+    def __init__(self):
+        self._sender: BatchSender | None = None
+        self._buffers: dict[str, _WebhookBuffer] = {}
+        self._in_flight: set[asyncio.Task[None]] = set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._sender is not None
+
+    def start(self, sender: BatchSender) -> None:
+        self._sender = sender
+        self._buffers = {}
+
+    async def submit(self, webhook: WebhookSchema, event: BatchedEvent) -> Any:
+        if self._sender is None:
+            raise Exception("WebhookBatcher is not running")
+
+        loop = asyncio.get_running_loop()
+        buffer = self._buffers.get(webhook.id)
+        if buffer is None:
+            buffer = _WebhookBuffer(webhook)
+            buffer.timer = loop.call_later(
+                webhook.batch_linger_ms / 1000, self._flush, webhook.id
+            )
+            self._buffers[webhook.id] = buffer
+
+        future: asyncio.Future[Any] = loop.create_future()
+        buffer.entries.append((event, future))
+        if len(buffer.entries) >= (webhook.batch_max_size or 1):
+            self._flush(webhook.id)
+
+        result = await future
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def stop(self) -> None:
+        """Send what is still buffered and wait for the batches in flight."""
+        for webhook_id in list(self._buffers):
+            self._flush(webhook_id)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        self._sender = None
+
+    def _flush(self, webhook_id: str) -> None:
+        buffer = self._buffers.pop(webhook_id, None)
+        if buffer is None or not buffer.entries:
+            return
+        if buffer.timer is not None:
+            buffer.timer.cancel()
+
+        task = asyncio.create_task(self._send(buffer))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, buffer: _WebhookBuffer) -> None:
+        assert self._sender is not None
+        events = [event for event, _ in buffer.entries]
+        try:
+            results = await self._sender(buffer.webhook, events)
+        except Exception as e:
+            logger.error(
+                f"Batch of {len(events)} events to webhook {buffer.webhook.id} "
+                f"failed: {e}"
+            )
+            results = [e] * len(events)
+
+        for (_, future), result in zip(buffer.entries, results):
+            if not future.done():
+                future.set_result(result)
+
+
+webhook_batcher = WebhookBatcher()
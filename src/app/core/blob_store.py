@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+from src.app.core.config import Settings
+from src.app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+
+def is_blob_digest(digest: str) -> bool:
+    return len(digest) == 64 and all(c in "0123456789abcdef" for c in digest)
+
+
+class BlobStore:
+    """Content-addressed store of large event values on local disk.
+
+    A blob is written once under its SHA-256 digest, however many events
+    carry it. Blobs are fetched through signed, expiring URLs handed to
+    webhooks in place of the value.
+
+    The directory is the source of truth, so every worker sharing it sees the
+    blobs of the others. A blob's mtime is its last store or reuse: when the
+    directory grows over ``BLOB_STORE_MAX_BYTES`` the least recently used
+    blobs are evicted, except those younger than ``BLOB_URL_TTL`` whose URLs
+    may still be fetched. Other workers' writes are counted by rescanning the
+    directory every ``_SCAN_INTERVAL`` seconds.
+    """
+
+    _SCAN_INTERVAL = 60.0
+
+    def __init__(self):
+        self._root: Path | None = None
+        self._max_bytes = 0
+        self._secret = b""
+        self._url = ""
+        self._url_ttl = 0.0
+        # Directory size at the last scan plus what was written since
+        self._size = 0
+        self._scanned_at = 0.0
+        # Set when only blobs with live URLs are left to evict
+        self._retry_at = 0.0
+
+    @property
+    def is_enabled(self) -> bool:
+        return self._root is not None
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def init(self, settings: Settings) -> None:
+        self._root = Path(
+            settings.BLOB_STORE_DIR
+            or os.path.join(settings.ABSOLUTE_CONFIG_DIR, "blobs")
+        )
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = settings.BLOB_STORE_MAX_BYTES
+        self._secret = settings.SECRET_KEY.encode()
+        self._url = f"{settings.API_URL}/blobs"
+        self._url_ttl = settings.BLOB_URL_TTL
+        self._size = sum(size for _, size, _ in self._scan(self._root))
+        self._scanned_at = time.monotonic()
+        self._retry_at = 0.0
+
+    def close(self) -> None:
+        self._root = None
+        self._size = 0
+
+    def path(self, digest: str) -> Path | None:
+        if self._root is None:
+            return None
+        path = self._root / digest[:2] / digest
+        return path if path.is_file() else None
+
+    async def put(self, data: bytes) -> str:
+        """Store ``data`` unless already there and return its digest."""
+        if self._root is None:
+            raise Exception("BlobStore is not initialized")
+
+        digest = hashlib.sha256(data).hexdigest()
+        if await asyncio.to_thread(self._touch, self._root / digest[:2] / digest):
+            return digest
+
+        await asyncio.to_thread(self._write, self._root, digest, data)
+        self._size += len(data)
+
+        now = time.monotonic()
+        over_limit = self._size > self._max_bytes and now >= self._retry_at
+        if over_limit or now - self._scanned_at >= self._SCAN_INTERVAL:
+            self._size = await asyncio.to_thread(
+                self._evict, self._root, self._max_bytes, time.time() - self._url_ttl
+            )
+            self._scanned_at = now
+            over_limit = self._size > self._max_bytes
+            self._retry_at = now + self._SCAN_INTERVAL if over_limit else 0.0
+            if over_limit:
+                logger.warning(
+                    f"Blob store holds {self._size} bytes, over its limit, "
+                    "but every blob may still be fetched"
+                )
+
+        return digest
+
+    def signed_url(self, digest: str, now: float | None = None) -> str:
+        expires = int((now if now is not None else time.time()) + self._url_ttl)
+        query = urlencode(
+            {"expires": expires, "signature": self._sign(digest, expires)}
+        )
+        return f"{self._url}/{digest}?{query}"
+
+    def verify(
+        self, digest: str, expires: int, signature: str, now: float | None = None
+    ) -> bool:
+        if expires < (now if now is not None else time.time()):
+            return False
+        return hmac.compare_digest(self._sign(digest, expires), signature)
+
+    def _sign(self, digest: str, expires: int) -> str:
+        message = f"{digest}:{expires}".encode()
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _write(root: Path, digest: str, data: bytes) -> None:
+        directory = root / digest[:2]
+        directory.mkdir(exist_ok=True)
+        # Written aside then renamed, so readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, directory / digest)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _touch(path: Path) -> bool:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @staticmethod
+    def _scan(root: Path) -> list[tuple[float, int, Path]]:
+        """Every blob's mtime, size and path, least recently used first."""
+        blobs: list[tuple[float, int, Path]] = []
+        for path in root.glob("??/*"):
+            if not is_blob_digest(path.name):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, path))
+        blobs.sort()
+        return blobs
+
+    @classmethod
+    def _evict(cls, root: Path, max_bytes: int, keep_after: float) -> int:
+        """Evict blobs last used before ``keep_after`` while over ``max_bytes``.
+
+        Returns the size of the directory once done.
+        """
+        blobs = cls._scan(root)
+        size = sum(blob_size for _, blob_size, _ in blobs)
+        evicted = 0
+        # The newest blob is the one just stored
+        for mtime, blob_size, path in blobs[:-1]:
+            if size <= max_bytes or mtime >= keep_after:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            size -= blob_size
+            evicted += 1
+        if evicted:
+            logger.info(f"Evicted {evicted} blobs")
+        return size
+
+
+blob_store = BlobStore()
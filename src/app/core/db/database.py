@@ -1,10 +1,23 @@
 import os
-from typing import Any, Type, TypeVar
+from typing import Any, Type, TypeVar, cast
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass, Session
 
+from src.app.core.config import DatabaseSettings
+from src.app.core.db.postgres import (
+    is_postgres,
+    postgres_engine_options,
+    postgres_url,
+)
+from src.app.core.db.sqlite import (
+    is_sqlite,
+    register_sqlite_pragmas,
+    sqlite_engine_options,
+    sqlite_pragmas,
+)
 from src.app.core.logger import logging
 
 logger = logging.getLogger(__name__)
@@ -49,10 +62,25 @@ class DatabaseSessionManager:
         self._engine: AsyncEngine | None = None
         self._sessionmaker: async_sessionmaker[AsyncSession] | None = None
 
-    def init(self, host: str):
-        print(f"Initializing database session manager with host: {host}")
+    def init(self, host: str, settings: DatabaseSettings | None = None):
+        print(
+            "Initializing database session manager with host: "
+            f"{make_url(host).render_as_string(hide_password=True)}"
+        )
 
-        self._engine = create_async_engine(host)
+        if settings is not None and is_postgres(host):
+            self._engine = create_async_engine(
+                postgres_url(host, settings), **postgres_engine_options(settings)
+            )
+        elif (
+            settings is not None and settings.SQLITE_TUNING_ENABLED and is_sqlite(host)
+        ):
+            self._engine = create_async_engine(
+                host, **sqlite_engine_options(host, settings)
+            )
+            register_sqlite_pragmas(self._engine, sqlite_pragmas(settings))
+        else:
+            self._engine = create_async_engine(host)
         self._sessionmaker = async_sessionmaker(
             autocommit=False, bind=self._engine, expire_on_commit=False
         )
@@ -76,12 +104,14 @@ class DatabaseSessionManager:
                 await connection.rollback()
                 raise
 
-    @contextlib.asynccontextmanager
-    async def session(self) -> AsyncIterator[AsyncSession]:
+    def new_session(self) -> AsyncSession:
         if self._sessionmaker is None:
             raise Exception("DatabaseSessionManager is not initialized")
+        return self._sessionmaker()
 
-        session = self._sessionmaker()
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        session = self.new_session()
         try:
             yield session
         except Exception:
@@ -94,6 +124,18 @@ class DatabaseSessionManager:
     async def create_all(self, connection: AsyncConnection):
         await connection.run_sync(Base.metadata.create_all)
 
+    async def migrate(self, connection: AsyncConnection) -> list[str]:
+        from src.app.core.db.migrations import (
+            add_missing_columns,
+            add_missing_indexes,
+            move_webpush_subscriptions,
+        )
+
+        await connection.run_sync(Base.metadata.create_all)
+        changes = await connection.run_sync(add_missing_columns)
+        changes += await connection.run_sync(move_webpush_subscriptions)
+        return changes + await connection.run_sync(add_missing_indexes)
+
     async def drop_all(self, connection: AsyncConnection):
         await connection.run_sync(Base.metadata.drop_all)
 
@@ -101,6 +143,44 @@ class DatabaseSessionManager:
 session_manager = DatabaseSessionManager()
 
 
+class UnitOfWork:
+    """A request's database session, only created when first used.
+
+    Attribute access is forwarded to the underlying ``AsyncSession``, so the
+    unit of work can be handed to controllers and CRUDs as their session.
+    Requests answered from in-memory caches never create one.
+    """
+
+    def __init__(self, manager: DatabaseSessionManager):
+        self._manager = manager
+        self._session: AsyncSession | None = None
+
+    @property
+    def is_started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._manager.new_session()
+        return getattr(self._session, name)
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
 async def async_get_db() -> AsyncIterator[AsyncSession]:
-    async with session_manager.session() as session:
-        yield session
+    """Per-request unit of work, shared by every dependency of the request."""
+    uow = UnitOfWork(session_manager)
+    try:
+        yield cast(AsyncSession, uow)
+    except Exception:
+        await uow.rollback()
+        raise
+    finally:
+        await uow.close()
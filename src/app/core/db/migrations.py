@@ -0,0 +1,164 @@
+from typing import Any, Mapping
+
+from sqlalchemy import (
+    Connection,
+    String,
+    bindparam,
+    column,
+    inspect,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.schema import CreateColumn
+
+from src.app import models  # registers every table on Base.metadata
+from src.app.core.db.database import Base
+from src.app.core.db.types import JSONVariant
+from src.app.core.logger import logging
+from src.app.crud.webpush_subscription import (
+    endpoint_hash,
+    insert_subscriptions,
+    subscription_endpoint,
+)
+from src.app.models.webpush_subscription import WebPushSubscription
+
+logger = logging.getLogger(__name__)
+
+
+def add_missing_columns(connection: Connection) -> list[str]:
+    """Add columns declared on the models but missing from existing tables.
+
+    ``create_all`` only creates missing tables, so databases created before a
+    column was introduced need this to catch up. New columns must therefore be
+    nullable or have a ``server_default``.
+    """
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+
+    added: list[str] = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_columns = {
+            column["name"] for column in inspector.get_columns(table.name)
+        }
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+
+            column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(
+                text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}")
+            )
+            added.append(f"{table.name}.{column.name}")
+            logger.info(f"Added missing column {table.name}.{column.name}")
+
+    return added
+
+
+def add_missing_indexes(connection: Connection) -> list[str]:
+    """Create indexes declared on the models but missing from existing tables."""
+    inspector = inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+
+    added: list[str] = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_indexes = {
+            index["name"] for index in inspector.get_indexes(table.name)
+        }
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+
+            index.create(connection)
+            added.append(f"{table.name}.{index.name}")
+            logger.info(f"Added missing index {index.name} on {table.name}")
+
+    return added
+
+
+def move_webpush_subscriptions(
+    connection: Connection, batch_size: int = 1000
+) -> list[str]:
+    """Move the subscriptions copied on each webhook usage to their own table.
+
+    Usages used to carry their whole webpush subscription. Each endpoint now
+    gets one ``webpush_subscriptions`` row that its usages point to, and the
+    old ``webpush_subscription_data`` column is dropped once they all do.
+    """
+    columns = {
+        column["name"] for column in inspect(connection).get_columns("webhook_usage")
+    }
+    if "webpush_subscription_data" not in columns:
+        return []
+
+    usages = table(
+        "webhook_usage",
+        column("id", String),
+        column("webpush_subscription_data", JSONVariant),
+        column("webpush_subscription_id", String),
+    )
+    link_usages = (
+        update(usages)
+        .where(usages.c.id == bindparam("usage_id"))
+        .values(webpush_subscription_id=bindparam("subscription_id"))
+    )
+
+    moved = 0
+    last_id = ""
+    while True:
+        rows = connection.execute(
+            select(usages.c.id, usages.c.webpush_subscription_data)
+            .where(
+                usages.c.id > last_id,
+                usages.c.webpush_subscription_data.is_not(None),
+            )
+            .order_by(usages.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        subscriptions: dict[str, Mapping[str, Any]] = {}
+        usage_hashes: list[tuple[str, str]] = []
+        for usage_id, data in rows:
+            endpoint = subscription_endpoint(data)
+            if endpoint is None:
+                continue
+            hash = endpoint_hash(endpoint)
+            subscriptions.setdefault(hash, data)
+            usage_hashes.append((usage_id, hash))
+        if not subscriptions:
+            continue
+
+        connection.execute(insert_subscriptions(connection.dialect.name, subscriptions))
+        ids = dict(
+            connection.execute(
+                select(WebPushSubscription.endpoint_hash, WebPushSubscription.id).where(
+                    WebPushSubscription.endpoint_hash.in_(list(subscriptions))
+                )
+            )
+            .tuples()
+            .all()
+        )
+        connection.execute(
+            link_usages,
+            [
+                {"usage_id": usage_id, "subscription_id": ids[hash]}
+                for usage_id, hash in usage_hashes
+            ],
+        )
+        moved += len(usage_hashes)
+
+    connection.execute(
+        text("ALTER TABLE webhook_usage DROP COLUMN webpush_subscription_data")
+    )
+    logger.info(f"Moved the webpush subscriptions of {moved} webhook usages")
+    return ["webhook_usage.webpush_subscription_data"]
@@ -0,0 +1,31 @@
+from typing import Any
+
+from sqlalchemy.engine import make_url
+
+from src.app.core.config import DatabaseSettings
+
+
+def is_postgres(host: str) -> bool:
+    return make_url(host).get_backend_name() in ("postgresql", "postgres")
+
+
+def postgres_url(host: str, settings: DatabaseSettings) -> str:
+    """Point the URL at asyncpg and size its prepared statement cache.
+
+    Set ``POSTGRES_STATEMENT_CACHE_SIZE=0`` behind pgbouncer in transaction
+    mode, where prepared statements do not survive between transactions.
+    """
+    url = make_url(host).set(drivername="postgresql+asyncpg")
+    return url.update_query_dict(
+        {"prepared_statement_cache_size": str(settings.POSTGRES_STATEMENT_CACHE_SIZE)}
+    ).render_as_string(hide_password=False)
+
+
+def postgres_engine_options(settings: DatabaseSettings) -> dict[str, Any]:
+    return {
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
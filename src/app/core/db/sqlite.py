@@ -0,0 +1,80 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.app.core.config import SQLiteSettings
+
+
+def is_sqlite(host: str) -> bool:
+    return make_url(host).get_backend_name() == "sqlite"
+
+
+def is_memory_database(host: str) -> bool:
+    return make_url(host).database in (None, "", ":memory:")
+
+
+def sqlite_pragmas(settings: SQLiteSettings) -> dict[str, str | int]:
+    """PRAGMAs run on each new connection, in order.
+
+    WAL lets readers run alongside the single writer, and with
+    ``synchronous=NORMAL`` a commit no longer waits for an fsync (the WAL is
+    synced at checkpoints instead), which is what bounds event throughput.
+    ``auto_vacuum`` comes first as it must be set before any table exists.
+    """
+    return {
+        "auto_vacuum": settings.SQLITE_AUTO_VACUUM,
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def sqlite_engine_options(host: str, settings: SQLiteSettings) -> dict[str, Any]:
+    # In-memory databases live in a single connection (StaticPool)
+    if is_memory_database(host):
+        return {}
+
+    # aiosqlite runs each connection in its own thread: a few pooled
+    # connections serve concurrent readers, writes are serialized by SQLite.
+    return {
+        "pool_size": settings.SQLITE_POOL_SIZE,
+        "max_overflow": settings.SQLITE_MAX_OVERFLOW,
+        "pool_timeout": settings.SQLITE_POOL_TIMEOUT,
+    }
+
+
+def register_sqlite_pragmas(engine: AsyncEngine, pragmas: dict[str, str | int]) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection: Any, _: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+async def incremental_vacuum(connection: AsyncConnection, pages: int = 0) -> int | None:
+    """Hand up to ``pages`` free pages back to the file system, 0 for all.
+
+    Returns how many were freed, or None when the database is not in
+    incremental ``auto_vacuum`` mode. A database created before the mode was
+    set has to be converted once with a full ``VACUUM``.
+    """
+    result = await connection.exec_driver_sql("PRAGMA auto_vacuum")
+    if result.scalar_one() != 2:  # INCREMENTAL
+        return None
+
+    # Each step of the statement frees one page, yielding an empty row that
+    # SQLAlchemy would not fetch: run it to the end on the aiosqlite cursor
+    raw_connection = await connection.get_raw_connection()
+    cursor = await raw_connection.driver_connection.execute(
+        f"PRAGMA incremental_vacuum({pages})"
+    )
+    try:
+        return len(await cursor.fetchall())
+    finally:
+        await cursor.close()
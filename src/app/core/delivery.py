@@ -0,0 +1,107 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Mapping
+
+from src.app.core.logger import logging
+from src.app.types.events import EventType
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class WebhookDelivery:
+    webhook_usage_id: str
+    webhook_id: str
+    event: EventType
+    context: Mapping[str, Any]
+    context_json: bytes | None = None
+
+
+DeliveryHandler = Callable[[WebhookDelivery], Awaitable[None]]
+
+
+class DeliveryQueueFull(Exception):
+    pass
+
+
+class DeliveryQueue:
+    """Bounded in-process queue of webhook deliveries and its worker pool.
+
+    Deliveries are enqueued once their ``webhook_usage`` row exists with the
+    ``pending`` status; workers send them and record the final status.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue[WebhookDelivery] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+        self._handler: DeliveryHandler | None = None
+        self._accepting = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._queue is not None and self._accepting
+
+    @property
+    def free_slots(self) -> int:
+        if self._queue is None:
+            return 0
+        return self._queue.maxsize - self._queue.qsize()
+
+    def start(self, handler: DeliveryHandler, workers: int, maxsize: int) -> None:
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self._handler = handler
+        self._accepting = True
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"webhook-delivery-{i}")
+            for i in range(workers)
+        ]
+
+    def enqueue(self, delivery: WebhookDelivery) -> None:
+        if self._queue is None or not self._accepting:
+            raise Exception("DeliveryQueue is not running")
+        try:
+            self._queue.put_nowait(delivery)
+        except asyncio.QueueFull as e:
+            raise DeliveryQueueFull() from e
+
+    async def drain(self, timeout: float) -> None:
+        """Stop accepting deliveries and let the workers finish the backlog.
+
+        Deliveries still queued after ``timeout`` are left ``pending``.
+        """
+        if self._queue is None:
+            return
+
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except TimeoutError:
+            logger.warning(
+                f"Delivery queue drain timed out with {self._queue.qsize()} "
+                "deliveries left pending"
+            )
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+        self._queue = None
+        self._workers = []
+        self._handler = None
+
+    async def _work(self) -> None:
+        assert self._queue is not None and self._handler is not None
+        queue, handler = self._queue, self._handler
+        while True:
+            delivery = await queue.get()
+            try:
+                await handler(delivery)
+            except Exception as e:
+                logger.error(
+                    f"Webhook delivery {delivery.webhook_usage_id} failed: {e}"
+                )
+            finally:
+                queue.task_done()
+
+
+delivery_queue = DeliveryQueue()
@@ -0,0 +1,94 @@
+import asyncio
+import contextlib
+import importlib.util
+from typing import Any, AsyncIterator
+
+import httpx
+
+from src.app.core.config import Settings
+from src.app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClientManager:
+    """Application-scoped ``httpx.AsyncClient`` shared by all webhook calls.
+
+    Reusing one client keeps connections (and their TLS sessions) alive between
+    events sent to the same hosts. httpx only limits the pool as a whole, so the
+    per-host limit is enforced here with one semaphore per host, dropped once
+    no call to that host is running or waiting.
+    """
+
+    def __init__(self):
+        self._client: httpx.AsyncClient | None = None
+        self._max_connections_per_host = 0
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+        # Calls holding or waiting for each host's semaphore
+        self._host_users: dict[str, int] = {}
+
+    def init(self, settings: Settings):
+        http2 = settings.HTTP2_ENABLED
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 disabled: install httpx[http2] to enable it")
+            http2 = False
+
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT
+            ),
+        )
+        self._max_connections_per_host = settings.HTTP_MAX_CONNECTIONS_PER_HOST
+        self._host_semaphores = {}
+        self._host_users = {}
+
+    async def close(self):
+        if self._client is None:
+            raise Exception("HttpClientManager is not initialized")
+        await self._client.aclose()
+        self._client = None
+        self._host_semaphores = {}
+        self._host_users = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise Exception("HttpClientManager is not initialized")
+        return self._client
+
+    @contextlib.asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[None]:
+        if self._max_connections_per_host <= 0:
+            yield
+            return
+
+        host = httpx.URL(url).netloc.decode()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._max_connections_per_host)
+            self._host_semaphores[host] = semaphore
+
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        try:
+            async with semaphore:
+                yield
+        finally:
+            # The maps may have been reset by close() in the meantime
+            users = self._host_users.pop(host, 1) - 1
+            if users:
+                self._host_users[host] = users
+            elif self._host_semaphores.get(host) is semaphore:
+                del self._host_semaphores[host]
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        async with self.host_slot(url):
+            return await self.client.post(url, **kwargs)
+
+
+http_client_manager = HttpClientManager()
@@ -0,0 +1,188 @@
+import importlib
+import zlib
+from typing import Any, Protocol
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class _Decoder(Protocol):
+    def decode(self, chunk: bytes, max_length: int) -> bytes: ...
+
+
+class _GzipDecoder:
+    def __init__(self, wbits: int):
+        self._decompressor = zlib.decompressobj(wbits)
+
+    def decode(self, chunk: bytes, max_length: int) -> bytes:
+        data = self._decompressor.decompress(chunk, max_length + 1)
+        if len(data) > max_length or self._decompressor.unconsumed_tail:
+            raise BodyTooLarge()
+        return data
+
+
+class _BrotliDecoder:
+    def __init__(self, brotli: Any):
+        self._decompressor = brotli.Decompressor()
+
+    def decode(self, chunk: bytes, max_length: int) -> bytes:
+        # Output past the limit stays inside the decompressor, drained by
+        # feeding it nothing until it can accept more input
+        data = self._decompressor.process(chunk, output_buffer_limit=max_length + 1)
+        while (
+            len(data) <= max_length
+            and not self._decompressor.can_accept_more_data()
+            and not self._decompressor.is_finished()
+        ):
+            more = self._decompressor.process(
+                b"", output_buffer_limit=max_length + 1 - len(data)
+            )
+            if not more:
+                break
+            data += more
+        if len(data) > max_length:
+            raise BodyTooLarge()
+        return data
+
+
+def _brotli_module() -> Any | None:
+    """The installed brotli module, if it can bound its output (brotli 1.2+).
+
+    Without that, a small body could decompress to any size before the cap is
+    checked, so ``br`` is not accepted at all.
+    """
+    for name in ("brotli", "brotlicffi"):
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            continue
+        if hasattr(module.Decompressor(), "can_accept_more_data"):
+            return module
+        logger.warning(f"{name} is too old to cap brotli bodies, br is disabled")
+    return None
+
+
+class RequestBodyMiddleware:
+    """Caps request bodies at ``max_body_size`` bytes and decodes compressed ones.
+
+    Bodies sent with ``Content-Encoding: gzip``, ``deflate`` or ``br`` are
+    decompressed before reaching the routes, and the cap applies to the
+    decompressed size so a small compressed body cannot expand without limit.
+    Brotli needs the ``brotli`` (or ``brotlicffi``) package, version 1.2 or
+    later.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+        self._brotli = _brotli_module()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            await self._reject(scope, receive, send, 413, "Request body too large")
+            return
+
+        encoding = headers.get("content-encoding", "identity").strip().lower()
+        if encoding == "identity":
+            await self.app(scope, self._capped(receive), send)
+            return
+
+        decoder = self._decoder(encoding)
+        if decoder is None:
+            await self._reject(
+                scope, receive, send, 415, f"Unsupported Content-Encoding: {encoding}"
+            )
+            return
+
+        try:
+            body = await self._decode_body(receive, decoder)
+        except BodyTooLarge:
+            await self._reject(scope, receive, send, 413, "Request body too large")
+            return
+        except Exception as e:
+            logger.info(f"Invalid {encoding} request body: {e}")
+            await self._reject(scope, receive, send, 400, "Invalid compressed body")
+            return
+
+        raw_headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+        await self.app(
+            {**scope, "headers": raw_headers}, self._replay(body, receive), send
+        )
+
+    def _decoder(self, encoding: str) -> _Decoder | None:
+        if encoding in ("gzip", "x-gzip"):
+            return _GzipDecoder(16 + zlib.MAX_WBITS)
+        if encoding == "deflate":
+            return _GzipDecoder(zlib.MAX_WBITS)
+        if encoding == "br" and self._brotli is not None:
+            return _BrotliDecoder(self._brotli)
+        return None
+
+    async def _decode_body(self, receive: Receive, decoder: _Decoder) -> bytes:
+        chunks: list[bytes] = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                raise Exception("Client disconnected")
+            more_body = message.get("more_body", False)
+            chunk = decoder.decode(message.get("body", b""), self.max_body_size - size)
+            size += len(chunk)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def _capped(self, receive: Receive) -> Receive:
+        size = 0
+
+        async def capped_receive() -> Message:
+            nonlocal size
+            message = await receive()
+            if message["type"] == "http.request":
+                size += len(message.get("body", b""))
+                if size > self.max_body_size:
+                    raise HTTPException(
+                        status_code=413, detail="Request body too large"
+                    )
+            return message
+
+        return capped_receive
+
+    def _replay(self, body: bytes, receive: Receive) -> Receive:
+        sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return replay_receive
+
+    async def _reject(
+        self, scope: Scope, receive: Receive, send: Send, status_code: int, detail: str
+    ) -> None:
+        response = JSONResponse({"detail": detail}, status_code=status_code)
+        await response(scope, receive, send)
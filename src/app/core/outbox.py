@@ -0,0 +1,135 @@
+import asyncio
+import random
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+from typing import Awaitable, Callable
+
+from src.app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429})
+
+
+def utc_now() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def is_retryable_status(status_code: int) -> bool:
+    return status_code >= 500 or status_code in RETRYABLE_STATUS_CODES
+
+
+def compute_backoff(
+    attempts: int, base: float, cap: float, rng: random.Random | None = None
+) -> timedelta:
+    """Exponential backoff with jitter for the ``attempts``-th failure.
+
+    The delay is drawn uniformly between ``base`` and the exponential ceiling,
+    so deliveries that failed together do not all come back at the same time.
+    """
+    ceiling = min(cap, base * 2 ** max(attempts - 1, 0))
+    return timedelta(seconds=(rng or random).uniform(base, max(base, ceiling)))
+
+
+OutboxBatchHandler = Callable[[], Awaitable[int]]
+
+
+class OutboxDispatcher:
+    """Background loop that retries due ``webhook_usage`` deliveries.
+
+    ``handler`` claims and delivers one batch and returns its size. A full
+    batch is followed straight away by the next one; otherwise the loop waits
+    ``poll_interval`` seconds before polling again.
+    """
+
+    def __init__(self):
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(
+        self, handler: OutboxBatchHandler, batch_size: int, poll_interval: float
+    ) -> None:
+        self._task = asyncio.create_task(
+            self._run(handler, batch_size, poll_interval), name="outbox-dispatcher"
+        )
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(
+        self, handler: OutboxBatchHandler, batch_size: int, poll_interval: float
+    ) -> None:
+        while True:
+            try:
+                claimed = await handler()
+            except Exception as e:
+                logger.error(f"Outbox dispatcher batch failed: {e}")
+                claimed = 0
+
+            if claimed < batch_size:
+                await asyncio.sleep(poll_interval)
+
+
+LeaseRenewer = Callable[[list[str]], Awaitable[None]]
+
+
+class LeaseKeeper:
+    """Keeps alive the outbox leases of the deliveries this process holds.
+
+    A ``webhook_usage`` row is leased for ``OUTBOX_LEASE_SECONDS`` when it is
+    created or claimed. While it waits in the delivery queue or the batcher,
+    or is being sent, it is held here, and every ``interval`` seconds
+    ``renew`` pushes back the leases of all held rows in one statement. The
+    outbox dispatcher so never claims a row this process is still working on,
+    however long it waits; if the process dies, the leases simply run out.
+    """
+
+    def __init__(self):
+        self._held: Counter[str] = Counter()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def held(self) -> list[str]:
+        return list(self._held)
+
+    def hold(self, webhook_usage_id: str) -> None:
+        self._held[webhook_usage_id] += 1
+
+    def release(self, webhook_usage_id: str) -> None:
+        self._held[webhook_usage_id] -= 1
+        if self._held[webhook_usage_id] <= 0:
+            del self._held[webhook_usage_id]
+
+    def start(self, renew: LeaseRenewer, interval: float) -> None:
+        self._task = asyncio.create_task(
+            self._run(renew, interval), name="outbox-lease-keeper"
+        )
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self, renew: LeaseRenewer, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            held = self.held
+            if not held:
+                continue
+            try:
+                await renew(held)
+            except Exception as e:
+                logger.error(f"Renewing {len(held)} outbox leases failed: {e}")
+
+
+outbox_dispatcher = OutboxDispatcher()
+lease_keeper = LeaseKeeper()
@@ -0,0 +1,122 @@
+import asyncio
+import gzip
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, Mapping
+
+from src.app.core.config import Settings
+from src.app.core.logger import logging
+from src.app.helpers.canonical_json import dumps
+from src.app.models.webhook_usage import WebhookUsageStatus
+from src.app.schemas.webhook_usage import WebhookUsage as WebhookUsageSchema
+
+logger = logging.getLogger(__name__)
+
+
+def retention_cutoffs(
+    settings: Settings, now: datetime
+) -> dict[WebhookUsageStatus, datetime]:
+    """Creation time before which usages of each status have expired."""
+    days: dict[WebhookUsageStatus, float] = {
+        "success": settings.RETENTION_SUCCESS_DAYS,
+        "error": settings.RETENTION_ERROR_DAYS,
+        "rate_limited": settings.RETENTION_RATE_LIMITED_DAYS,
+    }
+    return {
+        status: now - timedelta(days=ttl) for status, ttl in days.items() if ttl > 0
+    }
+
+
+class UsageArchive:
+    """Daily gzipped NDJSON files of expired webhook usages.
+
+    Rows go to ``webhook_usage/YYYY/MM/YYYY-MM-DD.ndjson.gz`` for the day they
+    were created on. Each batch is appended as its own gzip member, which
+    ``gzip``/``zcat`` read back as one stream, and synced to disk before the
+    rows are deleted. A pass interrupted between the two archives its batch
+    again on the next run.
+    """
+
+    def __init__(self):
+        self._root: Path | None = None
+
+    @property
+    def is_enabled(self) -> bool:
+        return self._root is not None
+
+    def init(self, settings: Settings) -> None:
+        if not settings.RETENTION_ARCHIVE_ENABLED:
+            self._root = None
+            return
+        self._root = Path(
+            settings.RETENTION_ARCHIVE_DIR
+            or os.path.join(settings.ABSOLUTE_CONFIG_DIR, "archive")
+        )
+
+    def path(self, day: datetime) -> Path:
+        if self._root is None:
+            raise Exception("UsageArchive is not initialized")
+        return self._root / "webhook_usage" / f"{day:%Y/%m/%Y-%m-%d}.ndjson.gz"
+
+    async def write(
+        self, usages: Iterable[WebhookUsageSchema], fields: tuple[str, ...]
+    ) -> None:
+        include = set(fields)
+        days: defaultdict[Path, list[bytes]] = defaultdict(list)
+        for usage in usages:
+            line = dumps(usage.model_dump(mode="json", include=include)) + b"\n"
+            days[self.path(usage.created_at)].append(line)
+        await asyncio.to_thread(self._append, days)
+
+    @staticmethod
+    def _append(days: Mapping[Path, list[bytes]]) -> None:
+        for path, lines in days.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = gzip.compress(b"".join(lines))
+            with open(path, "ab") as archive_file:
+                archive_file.write(data)
+                archive_file.flush()
+                os.fsync(archive_file.fileno())
+
+
+RetentionHandler = Callable[[], Awaitable[int]]
+
+
+class RetentionJob:
+    """Background loop running a retention pass every ``interval`` seconds."""
+
+    def __init__(self):
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, handler: RetentionHandler, interval: float) -> None:
+        self._task = asyncio.create_task(
+            self._run(handler, interval), name="retention-job"
+        )
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self, handler: RetentionHandler, interval: float) -> None:
+        while True:
+            try:
+                deleted = await handler()
+                if deleted:
+                    logger.info(f"Retention deleted {deleted} webhook usages")
+            except Exception as e:
+                logger.error(f"Retention pass failed: {e}")
+
+            await asyncio.sleep(interval)
+
+
+usage_archive = UsageArchive()
+retention_job = RetentionJob()
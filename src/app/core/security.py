@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -30,6 +32,45 @@ def get_password_hash(password: str) -> str:
     return hashed_password.decode("utf-8")
 
 
+class PasswordHasher:
+    """Runs bcrypt in a dedicated thread pool instead of on the event loop.
+
+    Each hash takes tens to hundreds of milliseconds of CPU. bcrypt releases
+    the GIL while hashing, so threads are enough to keep the loop responsive,
+    and the pool size caps how many hashes run at once.
+    """
+
+    def __init__(self):
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hasher",
+            )
+        return self._executor
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, verify_password, plain_password, hashed_password
+        )
+
+    async def hash(self, password: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, get_password_hash, password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
+
+
 def create_access_token(
     data: dict[str, Any], expires_delta: timedelta | None = None
 ) -> str:
@@ -44,12 +85,16 @@ def create_access_token(
     return encoded_jwt
 
 
-def verify_token(token: str) -> EmailStr | None:
+def decode_token(token: str) -> dict[str, Any] | None:
     try:
-        payload = jwt_decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str | None = payload.get("sub")
-        if email is None:
-            return None
-        return email
+        return jwt_decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except PyJWTError:
         return None
+
+
+def verify_token(token: str) -> EmailStr | None:
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    email: str | None = payload.get("sub")
+    return email
@@ -7,10 +7,31 @@ from fastapi import Depends, FastAPI, Request
 from fastapi.params import Depends as DependsT
 
 from src.app.api import router
+from src.app.controllers.trigger import TriggerController
+from src.app.controllers.webhook import (
+    deliver_queued,
+    dispatch_outbox_batch,
+    send_webhook_batch,
+)
+from src.app.controllers.webhook_usage import (
+    flush_usage_attempts,
+    purge_expired_usages,
+    renew_usage_leases,
+)
 from src.app.core.config import EnvironmentOption, settings
 
+from .api_keys import api_key_store
+from .batcher import webhook_batcher
+from .blob_store import blob_store
 from .db.database import session_manager
+from .delivery import delivery_queue
+from .http import http_client_manager
 from .logger import logging
+from .middleware import RequestBodyMiddleware
+from .outbox import lease_keeper, outbox_dispatcher
+from .retention import retention_job, usage_archive
+from .security import password_hasher
+from .usage_buffer import usage_write_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +39,9 @@ logger = logging.getLogger(__name__)
 
 
 async def log_request_info(request: Request):
-    try:
-        request_body = await request.json()
-    except Exception:
-        request_body = await request.body()
+    # Event contexts may carry a whole page, only log the start of the body
+    body = await request.body()
+    request_body = body[: settings.REQUEST_LOG_BODY_MAX_BYTES].decode(errors="replace")
 
     logger.info(
         f"{request.method} request to {request.url} metadata\n"
@@ -38,19 +58,70 @@ def init_config_dir():
 
 
 def lifespan_factory(
+    init_db: bool = True,
     create_tables_on_start: bool = True,
 ) -> Callable[[FastAPI], AsyncContextManager[Any]]:
     """Factory to create a lifespan async context manager for a FastAPI app."""
-    session_manager.init(settings.SQLITE_URI)
+    if init_db:
+        session_manager.init(settings.DATABASE_URI, settings)
 
     @asynccontextmanager
     async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-        if create_tables_on_start:
-            logger.info("Creating database tables")
-            async with session_manager.connect() as connection:
-                await session_manager.create_all(connection)
+        api_key_store.load(settings)
+        blob_store.init(settings)
+        usage_archive.init(settings)
+        http_client_manager.init(settings)
+        if settings.USAGE_WRITE_BUFFER_ENABLED:
+            usage_write_buffer.start(
+                flush_usage_attempts,
+                max_batch=settings.USAGE_WRITE_BATCH_SIZE,
+                flush_interval=settings.USAGE_WRITE_FLUSH_INTERVAL,
+                retries=settings.USAGE_WRITE_RETRIES,
+                retry_backoff=settings.USAGE_WRITE_RETRY_BACKOFF,
+            )
+        webhook_batcher.start(send_webhook_batch)
+        delivery_queue.start(
+            deliver_queued,
+            workers=settings.DELIVERY_WORKERS,
+            maxsize=settings.DELIVERY_QUEUE_MAXSIZE,
+        )
+
+        if init_db:
+            if create_tables_on_start:
+                logger.info("Creating database tables")
+                async with session_manager.connect() as connection:
+                    await session_manager.migrate(connection)
+
+            logger.info("Loading trigger routing index")
+            async with session_manager.session() as session:
+                await TriggerController(session).load_index()
+
+        lease_keeper.start(
+            renew_usage_leases, interval=settings.OUTBOX_LEASE_SECONDS / 3
+        )
+        if settings.OUTBOX_DISPATCHER_ENABLED:
+            outbox_dispatcher.start(
+                dispatch_outbox_batch,
+                batch_size=settings.OUTBOX_BATCH_SIZE,
+                poll_interval=settings.OUTBOX_POLL_INTERVAL,
+            )
+        if settings.RETENTION_ENABLED:
+            retention_job.start(
+                purge_expired_usages, interval=settings.RETENTION_INTERVAL
+            )
+
         yield
-        if session_manager._engine is not None:  # type: ignore
+
+        await retention_job.stop()
+        await outbox_dispatcher.stop()
+        await delivery_queue.drain(settings.DELIVERY_DRAIN_TIMEOUT)
+        await webhook_batcher.stop()
+        await lease_keeper.stop()
+        await usage_write_buffer.stop()
+        await http_client_manager.close()
+        password_hasher.shutdown()
+        blob_store.close()
+        if init_db and session_manager._engine is not None:  # type: ignore
             await session_manager.close()
 
     return lifespan
@@ -74,14 +145,17 @@ def init_app(
 
     init_config_dir()
 
-    lifespan: Callable[[FastAPI], AsyncContextManager[Any]] | None = None
-    if init_db:
-        lifespan = lifespan_factory(create_tables_on_start=create_tables_on_start)
+    lifespan = lifespan_factory(
+        init_db=init_db, create_tables_on_start=create_tables_on_start
+    )
 
     app = FastAPI(
         lifespan=lifespan,
         **kwargs,
     )
+    app.add_middleware(
+        RequestBodyMiddleware, max_body_size=settings.REQUEST_MAX_BODY_SIZE
+    )
 
     router_dependencies: Sequence[DependsT] = []
 
@@ -0,0 +1,144 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from src.app.core.logger import logging
+from src.app.models.webhook_usage import WebhookUsageStatus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class UsageAttempt:
+    webhook_usage_id: str
+    status: WebhookUsageStatus
+    attempts: int
+    next_attempt_at: datetime | None = None
+    last_error: str | None = None
+
+
+UsageFlushHandler = Callable[[list[UsageAttempt]], Awaitable[None]]
+
+
+class UsageWriteBuffer:
+    """Write-behind buffer for the outcome of webhook deliveries.
+
+    Updates recorded within ``flush_interval`` seconds of each other are
+    written by ``handler`` in a single transaction. ``record`` only returns
+    once its update is committed, so callers keep read-your-writes semantics.
+
+    A failed batch is retried ``retries`` times with exponential backoff from
+    ``retry_backoff`` seconds (e.g. while SQLite reports "database is
+    locked"). If it still fails, each update is written on its own, so only
+    the updates that cannot be written fail their callers.
+    """
+
+    def __init__(self):
+        self._pending: list[tuple[UsageAttempt, asyncio.Future[None]]] = []
+        self._ready = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._handler: UsageFlushHandler | None = None
+        self._max_batch = 0
+        self._flush_interval = 0.0
+        self._retries = 0
+        self._retry_backoff = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(
+        self,
+        handler: UsageFlushHandler,
+        max_batch: int,
+        flush_interval: float,
+        retries: int = 3,
+        retry_backoff: float = 0.05,
+    ) -> None:
+        self._handler = handler
+        self._max_batch = max_batch
+        self._flush_interval = flush_interval
+        self._retries = retries
+        self._retry_backoff = retry_backoff
+        self._pending = []
+        self._ready = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="usage-write-buffer")
+
+    async def record(self, attempt: UsageAttempt) -> None:
+        if not self.is_running:
+            raise Exception("UsageWriteBuffer is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((attempt, future))
+        self._ready.set()
+        await future
+
+    async def stop(self) -> None:
+        """Write the updates still pending, then stop the flush loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        while self._pending:
+            await self._flush()
+        self._handler = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._ready.wait()
+            if len(self._pending) < self._max_batch:
+                await asyncio.sleep(self._flush_interval)
+            await self._flush()
+            if not self._pending:
+                self._ready.clear()
+
+    async def _flush(self) -> None:
+        batch = self._pending[: self._max_batch]
+        try:
+            await self._write_with_retries([attempt for attempt, _ in batch])
+        except Exception as e:
+            logger.error(
+                f"Failed to write {len(batch)} webhook usage updates, "
+                f"writing them one by one: {e}"
+            )
+            results = [await self._write_alone(attempt) for attempt, _ in batch]
+        else:
+            results = [None] * len(batch)
+
+        # Only drop the batch once written: if the flush is cancelled by
+        # stop(), its updates are still pending and get written there.
+        self._pending = self._pending[len(batch) :]
+        for (_, future), error in zip(batch, results):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    async def _write_with_retries(self, attempts: list[UsageAttempt]) -> None:
+        assert self._handler is not None
+        for retry in range(self._retries + 1):
+            try:
+                await self._handler(attempts)
+                return
+            except Exception:
+                if retry == self._retries:
+                    raise
+            await asyncio.sleep(self._retry_backoff * 2**retry)
+
+    async def _write_alone(self, attempt: UsageAttempt) -> Exception | None:
+        assert self._handler is not None
+        try:
+            await self._handler([attempt])
+        except Exception as e:
+            logger.error(
+                f"Failed to write the update of webhook usage "
+                f"{attempt.webhook_usage_id}: {e}"
+            )
+            return e
+        return None
+
+
+usage_write_buffer = UsageWriteBuffer()
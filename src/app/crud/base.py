@@ -2,12 +2,14 @@ from abc import ABC, abstractmethod
 from typing import Any, Generic, Literal, Type, TypeVar, cast, overload
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.core.db.database import Base
 from src.app.core.db.models import IDMixin
 
+from .pagination import Cursor, Page, keyset_page
+
 SchemaType = TypeVar("SchemaType", bound=BaseModel)
 ModelType = TypeVar("ModelType", bound=Base | IDMixin)
 
@@ -21,9 +23,30 @@ class BaseCRUD(ABC, Generic[SchemaType, ModelType]):
         pass
 
     @abstractmethod
-    async def list(self, **kwargs: Any) -> list[SchemaType]:
+    async def list(
+        self, cursor: str | None = None, limit: int = 100, **kwargs: Any
+    ) -> Page[SchemaType]:
         pass
 
+    async def _list_page(
+        self,
+        query: Select[Any],
+        model: Any,
+        cursor: str | None,
+        limit: int,
+        descending: bool = False,
+    ) -> Page[SchemaType]:
+        result = await self.db.execute(
+            keyset_page(query, model, cursor, limit, descending)
+        )
+        rows = list(result.scalars().all())
+        if len(rows) <= limit:
+            return Page([self.model_to_schema(row) for row in rows])
+
+        rows = rows[:limit]
+        next_cursor = Cursor(rows[-1].created_at, rows[-1].id).encode()
+        return Page([self.model_to_schema(row) for row in rows], next_cursor)
+
     @abstractmethod
     async def create(self, data: Any) -> SchemaType:
         pass
@@ -0,0 +1,72 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import Select, func, literal, select, tuple_
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True, frozen=True)
+class Cursor:
+    """Position after the last row of a page, as its ``(created_at, id)``."""
+
+    created_at: datetime
+    id: str
+
+    def encode(self) -> str:
+        raw = f"{self.created_at.isoformat()}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "Cursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            created_at, id = raw.decode().split("|", 1)
+            return cls(datetime.fromisoformat(created_at), id)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@dataclass(slots=True)
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def keyset_page(
+    query: Select[Any],
+    model: Any,
+    cursor: str | None,
+    limit: int,
+    descending: bool = False,
+) -> Select[Any]:
+    """Restrict ``query`` to the ``limit + 1`` rows following ``cursor``.
+
+    Rows are ordered by ``(created_at, id)``, so a page costs an index range
+    read however deep it is, and rows inserted meanwhile never shift the
+    following pages. The extra row only tells whether there is a next page.
+    """
+    order = (model.created_at, model.id)
+    if cursor is not None:
+        position = Cursor.decode(cursor)
+        # The boundary row's own created_at, read back as stored, so that
+        # rows sharing its timestamp are neither skipped nor repeated. The
+        # cursor's copy stands in if the row was deleted meanwhile.
+        created_at = func.coalesce(
+            select(model.created_at).where(model.id == position.id).scalar_subquery(),
+            literal(position.created_at, model.created_at.type),
+        )
+        boundary = tuple_(created_at, literal(position.id, model.id.type))
+        query = query.where(
+            tuple_(*order) < boundary if descending else tuple_(*order) > boundary
+        )
+
+    if descending:
+        query = query.order_by(*(column.desc() for column in order))
+    else:
+        query = query.order_by(*order)
+    return query.limit(limit + 1)
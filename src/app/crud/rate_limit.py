@@ -0,0 +1,44 @@
+from sqlalchemy import case
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.rate_limit import RateLimitBucket
+
+
+class RateLimitCRUD:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def take(
+        self, key: str, rate: float, burst: float, cost: float, now: float
+    ) -> float:
+        """Token bucket shared through the database, see TokenBucket.take.
+
+        Refill and take happen in one upsert, so concurrent processes never
+        grant the same tokens twice.
+        """
+        dialect = self.db.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+        refilled = RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * rate
+        refilled = case((refilled > burst, burst), else_=refilled)
+        granted = refilled >= cost
+        statement = (
+            insert(RateLimitBucket)
+            .values(key=key, tokens=burst - cost, updated_at=now, granted=True)
+            .on_conflict_do_update(
+                index_elements=[RateLimitBucket.key],
+                set_={
+                    "tokens": case((granted, refilled - cost), else_=refilled),
+                    "updated_at": now,
+                    "granted": granted,
+                },
+            )
+            .returning(RateLimitBucket.tokens, RateLimitBucket.granted)
+        )
+        tokens, was_granted = (await self.db.execute(statement)).one()
+        await self.db.commit()
+
+        if was_granted:
+            return 0.0
+        return (cost - tokens) / rate
@@ -1,14 +1,17 @@
-from typing import Any, cast
+from typing import Any, List, cast
 
 from fastapi import HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..helpers.trigger_index import trigger_index
 from ..models.trigger import Trigger as TriggerModel
+from ..models.trigger import TriggersVersion
 from ..schemas.trigger import Trigger as TriggerSchema
 from ..schemas.trigger import TriggerCreate, TriggerUpdate
 from ..types.events import EventType
 from .base import BaseCRUD
+from .pagination import Page
 
 
 class TriggerCRUD(BaseCRUD[TriggerSchema, TriggerModel]):
@@ -42,19 +45,33 @@ class TriggerCRUD(BaseCRUD[TriggerSchema, TriggerModel]):
         self.db.add(trigger)
         await self.db.commit()
         await self.db.refresh(trigger)
-        return self.model_to_schema(trigger)
+        trigger_schema = self.model_to_schema(trigger)
+        trigger_index.upsert(trigger_schema)
+        return trigger_schema
 
     async def list(
-        self, event: EventType | None = None, **kwargs: Any
-    ) -> list[TriggerSchema]:
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+        event: EventType | None = None,
+        **kwargs: Any,
+    ) -> Page[TriggerSchema]:
         query = select(TriggerModel)
         if event:
             query = query.where(TriggerModel.event == event)
 
-        result = await self.db.execute(query)
+        return await self._list_page(query, TriggerModel, cursor, limit)
 
+    async def list_all(self) -> List[TriggerSchema]:
+        """Every trigger, for loading the in-memory trigger index."""
+        result = await self.db.execute(select(TriggerModel))
         return [self.model_to_schema(trigger) for trigger in result.scalars().all()]
 
+    async def version(self) -> int:
+        """Changes whenever a trigger is created, updated or deleted."""
+        result = await self.db.execute(select(TriggersVersion.version))
+        return result.scalar_one_or_none() or 0
+
     async def update(self, id: str, data: TriggerUpdate) -> TriggerSchema:
         trigger = await self._read_orm_safe(id)
 
@@ -62,9 +79,12 @@ class TriggerCRUD(BaseCRUD[TriggerSchema, TriggerModel]):
 
         await self.db.commit()
         await self.db.refresh(new_trigger)
-        return self.model_to_schema(new_trigger)
+        trigger_schema = self.model_to_schema(new_trigger)
+        trigger_index.upsert(trigger_schema)
+        return trigger_schema
 
     async def delete(self, id: str):
         trigger = await self._read_orm_safe(id)
         await self.db.delete(trigger)
         await self.db.commit()
+        trigger_index.remove(id)
@@ -4,11 +4,13 @@ from fastapi import HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..helpers.cache import user_cache
 from ..models.user import User as UserModel
 from ..schemas.user import User as UserSchema
 from ..schemas.user import UserCreate, UserUpdateHashedPassword
 from ..types.events import EventType
 from .base import BaseCRUD
+from .pagination import Page
 
 
 class UserCRUD(BaseCRUD[UserSchema, UserModel]):
@@ -43,10 +45,10 @@ class UserCRUD(BaseCRUD[UserSchema, UserModel]):
             return None
         return self.model_to_schema(user)
 
-    async def list(self, **kwargs: Any) -> list[UserSchema]:
-        query = select(UserModel)
-        result = await self.db.execute(query)
-        return [self.model_to_schema(user) for user in result.scalars().all()]
+    async def list(
+        self, cursor: str | None = None, limit: int = 100, **kwargs: Any
+    ) -> Page[UserSchema]:
+        return await self._list_page(select(UserModel), UserModel, cursor, limit)
 
     async def create(self, data: UserCreate) -> UserSchema:
         user = UserModel(**data.model_dump())
@@ -59,6 +61,7 @@ class UserCRUD(BaseCRUD[UserSchema, UserModel]):
         user = await self._read_orm_safe(id)
         user = self.update_object(user, data)
         await self.db.commit()
+        user_cache.invalidate(lambda cached_user: cached_user.id == id)
         await self.db.refresh(user)
         return self.model_to_schema(user)
 
@@ -66,3 +69,4 @@ class UserCRUD(BaseCRUD[UserSchema, UserModel]):
         user = await self._read_orm_safe(id)
         await self.db.delete(user)
         await self.db.commit()
+        user_cache.invalidate(lambda cached_user: cached_user.id == id)
@@ -1,4 +1,4 @@
-from typing import Any, cast
+from typing import Any, Iterable, cast
 from uuid import uuid4
 
 from fastapi import HTTPException
@@ -8,6 +8,7 @@ from ..models.webhook import Webhook as WebhookModel
 from ..schemas.webhook import Webhook as WebhookSchema
 from ..schemas.webhook import WebhookCreate, WebhookUpdate
 from .base import BaseCRUD
+from .pagination import Page
 
 
 class WebhookCRUD(BaseCRUD[WebhookSchema, WebhookModel]):
@@ -17,6 +18,12 @@ class WebhookCRUD(BaseCRUD[WebhookSchema, WebhookModel]):
             "name": model.name,
             "url": model.url,
             "auth_token": model.auth_token,
+            "batch_max_size": model.batch_max_size,
+            "batch_linger_ms": model.batch_linger_ms,
+            "gzip_body": model.gzip_body,
+            "html_by_reference": model.html_by_reference,
+            "rate_limit_per_second": model.rate_limit_per_second,
+            "rate_limit_burst": model.rate_limit_burst,
             "created_at": model.created_at,
             "updated_at": model.updated_at,
         }
@@ -31,6 +38,14 @@ class WebhookCRUD(BaseCRUD[WebhookSchema, WebhookModel]):
             raise HTTPException(status_code=404, detail="Webhook not found")
         return webhook
 
+    async def read_many(self, ids: Iterable[str]) -> dict[str, WebhookSchema]:
+        query = select(WebhookModel).where(WebhookModel.id.in_(set(ids)))
+        result = await self.db.execute(query)
+        return {
+            webhook.id: self.model_to_schema(webhook)
+            for webhook in result.scalars().all()
+        }
+
     async def create(self, data: WebhookCreate) -> WebhookSchema:
         webhook = WebhookModel(**data.model_dump())
 
@@ -43,13 +58,10 @@ class WebhookCRUD(BaseCRUD[WebhookSchema, WebhookModel]):
 
         return self.model_to_schema(webhook)
 
-    async def list(self, **kwargs: Any) -> list[WebhookSchema]:
-        webhooks_pydantic: list[WebhookSchema] = []
-        webhooks = await self.db.execute(select(WebhookModel))
-        for webhook in webhooks:
-            webhook_pydantic = self.model_to_schema(webhook[0])
-            webhooks_pydantic.append(webhook_pydantic)
-        return webhooks_pydantic
+    async def list(
+        self, cursor: str | None = None, limit: int = 100, **kwargs: Any
+    ) -> Page[WebhookSchema]:
+        return await self._list_page(select(WebhookModel), WebhookModel, cursor, limit)
 
     async def update(self, id: str, data: WebhookUpdate) -> WebhookSchema:
         webhook = await self._read_orm_safe(id)
@@ -1,34 +1,70 @@
-from typing import Any, cast
+from datetime import UTC, datetime
+from typing import Any, AsyncIterator, List, Sequence
 
 from fastapi import HTTPException
-from sqlalchemy import select, update
+from sqlalchemy import Select, delete, inspect, null, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
+from ..core.usage_buffer import UsageAttempt
+from ..models.webhook_usage import TERMINAL_STATUSES
 from ..models.webhook_usage import WebhookUsage as WebhookUsageModel
 from ..models.webhook_usage import WebhookUsageStatus
 from ..schemas.webhook_usage import WebhookUsage as WebhookUsageSchema
 from ..schemas.webhook_usage import WebhookUsageCreate, WebhookUsageUpdate
+from ..types.events import EventType
 from .base import BaseCRUD
+from .pagination import Page
+
+
+def _as_utc(value: datetime) -> datetime:
+    """``value`` as an aware UTC datetime, for the timestamptz columns."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
 
 
 class WebhookUsageCRUD(BaseCRUD[WebhookUsageSchema, WebhookUsageModel]):
     def model_to_schema(self, model: WebhookUsageModel) -> WebhookUsageSchema:
+        # Left unloaded by the queries that never need it, see _filtered
+        payload_loaded = "payload" not in inspect(model).unloaded
         model_dump = {
             "id": model.id,
             "webhook_id": model.webhook_id,
-            "webpush_subscription_data": model.webpush_subscription_data,
+            "webpush_subscription_id": model.webpush_subscription_id,
             "event": model.event,
             "status": model.status,
+            "payload": model.payload if payload_loaded else None,
+            "attempts": model.attempts,
+            "next_attempt_at": model.next_attempt_at,
+            "last_error": model.last_error,
+            "created_at": model.created_at,
+            "updated_at": model.updated_at,
         }
         return WebhookUsageSchema.model_validate(model_dump)
 
     async def create(self, data: WebhookUsageCreate) -> WebhookUsageSchema:
-        webhook_usage = WebhookUsageModel(**data.model_dump())
+        now = datetime.now(UTC)
+        webhook_usage = WebhookUsageModel(
+            **data.model_dump(), created_at=now, updated_at=now
+        )
         self.db.add(webhook_usage)
         await self.db.commit()
-        await self.db.refresh(webhook_usage)
+        # Every field of the schema is set client-side: no refresh round trip
         return self.model_to_schema(webhook_usage)
 
+    async def create_many(
+        self, data: Sequence[WebhookUsageCreate]
+    ) -> List[WebhookUsageSchema]:
+        now = datetime.now(UTC)
+        webhook_usages = [
+            WebhookUsageModel(**item.model_dump(), created_at=now, updated_at=now)
+            for item in data
+        ]
+        self.db.add_all(webhook_usages)
+        await self.db.commit()
+        return [self.model_to_schema(webhook_usage) for webhook_usage in webhook_usages]
+
     async def _read_orm(
         self, id: str, allow_none: bool = False
     ) -> WebhookUsageModel | None:
@@ -43,18 +79,107 @@ class WebhookUsageCRUD(BaseCRUD[WebhookUsageSchema, WebhookUsageModel]):
         return webhook_usage
 
     async def list(
-        self, webhook_id: str | None = None, **kwargs: Any
-    ) -> list[WebhookUsageSchema]:
-        query = select(WebhookUsageModel)
-        if webhook_id:
-            query = query.where(WebhookUsageModel.webhook_id == webhook_id)
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+        webhook_id: str | None = None,
+        status: WebhookUsageStatus | None = None,
+        event: EventType | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        **kwargs: Any,
+    ) -> Page[WebhookUsageSchema]:
+        """Webhook usages, newest first."""
+        query = self._filtered(webhook_id, status, event, created_after, created_before)
+        return await self._list_page(
+            query, WebhookUsageModel, cursor, limit, descending=True
+        )
+
+    async def stream(
+        self,
+        webhook_id: str | None = None,
+        status: WebhookUsageStatus | None = None,
+        event: EventType | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[WebhookUsageSchema]:
+        """Every matching webhook usage, oldest first, in constant memory.
+
+        Rows are read through a server-side cursor ``batch_size`` at a time,
+        so the session stays in a read transaction until the iteration ends.
+        """
+        query = self._filtered(
+            webhook_id, status, event, created_after, created_before
+        ).order_by(WebhookUsageModel.created_at, WebhookUsageModel.id)
+        result = await self.db.stream(query.execution_options(yield_per=batch_size))
+        try:
+            # One await per batch rather than per row
+            async for webhook_usages in result.scalars().partitions():
+                for webhook_usage in webhook_usages:
+                    yield self.model_to_schema(webhook_usage)
+        finally:
+            await result.close()
 
+    async def expired(
+        self,
+        status: WebhookUsageStatus,
+        before: datetime,
+        callback_before: datetime,
+        limit: int,
+    ) -> List[WebhookUsageSchema]:
+        """The oldest ``limit`` usages of ``status`` created before ``before``.
+
+        Usages that can still be called back, i.e. carry a web push
+        subscription, are only expired once created before ``callback_before``.
+        Naive cutoffs are taken as UTC.
+        """
+        before, callback_before = _as_utc(before), _as_utc(callback_before)
+        query = (
+            select(WebhookUsageModel)
+            .options(defer(WebhookUsageModel.payload))
+            .where(
+                WebhookUsageModel.status == status,
+                WebhookUsageModel.created_at < before,
+                or_(
+                    WebhookUsageModel.webpush_subscription_id.is_(None),
+                    WebhookUsageModel.created_at < callback_before,
+                ),
+            )
+            .order_by(WebhookUsageModel.created_at)
+            .limit(limit)
+        )
         result = await self.db.execute(query)
+        return [self.model_to_schema(usage) for usage in result.scalars().all()]
 
-        return [
-            self.model_to_schema(webhook_usage)
-            for webhook_usage in result.scalars().all()
-        ]
+    async def delete_many(self, ids: Sequence[str]) -> int:
+        result = await self.db.execute(
+            delete(WebhookUsageModel).where(WebhookUsageModel.id.in_(ids))
+        )
+        await self.db.commit()
+        return result.rowcount  # type: ignore
+
+    def _filtered(
+        self,
+        webhook_id: str | None,
+        status: WebhookUsageStatus | None,
+        event: EventType | None,
+        created_after: datetime | None,
+        created_before: datetime | None,
+    ) -> Select[tuple[WebhookUsageModel]]:
+        # Listings and exports never show the payload, which holds the page
+        query = select(WebhookUsageModel).options(defer(WebhookUsageModel.payload))
+        if webhook_id:
+            query = query.where(WebhookUsageModel.webhook_id == webhook_id)
+        if status:
+            query = query.where(WebhookUsageModel.status == status)
+        if event:
+            query = query.where(WebhookUsageModel.event == event)
+        if created_after:
+            query = query.where(WebhookUsageModel.created_at >= created_after)
+        if created_before:
+            query = query.where(WebhookUsageModel.created_at < created_before)
+        return query
 
     async def update(self, id: str, data: WebhookUsageUpdate) -> WebhookUsageSchema:
         webhook_usage = await self._read_orm_safe(id)
@@ -70,17 +195,103 @@ class WebhookUsageCRUD(BaseCRUD[WebhookUsageSchema, WebhookUsageModel]):
         await self.db.delete(webhook_usage)
         await self.db.commit()
 
-    async def update_status(
-        self, id: str, status: WebhookUsageStatus
-    ) -> WebhookUsageSchema:
-        await self._read_orm_safe(id)
+    async def update_status(self, id: str, status: WebhookUsageStatus) -> None:
+        query = (
+            update(WebhookUsageModel)
+            .where(WebhookUsageModel.id == id)
+            .values(status=status, **self._payload_cleared(status))
+        )
+        result = await self.db.execute(query)
+        if result.rowcount == 0:  # type: ignore
+            await self.db.rollback()
+            raise HTTPException(status_code=404, detail="Webhook usage not found")
+        await self.db.commit()
 
+    async def record_attempt(
+        self,
+        id: str,
+        status: WebhookUsageStatus,
+        attempts: int,
+        next_attempt_at: datetime | None = None,
+        last_error: str | None = None,
+    ) -> None:
         query = (
             update(WebhookUsageModel)
             .where(WebhookUsageModel.id == id)
-            .values(status=status)
+            .values(
+                status=status,
+                attempts=attempts,
+                next_attempt_at=next_attempt_at,
+                last_error=last_error,
+                **self._payload_cleared(status),
+            )
         )
         await self.db.execute(query)
         await self.db.commit()
 
-        return cast(WebhookUsageSchema, await self.read(id))
+    async def record_attempts(self, attempts: Sequence[UsageAttempt]) -> None:
+        """Write a batch of delivery outcomes in one transaction."""
+        await self.db.execute(
+            update(WebhookUsageModel),
+            [
+                {
+                    "id": attempt.webhook_usage_id,
+                    "status": attempt.status,
+                    "attempts": attempt.attempts,
+                    "next_attempt_at": attempt.next_attempt_at,
+                    "last_error": attempt.last_error,
+                    **self._payload_cleared(attempt.status),
+                }
+                for attempt in attempts
+            ],
+        )
+        await self.db.commit()
+
+    @staticmethod
+    def _payload_cleared(status: WebhookUsageStatus) -> dict[str, Any]:
+        """Drop the payload, kept for retries only, once ``status`` is final."""
+        return {"payload": null()} if status in TERMINAL_STATUSES else {}
+
+    async def renew_leases(self, ids: Sequence[str], lease_until: datetime) -> None:
+        """Push back the leases of the pending deliveries ``ids``."""
+        await self.db.execute(
+            update(WebhookUsageModel)
+            .where(WebhookUsageModel.id.in_(ids), WebhookUsageModel.status == "pending")
+            .values(next_attempt_at=lease_until)
+        )
+        await self.db.commit()
+
+    async def claim_due(
+        self, now: datetime, lease_until: datetime, limit: int
+    ) -> List[WebhookUsageSchema]:
+        """Lease up to ``limit`` pending deliveries whose retry time has come.
+
+        Pushing ``next_attempt_at`` to ``lease_until`` in the same statement
+        keeps other dispatchers from claiming the rows; if this one dies, the
+        lease expires and the rows become due again.
+        """
+        due_ids = (
+            select(WebhookUsageModel.id)
+            .where(
+                WebhookUsageModel.status == "pending",
+                WebhookUsageModel.next_attempt_at <= now,
+            )
+            .order_by(WebhookUsageModel.next_attempt_at)
+            .limit(limit)
+            # Replicas sharing a PostgreSQL database skip each other's rows
+            # instead of waiting on them; SQLite has no row locks to take.
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            update(WebhookUsageModel)
+            .where(
+                WebhookUsageModel.id.in_(due_ids.scalar_subquery()),
+                WebhookUsageModel.next_attempt_at <= now,
+            )
+            .values(next_attempt_at=lease_until)
+            .returning(WebhookUsageModel)
+        )
+        result = await self.db.execute(query)
+        claimed = [self.model_to_schema(usage) for usage in result.scalars().all()]
+        await self.db.commit()
+        return claimed
@@ -0,0 +1,102 @@
+import hashlib
+import uuid
+from datetime import UTC, datetime
+from typing import Any, List, Mapping, Sequence
+
+from sqlalchemy import Insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..helpers.cache import webpush_subscription_cache
+from ..models.webpush_subscription import WebPushSubscription
+
+
+def subscription_endpoint(data: Mapping[str, Any] | None) -> str | None:
+    """The push endpoint of a subscription, without which it is unusable."""
+    endpoint = data.get("endpoint") if data else None
+    return endpoint if isinstance(endpoint, str) and endpoint else None
+
+
+def endpoint_hash(endpoint: str) -> str:
+    return hashlib.sha256(endpoint.encode()).hexdigest()
+
+
+def insert_subscriptions(
+    dialect: str, subscriptions: Mapping[str, Mapping[str, Any]]
+) -> Insert:
+    """Insert ``subscriptions`` keyed by endpoint hash, skipping stored ones."""
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    now = datetime.now(UTC)
+    return (
+        insert(WebPushSubscription)
+        .values(
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "endpoint_hash": hash,
+                    "endpoint": data["endpoint"],
+                    "data": dict(data),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for hash, data in subscriptions.items()
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=[WebPushSubscription.endpoint_hash])
+    )
+
+
+class WebPushSubscriptionCRUD:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def read_data(self, id: str) -> dict[str, Any] | None:
+        result = await self.db.execute(
+            select(WebPushSubscription.data).where(WebPushSubscription.id == id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_or_create_many(
+        self, subscriptions: Sequence[Mapping[str, Any]]
+    ) -> List[str]:
+        """The IDs of ``subscriptions``, each endpoint being stored once.
+
+        Every subscription must have an endpoint. One sent again with other
+        keys replaces the stored data, so callbacks use the latest keys.
+        """
+        hashes = [endpoint_hash(data["endpoint"]) for data in subscriptions]
+        by_hash = dict(zip(hashes, subscriptions))
+
+        stored = await self._read_by_hash(by_hash)
+        missing = {hash: data for hash, data in by_hash.items() if hash not in stored}
+        if missing:
+            dialect = self.db.get_bind().dialect.name
+            await self.db.execute(insert_subscriptions(dialect, missing))
+            # Rows inserted meanwhile by another request are read back too
+            stored.update(await self._read_by_hash(missing))
+
+        changed = [
+            {"id": stored[hash][0], "data": dict(data), "updated_at": datetime.now(UTC)}
+            for hash, data in by_hash.items()
+            if stored[hash][1] != data
+        ]
+        if changed:
+            await self.db.execute(update(WebPushSubscription), changed)
+            for subscription in changed:
+                webpush_subscription_cache.discard(subscription["id"])
+        if missing or changed:
+            await self.db.commit()
+
+        return [stored[hash][0] for hash in hashes]
+
+    async def _read_by_hash(
+        self, hashes: Mapping[str, Any]
+    ) -> dict[str, tuple[str, dict[str, Any]]]:
+        result = await self.db.execute(
+            select(
+                WebPushSubscription.endpoint_hash,
+                WebPushSubscription.id,
+                WebPushSubscription.data,
+            ).where(WebPushSubscription.endpoint_hash.in_(list(hashes)))
+        )
+        return {hash: (id, data) for hash, id, data in result.all()}
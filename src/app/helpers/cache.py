@@ -0,0 +1,109 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypedDict, TypeVar
+
+from webpush import WebPushSubscription  # type: ignore
+
+from src.app.core.config import settings
+from src.app.schemas.user import User as UserSchema
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats(TypedDict):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class TTLCache(Generic[K, V]):
+    """LRU cache whose entries also expire ``ttl`` seconds after being set.
+
+    An entry may be given an earlier absolute expiry (a wall-clock timestamp,
+    e.g. the ``exp`` claim of a token) so it never outlives what it caches.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: float | None = None) -> None:
+        ttl = self.ttl
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - self._wall_clock())
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, predicate: Callable[[V], bool]) -> int:
+        """Drop the entries whose value matches ``predicate``."""
+        keys = [key for key, (_, value) in self._entries.items() if predicate(value)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def discard(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> CacheStats:
+        lookups = self.hits + self.misses
+        return CacheStats(
+            size=len(self._entries),
+            maxsize=self.maxsize,
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hits / lookups if lookups else 0.0,
+        )
+
+
+# Validated users by access token, see AuthController.get_current_user
+user_cache: TTLCache[str, UserSchema] = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAXSIZE, ttl=settings.AUTH_CACHE_TTL
+)
+
+# Validated webpush subscriptions by ID, see WebhookUsageController.callback
+webpush_subscription_cache: TTLCache[str, WebPushSubscription] = TTLCache(
+    maxsize=settings.WEBPUSH_CACHE_MAXSIZE, ttl=settings.WEBPUSH_CACHE_TTL
+)
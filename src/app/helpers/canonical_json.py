@@ -0,0 +1,39 @@
+import json
+from typing import Any, Iterable, Mapping
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize ``obj`` to compact UTF-8 JSON with sorted keys.
+
+    Webhook bodies are encoded once with this and both signed and sent as
+    these exact bytes, so receivers can check the signature on the raw body.
+    orjson is used when installed; both encoders give the same bytes for
+    strings, integers, booleans and null.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(
+        obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def join_object(members: Mapping[str, bytes]) -> bytes:
+    """Build the canonical JSON object of already encoded member values.
+
+    Lets a large value shared by several bodies be encoded only once; the
+    result equals ``dumps`` of the decoded object.
+    """
+    return (
+        b"{"
+        + b",".join(dumps(key) + b":" + members[key] for key in sorted(members))
+        + b"}"
+    )
+
+
+def join_array(items: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(items) + b"]"
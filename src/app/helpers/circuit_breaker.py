@@ -0,0 +1,126 @@
+import time
+from typing import Callable, Literal, TypeAlias, TypedDict
+
+from src.app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+CircuitState: TypeAlias = Literal["closed", "open", "half_open"]
+
+
+class CircuitBreakerSnapshot(TypedDict):
+    key: str
+    state: CircuitState
+    failures: int
+    retry_after: float | None
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker guarding calls to one webhook or host.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and calls
+    fail fast. Once ``recovery_timeout`` seconds have passed, a single trial call
+    is let through: its success closes the circuit, its failure opens it again.
+    A trial whose outcome is never recorded gives way to a new one after
+    another ``recovery_timeout``, so a lost call cannot wedge the circuit.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._state: CircuitState = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started_at = 0.0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == "open" and self.retry_after == 0:
+            self._state = "half_open"
+            self._trial_in_flight = False
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a trial call through."""
+        if self._state != "open":
+            return 0
+        return max(0.0, self._opened_at + self.recovery_timeout - self._clock())
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and (
+            not self._trial_in_flight
+            or self._clock() - self._trial_started_at >= self.recovery_timeout
+        ):
+            self._trial_in_flight = True
+            self._trial_started_at = self._clock()
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._state != "closed":
+            logger.info(f"Circuit {self.key} closed")
+        self._state = "closed"
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Let another trial through, the current one ending with no verdict."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == "half_open" or self._failures >= self.failure_threshold:
+            if self._state != "open":
+                logger.warning(
+                    f"Circuit {self.key} opened after {self._failures} failures"
+                )
+            self._state = "open"
+            self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def snapshot(self) -> CircuitBreakerSnapshot:
+        state = self.state
+        return CircuitBreakerSnapshot(
+            key=self.key,
+            state=state,
+            failures=self._failures,
+            retry_after=self.retry_after if state == "open" else None,
+        )
+
+
+class CircuitBreakerRegistry:
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(
+        self, key: str, failure_threshold: int, recovery_timeout: float
+    ) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(key, failure_threshold, recovery_timeout)
+            self._breakers[key] = breaker
+        breaker.failure_threshold = failure_threshold
+        breaker.recovery_timeout = recovery_timeout
+        return breaker
+
+    def snapshots(self) -> list[CircuitBreakerSnapshot]:
+        return [breaker.snapshot() for breaker in self._breakers.values()]
+
+    def clear(self) -> None:
+        self._breakers = {}
+
+
+circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,64 @@
+import csv
+import io
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Literal, TypeAlias
+
+from pydantic import BaseModel
+
+from .canonical_json import dumps
+
+ExportFormat: TypeAlias = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def export_filename(name: str, format: ExportFormat, compress: bool) -> str:
+    return f"{name}.{format}.gz" if compress else f"{name}.{format}"
+
+
+async def encode_rows(
+    rows: AsyncIterable[BaseModel],
+    fields: tuple[str, ...],
+    format: ExportFormat,
+    compress: bool = False,
+    chunk_size: int = 64 * 1024,
+) -> AsyncIterator[bytes]:
+    """Encode ``rows`` as NDJSON or CSV, in chunks of about ``chunk_size`` bytes.
+
+    Only ``fields`` are written, in that order for CSV. With ``compress`` the
+    output is a gzip stream, compressed as it goes.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    buffer = bytearray()
+
+    if format == "csv":
+        text = io.StringIO()
+        writer = csv.writer(text)
+
+        def encode(row: dict[str, Any]) -> bytes:
+            writer.writerow(row.get(field) for field in fields)
+            line = text.getvalue()
+            text.seek(0)
+            text.truncate()
+            return line.encode()
+
+        buffer += ",".join(fields).encode() + b"\r\n"
+    else:
+
+        def encode(row: dict[str, Any]) -> bytes:
+            return dumps(row) + b"\n"
+
+    include = set(fields)
+    async for row in rows:
+        buffer += encode(row.model_dump(mode="json", include=include))
+        if len(buffer) >= chunk_size:
+            yield compressor.compress(bytes(buffer)) if compress else bytes(buffer)
+            buffer.clear()
+
+    if compress:
+        yield compressor.compress(bytes(buffer)) + compressor.flush()
+    elif buffer:
+        yield bytes(buffer)
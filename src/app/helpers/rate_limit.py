@@ -0,0 +1,85 @@
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """Holds up to ``burst`` tokens, refilled at ``rate`` tokens per second.
+
+    Each call takes ``cost`` tokens; when the bucket does not hold enough, the
+    call is refused and nothing is taken.
+    """
+
+    def __init__(
+        self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self.tokens = burst
+        self._updated_at = clock()
+
+    def take(self, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens, or return the seconds until there are enough."""
+        now = self._clock()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+    def is_full(self, now: float) -> bool:
+        """Whether the bucket has refilled, i.e. is as good as a new one."""
+        return self.tokens + (now - self._updated_at) * self.rate >= self.burst
+
+
+class RateLimiter:
+    """In-process token buckets, one per key.
+
+    Buckets that have refilled are dropped every ``sweep_interval`` seconds:
+    a new bucket starts full, so the limits are the same and keys that are no
+    longer used do not pile up.
+    """
+
+    def __init__(
+        self,
+        sweep_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._buckets: dict[str, TokenBucket] = {}
+        self._sweep_interval = sweep_interval
+        self._clock = clock
+        self._swept_at = clock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        now = self._clock()
+        if now - self._swept_at >= self._sweep_interval:
+            self._sweep(now)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate, burst, self._clock)
+            self._buckets[key] = bucket
+        bucket.rate = rate
+        bucket.burst = burst
+        return bucket.take(cost)
+
+    def clear(self) -> None:
+        self._buckets = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _sweep(self, now: float) -> None:
+        self._buckets = {
+            key: bucket
+            for key, bucket in self._buckets.items()
+            if not bucket.is_full(now)
+        }
+        self._swept_at = now
+
+
+rate_limiter = RateLimiter()
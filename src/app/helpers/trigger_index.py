@@ -0,0 +1,212 @@
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Hashable, Literal, TypeAlias
+
+from src.app.core.logger import logging
+from src.app.helpers.url_matcher import UrlMatcher
+from src.app.schemas.trigger import Trigger as TriggerSchema
+from src.app.types.events import EventType
+
+logger = logging.getLogger(__name__)
+
+TriggerIndexOp: TypeAlias = tuple[
+    Literal["upsert", "remove"], str, TriggerSchema | None
+]
+
+
+@lru_cache(maxsize=4096)
+def compile_url_regex(url_regex: str) -> re.Pattern[str] | None:
+    try:
+        return re.compile(url_regex)
+    except re.error as e:
+        logger.warning(f"Invalid trigger url_regex {url_regex!r}: {e}")
+        return None
+
+
+@dataclass(slots=True)
+class IndexedTrigger:
+    trigger: TriggerSchema
+    seq: int
+
+
+@dataclass(slots=True)
+class TriggerRoute:
+    triggers: dict[str, IndexedTrigger] = field(default_factory=dict)
+    matcher: UrlMatcher = field(default_factory=UrlMatcher)
+
+
+class TriggerIndex:
+    """In-process routing table of triggers, keyed by event then by user id.
+
+    Triggers without a user live in the ``None`` bucket and apply to everyone.
+    The index is loaded once from the database and then kept in sync by
+    ``TriggerCRUD`` after each committed create, update or delete, so routing an
+    event never has to query the ``triggers`` table. Each bucket keeps its
+    ``url_regex`` patterns in a combined ``UrlMatcher``.
+
+    Other workers write triggers without telling this process, so
+    ``ensure_fresh`` also reloads the index when the table's version changes.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._version: Hashable | None = None
+        self._checked_at = 0.0
+        self._loaded = False
+        self._loading = False
+        self._pending: list[TriggerIndexOp] = []
+        self._seq = 0
+        self._by_id: dict[str, IndexedTrigger] = {}
+        self._routes: dict[EventType, dict[str | None, TriggerRoute]] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def clear(self) -> None:
+        self._version = None
+        self._checked_at = 0.0
+        self._loaded = False
+        self._pending = []
+        self._seq = 0
+        self._by_id = {}
+        self._routes = {}
+
+    async def ensure_loaded(
+        self, loader: Callable[[], Awaitable[list[TriggerSchema]]]
+    ) -> None:
+        if self._loaded:
+            return
+
+        # Writes committed while the snapshot is being read are replayed on top
+        # of it, so a trigger created mid-load cannot be lost.
+        self._loading = True
+        try:
+            triggers = await loader()
+        finally:
+            self._loading = False
+
+        if self._loaded:
+            return
+
+        pending, self._pending = self._pending, []
+        self.clear()
+        for trigger in triggers:
+            self._insert(trigger)
+        for op, trigger_id, trigger in pending:
+            self._apply(op, trigger_id, trigger)
+        self._loaded = True
+
+        logger.info(f"Trigger index loaded with {len(self._by_id)} triggers")
+
+    async def ensure_fresh(
+        self,
+        loader: Callable[[], Awaitable[list[TriggerSchema]]],
+        version: Callable[[], Awaitable[Any]],
+        interval: float,
+    ) -> None:
+        """Load the index, then reload it if ``version`` changed since.
+
+        ``version`` is read at most every ``interval`` seconds (never if 0).
+        It is read before the snapshot, so a write landing in between is
+        seen as a change by the next check rather than missed.
+        """
+        if self._loaded:
+            if interval <= 0 or self._clock() - self._checked_at < interval:
+                return
+            self._checked_at = self._clock()
+            current = await version()
+            if current == self._version:
+                return
+            logger.info("Triggers changed since the index was loaded, reloading")
+            # No await until ensure_loaded starts recording writes
+            self._loaded = False
+        else:
+            current = await version()
+
+        await self.ensure_loaded(loader)
+        self._version = current
+        self._checked_at = self._clock()
+
+    def upsert(self, trigger: TriggerSchema) -> None:
+        self._record("upsert", trigger.id, trigger)
+
+    def remove(self, trigger_id: str) -> None:
+        self._record("remove", trigger_id, None)
+
+    def get(self, trigger_id: str) -> TriggerSchema | None:
+        indexed = self._by_id.get(trigger_id)
+        return indexed.trigger if indexed else None
+
+    def match(
+        self, event: EventType, user_id: str | None, url: str | None
+    ) -> list[TriggerSchema]:
+        buckets = self._routes.get(event)
+        if not buckets:
+            return []
+
+        candidates: list[IndexedTrigger] = []
+        for bucket_user_id in {None, user_id}:
+            route = buckets.get(bucket_user_id)
+            if route is not None:
+                candidates.extend(
+                    route.triggers[trigger_id]
+                    for trigger_id in route.matcher.match(url)
+                )
+
+        candidates.sort(key=lambda indexed: indexed.seq)
+        return [indexed.trigger for indexed in candidates]
+
+    def _record(
+        self,
+        op: Literal["upsert", "remove"],
+        trigger_id: str,
+        trigger: TriggerSchema | None,
+    ) -> None:
+        if self._loading:
+            self._pending.append((op, trigger_id, trigger))
+        if self._loaded:
+            self._apply(op, trigger_id, trigger)
+
+    def _apply(
+        self,
+        op: Literal["upsert", "remove"],
+        trigger_id: str,
+        trigger: TriggerSchema | None,
+    ) -> None:
+        previous = self._discard(trigger_id)
+        if op == "upsert" and trigger is not None:
+            self._insert(trigger, seq=previous.seq if previous else None)
+
+    def _insert(self, trigger: TriggerSchema, seq: int | None = None) -> None:
+        if seq is None:
+            seq = self._seq
+            self._seq += 1
+
+        indexed = IndexedTrigger(trigger=trigger, seq=seq)
+        self._by_id[trigger.id] = indexed
+        route = self._routes.setdefault(trigger.event, {}).setdefault(
+            trigger.user_id, TriggerRoute()
+        )
+        route.triggers[trigger.id] = indexed
+        route.matcher.add(trigger.id, trigger.url_regex)
+
+    def _discard(self, trigger_id: str) -> IndexedTrigger | None:
+        indexed = self._by_id.pop(trigger_id, None)
+        if indexed is None:
+            return None
+
+        trigger = indexed.trigger
+        buckets = self._routes.get(trigger.event, {})
+        route = buckets.get(trigger.user_id)
+        if route is not None:
+            route.triggers.pop(trigger_id, None)
+            route.matcher.remove(trigger_id)
+            if not route.triggers:
+                buckets.pop(trigger.user_id, None)
+        return indexed
+
+
+trigger_index = TriggerIndex()
@@ -0,0 +1,151 @@
+import re
+from dataclasses import dataclass, field
+
+from src.app.core.logger import logging
+
+logger = logging.getLogger(__name__)
+
+_META_CHARS = frozenset(".^$*+?{}[]|()\\")
+_QUANTIFIERS = frozenset("*+?{")
+_MATCH_ANYTHING_SUFFIXES = ("", ".*")
+
+
+def split_literal_prefix(url_regex: str) -> tuple[str, bool]:
+    """Return the literal text every ``re.match`` hit must start with.
+
+    The second value is True when the pattern is nothing more than that prefix
+    (optionally followed by ``.*``), in which case a prefix check is enough and
+    the regex never has to run.
+    """
+    if "|" in url_regex:
+        return "", False
+
+    pattern = url_regex[1:] if url_regex.startswith("^") else url_regex
+
+    prefix: list[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                break
+            literal, width = pattern[i + 1], 2
+        elif char in _META_CHARS:
+            break
+        else:
+            literal, width = char, 1
+
+        # A quantified character is optional or repeated, so it cannot be
+        # part of the mandatory prefix.
+        if i + width < len(pattern) and pattern[i + width] in _QUANTIFIERS:
+            return "".join(prefix), False
+
+        prefix.append(literal)
+        i += width
+
+    return "".join(prefix), pattern[i:] in _MATCH_ANYTHING_SUFFIXES
+
+
+@dataclass(slots=True)
+class _PrefixBucket:
+    exact: set[str] = field(default_factory=set)
+    checked: dict[str, re.Pattern[str]] = field(default_factory=dict)
+
+
+class UrlMatcher:
+    """Match one URL against many ``url_regex`` patterns in a single pass.
+
+    Each pattern is split into its literal prefix and stored in a hash table per
+    prefix length. Matching a URL costs one dictionary lookup per distinct
+    prefix length rather than one ``re.match`` per pattern; only patterns whose
+    prefix matched (or that have no literal prefix at all) run their regex.
+    """
+
+    def __init__(self):
+        self._buckets: dict[int, dict[str, _PrefixBucket]] = {}
+        self._lengths: list[int] = []
+        self._locations: dict[str, tuple[int, str] | None] = {}
+        self._always: set[str] = set()
+        self._invalid: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._locations
+
+    def add(self, key: str, url_regex: str | None) -> bool:
+        """Register ``url_regex`` under ``key``. Returns False if it is invalid."""
+        self.remove(key)
+
+        if url_regex is None:
+            self._always.add(key)
+            self._locations[key] = None
+            return True
+
+        try:
+            pattern = re.compile(url_regex)
+        except re.error as e:
+            logger.warning(f"Invalid url_regex {url_regex!r} for {key}: {e}")
+            self._invalid.add(key)
+            self._locations[key] = None
+            return False
+
+        prefix, prefix_only = split_literal_prefix(url_regex)
+        length = len(prefix)
+        if length not in self._buckets:
+            self._buckets[length] = {}
+            self._lengths = sorted(self._buckets)
+
+        bucket = self._buckets[length].setdefault(prefix, _PrefixBucket())
+        if prefix_only:
+            bucket.exact.add(key)
+        else:
+            bucket.checked[key] = pattern
+        self._locations[key] = (length, prefix)
+        return True
+
+    def remove(self, key: str) -> None:
+        if key not in self._locations:
+            return
+
+        location = self._locations.pop(key)
+        self._always.discard(key)
+        self._invalid.discard(key)
+        if location is None:
+            return
+
+        length, prefix = location
+        buckets = self._buckets[length]
+        bucket = buckets[prefix]
+        bucket.exact.discard(key)
+        bucket.checked.pop(key, None)
+        if bucket.exact or bucket.checked:
+            return
+
+        del buckets[prefix]
+        if not buckets:
+            del self._buckets[length]
+            self._lengths = sorted(self._buckets)
+
+    def match(self, url: str | None) -> set[str]:
+        """Return the keys of every pattern that ``re.match``-es ``url``.
+
+        Without a URL there is nothing to filter on, so every key matches.
+        """
+        if url is None:
+            return set(self._locations)
+
+        matched = set(self._always)
+        url_length = len(url)
+        for length in self._lengths:
+            if length > url_length:
+                break
+            bucket = self._buckets[length].get(url[:length])
+            if bucket is None:
+                continue
+            matched.update(bucket.exact)
+            for key, pattern in bucket.checked.items():
+                if pattern.match(url):
+                    matched.add(key)
+        return matched
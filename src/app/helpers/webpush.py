@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Any, Mapping, cast
 
 import aiohttp
+from pydantic import ValidationError
 from webpush import WebPush, WebPushSubscription  # type: ignore
 
 from src.app.core.config import Settings
@@ -18,16 +19,28 @@ wp = WebPush(
 )
 
 
+def parse_subscription(data: Mapping[str, Any]) -> WebPushSubscription | None:
+    try:
+        return WebPushSubscription.model_validate(data)
+    except ValidationError as e:
+        logger.error(f"Webpush failed to validate subscription data: {e}")
+        return None
+
+
 async def send_webpush(
-    subscription_data: dict[str, Any], payload: Mapping[str, Any]
+    subscription: WebPushSubscription | Mapping[str, Any], payload: Mapping[str, Any]
 ) -> bool:
+    if not isinstance(subscription, WebPushSubscription):
+        subscription = parse_subscription(subscription)
+        if subscription is None:
+            return False
+
     try:
-        subscription = WebPushSubscription.model_validate(subscription_data)
         message = wp.get(
             message=cast(dict[str, Any], payload), subscription=subscription
         )
     except Exception as e:
-        logger.error(f"Webpush failed to validate subscription data: {e}")
+        logger.error(f"Webpush failed to encrypt the message: {e}")
         return False
 
     try:
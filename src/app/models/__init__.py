@@ -1,4 +1,6 @@
-from .trigger import Trigger
+from .rate_limit import RateLimitBucket
+from .trigger import Trigger, TriggersVersion
 from .user import User
 from .webhook import Webhook
 from .webhook_usage import WebhookUsage
+from .webpush_subscription import WebPushSubscription
@@ -0,0 +1,17 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.db.database import Base
+
+
+class RateLimitBucket(Base, kw_only=True):
+    """Token bucket shared by every process, see RateLimitCRUD.take."""
+
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tokens: Mapped[float] = mapped_column(nullable=False)
+    # Wall-clock seconds, comparable across processes
+    updated_at: Mapped[float] = mapped_column(nullable=False)
+    # Whether the last take was granted; RETURNING only sees the new row
+    granted: Mapped[bool] = mapped_column(default=False)
@@ -1,8 +1,9 @@
 import uuid as uuid_pkg
-from typing import Literal, TypeAlias
+from typing import Any, Literal, TypeAlias
 
-from sqlalchemy import ForeignKey, String
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Index, String, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Mapped, Session, mapped_column
 
 from ..core.db.database import Base, ModelMixin
 from ..core.db.models import IDMixin, TimestampMixin
@@ -13,6 +14,16 @@ TriggerSource: TypeAlias = Literal["n8n", "zapier"]
 
 class Trigger(Base, ModelMixin, IDMixin, TimestampMixin, kw_only=True):
     __tablename__ = "triggers"
+    __table_args__ = (
+        # Listing by event, optionally for one user
+        Index("ix_triggers_event_user_id", "event", "user_id"),
+        # Keyset pages, see crud/pagination.py
+        Index("ix_triggers_created_at_id", "created_at", "id"),
+        Index("ix_triggers_event_created_at_id", "event", "created_at", "id"),
+        # Foreign key lookups when a webhook or user is deleted
+        Index("ix_triggers_webhook_id", "webhook_id"),
+        Index("ix_triggers_user_id", "user_id"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     webhook_id: Mapped[str | None] = mapped_column(
@@ -26,3 +37,37 @@ class Trigger(Base, ModelMixin, IDMixin, TimestampMixin, kw_only=True):
     user_id: Mapped[str | None] = mapped_column(
         ForeignKey("users.id"), nullable=True, default=None
     )
+
+
+class TriggersVersion(Base, kw_only=True):
+    """Single row counting the writes to ``triggers``, see TriggerCRUD.version.
+
+    Unlike ``updated_at``, which SQLite stores to the second, it changes on
+    every write, however close together.
+    """
+
+    __tablename__ = "triggers_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(nullable=False)
+
+
+@event.listens_for(Session, "before_flush")
+def bump_triggers_version(session: Session, flush_context: Any, instances: Any):
+    # In the flush's transaction, so other workers see both or neither
+    written = [*session.new, *session.deleted] + [
+        obj for obj in session.dirty if session.is_modified(obj)
+    ]
+    if not any(isinstance(obj, Trigger) for obj in written):
+        return
+
+    dialect = session.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    session.execute(
+        insert(TriggersVersion)
+        .values(id=1, version=1)
+        .on_conflict_do_update(
+            index_elements=[TriggersVersion.id],
+            set_={"version": TriggersVersion.version + 1},
+        )
+    )
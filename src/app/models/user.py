@@ -1,6 +1,6 @@
 from typing import Literal, TypeAlias
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.db.database import Base, ModelMixin
@@ -11,6 +11,10 @@ UserRole: TypeAlias = Literal["admin", "user"]
 
 class User(Base, ModelMixin, IDMixin, TimestampMixin, kw_only=True):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pages, see crud/pagination.py
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     hashed_password: Mapped[str] = mapped_column(String(255))
@@ -1,6 +1,6 @@
 import uuid as uuid_pkg
 
-from sqlalchemy import String
+from sqlalchemy import Index, String, false
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.db.database import Base, ModelMixin
@@ -9,9 +9,32 @@ from ..core.db.models import IDMixin, TimestampMixin
 
 class Webhook(Base, ModelMixin, IDMixin, TimestampMixin, kw_only=True):
     __tablename__ = "webhooks"
+    __table_args__ = (
+        # Keyset pages, see crud/pagination.py
+        Index("ix_webhooks_created_at_id", "created_at", "id"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     url: Mapped[str] = mapped_column(String(255), nullable=False)
     auth_token: Mapped[str] = mapped_column(
         String(255), nullable=False, default=lambda: str(uuid_pkg.uuid4())
     )
+
+    # Opt-in micro-batching: up to batch_max_size events per request, sent at
+    # the latest batch_linger_ms after the first one. Null or 1 disables it.
+    batch_max_size: Mapped[int | None] = mapped_column(nullable=True, default=None)
+    batch_linger_ms: Mapped[int] = mapped_column(default=100, server_default="100")
+
+    # Gzip request bodies above WEBHOOK_GZIP_MIN_SIZE for receivers that opt in
+    gzip_body: Mapped[bool] = mapped_column(default=False, server_default=false())
+
+    # Send large html_content as a blob store reference instead of inline
+    html_by_reference: Mapped[bool] = mapped_column(
+        default=False, server_default=false()
+    )
+
+    # Deliveries per second and burst; null falls back to RATE_LIMIT_WEBHOOK_*
+    rate_limit_per_second: Mapped[float | None] = mapped_column(
+        nullable=True, default=None
+    )
+    rate_limit_burst: Mapped[int | None] = mapped_column(nullable=True, default=None)
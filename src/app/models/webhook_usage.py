@@ -1,22 +1,51 @@
+from datetime import datetime
 from typing import Any, Literal, TypeAlias
 
-from sqlalchemy import JSON, ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.db.database import Base, ModelMixin
 from ..core.db.models import IDMixin, TimestampMixin
+from ..core.db.types import JSONVariant, UTCDateTime
 from ..types.events import EventType
 
-WebhookUsageStatus: TypeAlias = Literal["success", "error", "pending"]
+WebhookUsageStatus: TypeAlias = Literal["success", "error", "pending", "rate_limited"]
+
+# Statuses a usage never leaves; its payload is no longer needed once there
+TERMINAL_STATUSES: frozenset[WebhookUsageStatus] = frozenset(
+    {"success", "error", "rate_limited"}
+)
 
 
 class WebhookUsage(Base, ModelMixin, IDMixin, TimestampMixin, kw_only=True):
     __tablename__ = "webhook_usage"
+    __table_args__ = (
+        # A webhook's history, newest first
+        Index("ix_webhook_usage_webhook_id_created_at", "webhook_id", "created_at"),
+        # Usages by status over time (listing, retention)
+        Index("ix_webhook_usage_status_created_at", "status", "created_at"),
+        # Outbox polling for due pending deliveries
+        Index("ix_webhook_usage_status_next_attempt_at", "status", "next_attempt_at"),
+        # Keyset pages over every usage or one event, see crud/pagination.py
+        Index("ix_webhook_usage_created_at_id", "created_at", "id"),
+        Index("ix_webhook_usage_event_created_at_id", "event", "created_at", "id"),
+    )
 
     webhook_id: Mapped[str] = mapped_column(ForeignKey("webhooks.id"))
     event: Mapped[EventType] = mapped_column(String(255), nullable=False)
     status: Mapped[WebhookUsageStatus] = mapped_column(String(255), nullable=False)
 
-    webpush_subscription_data: Mapped[dict[str, Any]] = mapped_column(
-        JSON, nullable=True, default_factory=dict
+    # Where callbacks are pushed to, shared by the usages of the same browser
+    webpush_subscription_id: Mapped[str | None] = mapped_column(
+        ForeignKey("webpush_subscriptions.id"), nullable=True, default=None
+    )
+
+    # Outbox: what to send and when to (re)try it
+    payload: Mapped[dict[str, Any] | None] = mapped_column(
+        JSONVariant, nullable=True, default=None
+    )
+    attempts: Mapped[int] = mapped_column(default=0, server_default="0")
+    next_attempt_at: Mapped[datetime | None] = mapped_column(
+        UTCDateTime, nullable=True, default=None
     )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True, default=None)
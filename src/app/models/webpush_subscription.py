@@ -0,0 +1,19 @@
+from typing import Any
+
+from sqlalchemy import String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.db.database import Base, ModelMixin
+from ..core.db.models import IDMixin, TimestampMixin
+from ..core.db.types import JSONVariant
+
+
+class WebPushSubscription(Base, ModelMixin, IDMixin, TimestampMixin, kw_only=True):
+    """A browser push subscription, stored once however many usages carry it."""
+
+    __tablename__ = "webpush_subscriptions"
+
+    # SHA-256 of the endpoint, which identifies a subscription
+    endpoint_hash: Mapped[str] = mapped_column(String(64), unique=True)
+    endpoint: Mapped[str] = mapped_column(Text, nullable=False)
+    data: Mapped[dict[str, Any]] = mapped_column(JSONVariant, nullable=False)
@@ -6,7 +6,7 @@ from pydantic import BaseModel, Field
 
 from src.app.core.schemas import IDSchema, TimestampSchema
 from src.app.models.trigger import TriggerSource
-from src.app.types.events import EventType
+from src.app.types.events import EventContext, EventType
 
 
 @wraps(Field)
@@ -82,3 +82,9 @@ class TriggerUpdate(BaseModel):
     url_regex: str | None = url_regex_field_factory(default=None)
     name: str | None = name_field_factory(default=None)
     event: str | None = event_field_factory(default=None)
+
+
+class TriggerEventPayload(BaseModel):
+    event: EventType
+    context: EventContext
+    web_push_subscription: dict[str, Any] | None = None
@@ -31,6 +31,63 @@ def auth_token_field_factory(**kwargs: Any):
     )
 
 
+@wraps(Field)
+def batch_max_size_field_factory(**kwargs: Any):
+    return Field(
+        description="Send up to this many events per request, as a JSON array",
+        examples=[50],
+        ge=1,
+        **kwargs,
+    )
+
+
+@wraps(Field)
+def batch_linger_ms_field_factory(**kwargs: Any):
+    return Field(
+        description="How long the first event of a batch waits for others",
+        examples=[100],
+        ge=0,
+        le=60_000,
+        **kwargs,
+    )
+
+
+@wraps(Field)
+def gzip_body_field_factory(**kwargs: Any):
+    return Field(
+        description="Gzip large request bodies (Content-Encoding: gzip)",
+        **kwargs,
+    )
+
+
+@wraps(Field)
+def html_by_reference_field_factory(**kwargs: Any):
+    return Field(
+        description="Replace large html_content by a hash and a signed fetch URL",
+        **kwargs,
+    )
+
+
+@wraps(Field)
+def rate_limit_per_second_field_factory(**kwargs: Any):
+    return Field(
+        description="Deliveries per second, 0 for no limit (defaults to the server's)",
+        examples=[5.0],
+        ge=0,
+        **kwargs,
+    )
+
+
+@wraps(Field)
+def rate_limit_burst_field_factory(**kwargs: Any):
+    return Field(
+        description="Deliveries allowed at once above the rate",
+        examples=[20],
+        ge=1,
+        **kwargs,
+    )
+
+
 class WebhookBase(BaseModel):
     model_config = {"from_attributes": False}
 
@@ -38,6 +95,14 @@ class WebhookBase(BaseModel):
         default_factory=lambda: f"Webhook created at {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
     )
     url: str = url_field_factory()
+    batch_max_size: int | None = batch_max_size_field_factory(default=None)
+    batch_linger_ms: int = batch_linger_ms_field_factory(default=100)
+    gzip_body: bool = gzip_body_field_factory(default=False)
+    html_by_reference: bool = html_by_reference_field_factory(default=False)
+    rate_limit_per_second: float | None = rate_limit_per_second_field_factory(
+        default=None
+    )
+    rate_limit_burst: int | None = rate_limit_burst_field_factory(default=None)
 
 
 class WebhookBaseSecured(WebhookBase):
@@ -67,3 +132,11 @@ class WebhookCreate(WebhookBase):
 class WebhookUpdate(BaseModel):
     name: str | None = name_field_factory(default=None)
     url: str | None = url_field_factory(default=None)
+    batch_max_size: int | None = batch_max_size_field_factory(default=None)
+    batch_linger_ms: int | None = batch_linger_ms_field_factory(default=None)
+    gzip_body: bool | None = gzip_body_field_factory(default=None)
+    html_by_reference: bool | None = html_by_reference_field_factory(default=None)
+    rate_limit_per_second: float | None = rate_limit_per_second_field_factory(
+        default=None
+    )
+    rate_limit_burst: int | None = rate_limit_burst_field_factory(default=None)
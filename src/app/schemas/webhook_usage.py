@@ -1,3 +1,4 @@
+from datetime import datetime
 from functools import wraps
 from typing import Any
 from uuid import uuid4
@@ -35,15 +36,10 @@ def status_field_factory(**kwargs: Any):
 
 
 @wraps(Field)
-def webpush_subscription_data_field_factory(**kwargs: Any):
+def webpush_subscription_id_field_factory(**kwargs: Any):
     return Field(
-        description="The webpush subscription data",
-        examples=[
-            {
-                "endpoint": "https://example.com/webpush",
-                "keys": {"p256dh": "BGoQYQ==", "auth": "1234567890"},
-            }
-        ],
+        description="The ID of the webpush subscription callbacks are pushed to",
+        examples=[str(uuid4())],
         **kwargs
     )
 
@@ -54,13 +50,20 @@ class WebhookUsageBase(BaseModel):
     webhook_id: str = webhook_id_field_factory()
     event: EventType = event_field_factory()
     status: WebhookUsageStatus = status_field_factory(default="pending")
-    webpush_subscription_data: dict[str, Any] | None = (
-        webpush_subscription_data_field_factory(default=None)
+    webpush_subscription_id: str | None = webpush_subscription_id_field_factory(
+        default=None
     )
 
 
 class WebhookUsage(WebhookUsageBase, IDSchema, TimestampSchema):
-    pass
+    attempts: int = Field(default=0, description="Delivery attempts made so far")
+    next_attempt_at: datetime | None = Field(
+        default=None, description="When a pending delivery is (re)tried"
+    )
+    last_error: str | None = Field(
+        default=None, description="Error of the last failed attempt"
+    )
+    payload: dict[str, Any] | None = Field(default=None, exclude=True)
 
 
 class WebhookUsageRead(WebhookUsage):
@@ -68,7 +71,8 @@ class WebhookUsageRead(WebhookUsage):
 
 
 class WebhookUsageCreate(WebhookUsageBase):
-    pass
+    payload: dict[str, Any] | None = None
+    next_attempt_at: datetime | None = None
 
 
 class WebhookUsageUpdate(BaseModel):
@@ -1,12 +1,19 @@
 import os
+from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.core.api_keys import api_key_store, generate_api_key, hash_api_key
 from src.app.core.config import settings
+from src.app.core.db.database import async_get_db, session_manager
 from src.app.core.security import create_access_token
+from src.app.crud.user import UserCRUD
 from src.app.models.user import User
+from src.app.schemas.user import UserUpdateHashedPassword
 from tests.helpers.fakers.user import UserFaker, UserFields
 
 pytestmark = pytest.mark.asyncio
@@ -58,3 +65,109 @@ async def test_auth_me_invalid_token(client_anon: TestClient):
         "/api/v1/auth/me", headers={"Authorization": "Bearer invalid"}
     )
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_auth_cache_hits_and_stats(
+    client_auth: TestClient, client_admin: TestClient
+):
+    # client_auth and client_admin share one TestClient: the last token wins
+    for _ in range(3):
+        assert client_admin.get("/api/v1/health-secured").status_code == 200
+
+    response = client_admin.get("/api/v1/cache-stats")
+    assert response.status_code == 200
+    stats = response.json()["auth"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 3
+    assert stats["size"] == 1
+
+
+@pytest.mark.asyncio
+async def test_auth_cache_invalidated_on_user_delete(
+    client_auth: TestClient, db: AsyncSession, test_user: User
+):
+    assert client_auth.get("/api/v1/health-secured").status_code == 200
+
+    await UserCRUD(db).delete(test_user.id)
+
+    assert client_auth.get("/api/v1/health-secured").status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_auth_cache_invalidated_on_user_update(
+    client_auth: TestClient, db: AsyncSession, test_user: User
+):
+    assert client_auth.get("/api/v1/auth/me").json()["role"] == "user"
+
+    await UserCRUD(db).update(
+        test_user.id,
+        UserUpdateHashedPassword(
+            email=test_user.email,
+            role="admin",
+            hashed_password=test_user.hashed_password,
+        ),
+    )
+
+    assert client_auth.get("/api/v1/auth/me").json()["role"] == "admin"
+
+
+async def test_cache_stats_requires_admin(client_auth: TestClient):
+    response = client_auth.get("/api/v1/cache-stats")
+    assert response.status_code == 403
+
+
+@pytest.fixture
+def api_key(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    api_key = generate_api_key()
+    api_keys_file = tmp_path / "api_keys"
+    api_keys_file.write_text(
+        f"# name sha256 role\nbilling {hash_api_key(api_key)} admin\n"
+    )
+    monkeypatch.setattr(settings, "API_KEYS_FILE", str(api_keys_file))
+    api_key_store.load(settings)
+    yield api_key
+    api_key_store.clear()
+
+
+@pytest.mark.asyncio
+async def test_auth_api_key(
+    app: FastAPI,
+    client_anon: TestClient,
+    api_key: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.delitem(app.dependency_overrides, async_get_db)
+    new_session = Mock(wraps=session_manager.new_session)
+    monkeypatch.setattr(session_manager, "new_session", new_session)
+
+    response = client_anon.get(
+        "/api/v1/auth/me", headers={"X-Hercule-Secret-Key": api_key}
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "email": "api-key-billing@example.com",
+        "role": "admin",
+    }
+    assert new_session.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_auth_invalid_api_key(client_anon: TestClient, api_key: str):
+    response = client_anon.get(
+        "/api/v1/auth/me", headers={"X-Hercule-Secret-Key": f"{api_key}x"}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_auth_not_required_skips_database(
+    app: FastAPI, client_anon: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "AUTH_REQUIRED", False)
+    monkeypatch.delitem(app.dependency_overrides, async_get_db)
+    new_session = Mock(wraps=session_manager.new_session)
+    monkeypatch.setattr(session_manager, "new_session", new_session)
+
+    assert client_anon.get("/api/v1/health-secured").status_code == 200
+    assert new_session.call_count == 0
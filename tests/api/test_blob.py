@@ -0,0 +1,111 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.blob_store import blob_store
+from src.app.core.config import settings
+from src.app.core.http import http_client_manager
+from tests.helpers.fakers.trigger import TriggerFaker, TriggerFields
+from tests.helpers.fakers.webhook import WebhookFaker, WebhookFields
+
+trigger_faker = TriggerFaker()
+webhook_faker = WebhookFaker()
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_sends_html_by_reference(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "BLOB_STORE_DIR", str(tmp_path))
+    blob_store.init(settings)
+
+    webhook = await webhook_faker.create_fake(
+        db,
+        WebhookFields(url=f"{test_api_url}/test_webhook", html_by_reference=True),
+    )
+    await trigger_faker.create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    requests: list[dict[str, Any]] = []
+    post = http_client_manager.post
+
+    async def recording_post(url: str, **kwargs: Any) -> httpx.Response:
+        requests.append(kwargs)
+        return await post(url, **kwargs)
+
+    monkeypatch.setattr(http_client_manager, "post", recording_post)
+
+    html_content = "<div>" + "<p>Hello</p>" * 1000 + "</div>"
+    event = {
+        "event": "page_opened",
+        "context": {"url": "https://example.com", "html_content": html_content},
+    }
+    for _ in range(2):
+        response = client_auth.post("/api/v1/triggers/event", json=event)
+        assert response.status_code == 200
+
+    # Both deliveries point to the same blob, stored once
+    refs = [json.loads(request["content"])["context"] for request in requests]
+    assert all("html_content" not in context for context in refs)
+    [digest] = {context["html_content_ref"]["sha256"] for context in refs}
+    assert digest == hashlib.sha256(html_content.encode()).hexdigest()
+    assert refs[0]["html_content_ref"]["size"] == len(html_content)
+    assert blob_store.size == len(html_content)
+
+    url = httpx.URL(refs[0]["html_content_ref"]["url"])
+    path = url.path.removeprefix("/api/v1")
+    response = client_auth.get(f"/api/v1{path}", params=url.params)
+    assert response.status_code == 200
+    assert response.text == html_content
+    assert response.headers["content-security-policy"] == "sandbox"
+    assert response.headers["x-content-type-options"] == "nosniff"
+
+    params = dict(url.params)
+    params["signature"] = "0" * 64
+    response = client_auth.get(f"/api/v1{path}", params=params)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_sends_small_html_inline(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    webhook = await webhook_faker.create_fake(
+        db,
+        WebhookFields(url=f"{test_api_url}/test_webhook", html_by_reference=True),
+    )
+    await trigger_faker.create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    requests: list[dict[str, Any]] = []
+    post = http_client_manager.post
+
+    async def recording_post(url: str, **kwargs: Any) -> httpx.Response:
+        requests.append(kwargs)
+        return await post(url, **kwargs)
+
+    monkeypatch.setattr(http_client_manager, "post", recording_post)
+
+    context = {"url": "https://example.com", "html_content": "<p>Hello</p>"}
+    response = client_auth.post(
+        "/api/v1/triggers/event", json={"event": "page_opened", "context": context}
+    )
+    assert response.status_code == 200
+
+    [request] = requests
+    assert json.loads(request["content"])["context"]["html_content"] == "<p>Hello</p>"
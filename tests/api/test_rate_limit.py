@@ -0,0 +1,92 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.config import settings
+from src.app.models import WebhookUsage
+from tests.helpers.fakers.trigger import TriggerFaker, TriggerFields
+from tests.helpers.fakers.webhook import WebhookFaker, WebhookFields
+
+trigger_faker = TriggerFaker()
+webhook_faker = WebhookFaker()
+
+EVENT = {"event": "page_opened", "context": {"url": "https://example.com"}}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "database"])
+async def test_user_rate_limit(
+    client_auth: TestClient, monkeypatch: pytest.MonkeyPatch, backend: str
+):
+    monkeypatch.setattr(settings, "RATE_LIMIT_BACKEND", backend)
+    monkeypatch.setattr(settings, "RATE_LIMIT_USER_RATE", 0.1)
+    monkeypatch.setattr(settings, "RATE_LIMIT_USER_BURST", 2)
+
+    for _ in range(2):
+        response = client_auth.post("/api/v1/triggers/event", json=EVENT)
+        assert response.status_code == 200
+
+    response = client_auth.post("/api/v1/triggers/event", json=EVENT)
+    assert response.status_code == 429
+    assert response.json()["detail"] == "Rate limit exceeded"
+    assert 1 <= int(response.headers["Retry-After"]) <= 10
+
+    response = client_auth.post("/api/v1/triggers/events", json=[EVENT])
+    assert response.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_user_rate_limit_rejects_batches_over_the_burst(
+    client_auth: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "RATE_LIMIT_USER_BURST", 2)
+
+    response = client_auth.post("/api/v1/triggers/events", json=[EVENT] * 3)
+    assert response.status_code == 413
+
+    response = client_auth.post("/api/v1/triggers/events", json=[EVENT] * 2)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "database"])
+async def test_webhook_rate_limit_drops_deliveries(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+    backend: str,
+):
+    monkeypatch.setattr(settings, "RATE_LIMIT_BACKEND", backend)
+
+    webhook = await webhook_faker.create_fake(
+        db,
+        WebhookFields(
+            url=f"{test_api_url}/test_webhook",
+            rate_limit_per_second=0.01,
+            rate_limit_burst=1,
+        ),
+    )
+    await trigger_faker.create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    response = client_auth.post("/api/v1/triggers/events", json=[EVENT, EVENT])
+    assert response.status_code == 200
+    statuses = sorted(str(result[0]["status"]) for result in response.json())
+    assert statuses == ["error", "success"]
+
+    response = client_auth.post("/api/v1/triggers/event", json=EVENT)
+    assert response.status_code == 429
+    assert response.json()["detail"]["message"] == (
+        f"Rate limit exceeded for webhook {webhook.id}"
+    )
+    assert "Retry-After" in response.headers
+
+    webhook_usages = await db.execute(
+        select(WebhookUsage).where(WebhookUsage.webhook_id == webhook.id)
+    )
+    assert sorted(
+        (usage.status, usage.attempts) for usage in webhook_usages.scalars().all()
+    ) == [("rate_limited", 0), ("rate_limited", 0), ("success", 1)]
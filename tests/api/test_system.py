@@ -1,5 +1,11 @@
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from src.app.core.db.database import async_get_db, session_manager
+
 
 def test_health(client_anon: TestClient):
     response = client_anon.get("/api/v1/health")
@@ -16,3 +22,31 @@ def test_health_secured(client_auth: TestClient):
 def test_health_secured_unauthenticated(client_anon: TestClient):
     response = client_anon.get("/api/v1/health-secured")
     assert response.status_code == 401
+
+
+def test_cached_requests_do_not_open_a_session(
+    app: FastAPI, client_auth: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    # Use the real per-request unit of work instead of the test session
+    monkeypatch.delitem(app.dependency_overrides, async_get_db)
+    new_session = Mock(wraps=session_manager.new_session)
+    monkeypatch.setattr(session_manager, "new_session", new_session)
+
+    assert client_auth.get("/api/v1/health-secured").status_code == 200
+    assert new_session.call_count == 1  # user lookup on the cache miss
+
+    assert client_auth.get("/api/v1/health-secured").status_code == 200
+    assert client_auth.get("/api/v1/health-secured").status_code == 200
+    assert new_session.call_count == 1
+
+
+def test_dependencies_share_one_session(
+    app: FastAPI, client_admin: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.delitem(app.dependency_overrides, async_get_db)
+    new_session = Mock(wraps=session_manager.new_session)
+    monkeypatch.setattr(session_manager, "new_session", new_session)
+
+    # Router-level and route-level user dependencies, then the handler itself
+    assert client_admin.get("/api/v1/triggers").status_code == 200
+    assert new_session.call_count == 1
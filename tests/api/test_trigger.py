@@ -1,14 +1,27 @@
+import asyncio
+import gzip
+import hashlib
+import hmac
+import json
+from typing import Any
 from uuid import uuid4
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.session import Session
 
+from src.app.controllers.trigger import TriggerController
+from src.app.controllers.webhook import WebhookController
+from src.app.core.config import settings
+from src.app.core.delivery import DeliveryQueue, DeliveryQueueFull
+from src.app.core.http import http_client_manager
 from src.app.models import Trigger, Webhook, WebhookUsage
 from src.app.models.trigger import Trigger
 from src.app.models.user import User
+from src.app.types.events import EventContext
 from tests.helpers.fakers.trigger import TriggerFaker, TriggerFields
 from tests.helpers.fakers.webhook import WebhookFaker, WebhookFields
 
@@ -163,6 +176,38 @@ async def test_list_triggers_with_event(db: AsyncSession, client_auth: TestClien
     assert data[0]["event"] == "page_opened"
 
 
+@pytest.mark.asyncio
+async def test_list_triggers_pages(
+    db: AsyncSession, client_auth: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    # Created within the same second: pages are ordered by id on ties
+    created = [(await trigger_faker.create_fake(db)).id for _ in range(5)]
+
+    ids: list[str] = []
+    cursor = None
+    for _ in range(3):
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = client_auth.get("/api/v1/triggers", params=params)
+        assert response.status_code == 200
+        ids += [trigger["id"] for trigger in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+    assert cursor is None
+    assert sorted(ids) == sorted(created)
+
+    monkeypatch.setattr(settings, "API_PAGE_MAX_LIMIT", 3)
+    response = client_auth.get("/api/v1/triggers", params={"limit": 1000})
+    assert len(response.json()) == 3
+    assert "X-Next-Cursor" in response.headers
+
+
+def test_list_triggers_invalid_cursor(client_auth: TestClient):
+    response = client_auth.get("/api/v1/triggers", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    response = client_auth.get("/api/v1/triggers", params={"limit": 0})
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_update_trigger_success(db: AsyncSession, client_admin: TestClient):
     # First create a trigger
@@ -301,6 +346,101 @@ async def test_trigger_event_success(
     assert webhook_usage.status == "success"
 
 
+@pytest.mark.asyncio
+async def test_trigger_event_signs_sent_bytes(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    webhook = await webhook_faker.create_fake(
+        db, WebhookFields(url=f"{test_api_url}/test_webhook")
+    )
+    await trigger_faker.create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    requests: list[dict[str, Any]] = []
+    post = http_client_manager.post
+
+    async def recording_post(url: str, **kwargs: Any) -> httpx.Response:
+        requests.append(kwargs)
+        return await post(url, **kwargs)
+
+    monkeypatch.setattr(http_client_manager, "post", recording_post)
+
+    context = {"url": "https://example.com", "html_content": "<p>Déjà vu</p>"}
+    response = client_auth.post(
+        "/api/v1/triggers/event", json={"event": "page_opened", "context": context}
+    )
+    assert response.status_code == 200
+
+    # The signature covers the raw body, which is sent as is
+    [request] = requests
+    content: bytes = request["content"]
+    assert request["headers"]["Content-Type"] == "application/json"
+    assert (
+        request["headers"]["X-Hercule-Auth-Key"]
+        == hmac.new(webhook.auth_token.encode(), content, hashlib.sha256).hexdigest()
+    )
+    body = json.loads(content)
+    assert body["event"] == "page_opened"
+    assert body["context"]["html_content"] == "<p>Déjà vu</p>"
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_gzip_body(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    gzip_webhook = await webhook_faker.create_fake(
+        db, WebhookFields(url=f"{test_api_url}/test_webhook", gzip_body=True)
+    )
+    plain_webhook = await webhook_faker.create_fake(
+        db, WebhookFields(url=f"{test_api_url}/test_webhook")
+    )
+    for webhook in (gzip_webhook, plain_webhook):
+        await trigger_faker.create_fake(
+            db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+        )
+
+    requests: dict[str, dict[str, Any]] = {}
+    post = http_client_manager.post
+
+    async def recording_post(url: str, **kwargs: Any) -> httpx.Response:
+        requests[kwargs["headers"].get("Content-Encoding", "identity")] = kwargs
+        return await post(url, **kwargs)
+
+    monkeypatch.setattr(http_client_manager, "post", recording_post)
+
+    html_content = "<div>" + "<p>Hello</p>" * 1000 + "</div>"
+    context = {"url": "https://example.com", "html_content": html_content}
+    response = client_auth.post(
+        "/api/v1/triggers/event",
+        content=gzip.compress(
+            json.dumps({"event": "page_opened", "context": context}).encode()
+        ),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()] == ["success"] * 2
+
+    compressed = requests["gzip"]["content"]
+    plain = requests["identity"]["content"]
+    content = gzip.decompress(compressed)
+    assert len(compressed) < len(plain) // 10
+    assert json.loads(content)["context"]["html_content"] == html_content
+    # Receivers check the signature once the body is decompressed
+    assert (
+        requests["gzip"]["headers"]["X-Hercule-Auth-Key"]
+        == hmac.new(
+            gzip_webhook.auth_token.encode(), content, hashlib.sha256
+        ).hexdigest()
+    )
+
+
 @pytest.mark.asyncio
 async def test_trigger_event_error(
     db: AsyncSession, client_auth: TestClient, test_api_url: str
@@ -332,8 +472,149 @@ async def test_trigger_event_error(
     )
     webhook_usage = webhook_usage.scalar_one_or_none()
 
+    # A 5xx is retried later by the outbox dispatcher
     assert webhook_usage is not None
+    assert webhook_usage.status == "pending"
+    assert webhook_usage.attempts == 1
+    assert webhook_usage.next_attempt_at is not None
+    assert webhook_usage.last_error == 'HTTP 500: {"detail":"Test Error"}'
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_error_without_retries_left(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 1)
+
+    webhook = await webhook_faker.create_fake(
+        db,
+        WebhookFields(url=f"{test_api_url}/test_webhook_error"),
+    )
+
+    _ = await trigger_faker.create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    response = client_auth.post(
+        f"/api/v1/triggers/event",
+        json={"event": "page_opened", "context": {"url": "https://example.com"}},
+    )
+    assert response.status_code == 400
+
+    webhook_usage = await db.execute(
+        select(WebhookUsage).where(WebhookUsage.webhook_id == webhook.id)
+    )
+    webhook_usage = webhook_usage.scalar_one()
     assert webhook_usage.status == "error"
+    assert webhook_usage.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_circuit_breaker_fails_fast(
+    db: AsyncSession,
+    client_auth: TestClient,
+    client_admin: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_FAILURE_THRESHOLD", 1)
+
+    webhook = await webhook_faker.create_fake(
+        db,
+        WebhookFields(url=f"{test_api_url}/test_webhook_error"),
+    )
+
+    _ = await trigger_faker.create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    event = {"event": "page_opened", "context": {"url": "https://example.com"}}
+    response = client_auth.post(f"/api/v1/triggers/event", json=event)
+    assert response.status_code == 400
+
+    response = client_auth.post(f"/api/v1/triggers/event", json=event)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+    assert response.json()["detail"]["message"] == (
+        f"Circuit breaker open for {webhook.id}"
+    )
+
+    webhook_usages = await db.execute(
+        select(WebhookUsage)
+        .where(WebhookUsage.webhook_id == webhook.id)
+        .order_by(WebhookUsage.created_at)
+    )
+    deferred = webhook_usages.scalars().all()[-1]
+    # Failing fast does not use up one of the delivery's attempts
+    assert deferred.status == "pending"
+    assert deferred.attempts == 0
+    assert deferred.last_error == "Circuit breaker open"
+
+    response = client_admin.get("/api/v1/webhooks/circuit-breakers")
+    assert response.status_code == 200
+    [snapshot] = response.json()
+    assert snapshot["key"] == webhook.id
+    assert snapshot["state"] == "open"
+    assert snapshot["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_trial_call_reopens_circuit(
+    db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_FAILURE_THRESHOLD", 1)
+    webhook = await webhook_faker.create_fake(db)
+    webhook_ctrl = WebhookController(db)
+    usage = await webhook_ctrl.create_usage(webhook.id, "page_opened", payload={})
+    breaker = webhook_ctrl.get_circuit_breaker(await webhook_ctrl.read_safe(webhook.id))
+    assert breaker is not None
+    breaker.record_failure()
+    breaker._opened_at -= settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT  # type: ignore
+    assert breaker.state == "half_open"
+
+    async def post(*args: Any, **kwargs: Any) -> httpx.Response:
+        raise RuntimeError("Client is closed")
+
+    monkeypatch.setattr(http_client_manager, "post", post)
+    with pytest.raises(RuntimeError):
+        await webhook_ctrl.deliver(
+            await webhook_ctrl.read_safe(webhook.id), usage.id, "page_opened", {}
+        )
+
+    # The lost trial counts as a failure instead of keeping the circuit stuck
+    assert breaker.state == "open"
+    assert breaker.retry_after > 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_does_not_trip_circuit(
+    db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_FAILURE_THRESHOLD", 1)
+    webhook = await webhook_faker.create_fake(db)
+    webhook_ctrl = WebhookController(db)
+    usage = await webhook_ctrl.create_usage(webhook.id, "page_opened", payload={})
+    breaker = webhook_ctrl.get_circuit_breaker(await webhook_ctrl.read_safe(webhook.id))
+    assert breaker is not None
+
+    async def post(*args: Any, **kwargs: Any) -> httpx.Response:
+        await asyncio.sleep(10)
+        raise AssertionError("not cancelled")
+
+    monkeypatch.setattr(http_client_manager, "post", post)
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(
+            webhook_ctrl.deliver(
+                await webhook_ctrl.read_safe(webhook.id), usage.id, "page_opened", {}
+            ),
+            timeout=0.05,
+        )
+
+    # Slow, not down: the caller's own deadline is no failure
+    assert breaker.state == "closed"
 
 
 @pytest.mark.asyncio
@@ -361,3 +642,467 @@ async def test_trigger_event_show_console_action(
 
     assert data[0]["actions"][0]["type"] == "show_console"
     assert data[0]["actions"][0]["params"]["message"] == "Test Works"
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_index_follows_trigger_changes(
+    db: AsyncSession, client_admin: TestClient, test_api_url: str
+):
+    webhook = await webhook_faker.create_fake(
+        db,
+        WebhookFields(url=f"{test_api_url}/test_webhook"),
+    )
+
+    payload = {"url": "https://example.com/page"}
+
+    # First event loads the (empty) routing index
+    response = client_admin.post(
+        "/api/v1/triggers/event", json={"event": "page_opened", "context": payload}
+    )
+    assert response.status_code == 200
+    assert response.json() == []
+
+    response = client_admin.post(
+        "/api/v1/trigger",
+        json={
+            "name": "Example pages",
+            "event": "page_opened",
+            "url_regex": "https://example.com/.*",
+            "webhook_id": webhook.id,
+        },
+    )
+    assert response.status_code == 201
+    trigger_id = response.json()["id"]
+
+    response = client_admin.post(
+        "/api/v1/triggers/event", json={"event": "page_opened", "context": payload}
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+    response = client_admin.put(
+        f"/api/v1/trigger/{trigger_id}", json={"url_regex": "https://other.com/.*"}
+    )
+    assert response.status_code == 200
+
+    response = client_admin.post(
+        "/api/v1/triggers/event", json={"event": "page_opened", "context": payload}
+    )
+    assert response.status_code == 200
+    assert response.json() == []
+
+    response = client_admin.put(
+        f"/api/v1/trigger/{trigger_id}", json={"url_regex": ".*"}
+    )
+    assert response.status_code == 200
+    response = client_admin.delete(f"/api/v1/trigger/{trigger_id}")
+    assert response.status_code == 200
+
+    response = client_admin.post(
+        "/api/v1/triggers/event", json={"event": "page_opened", "context": payload}
+    )
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_trigger_index_sees_triggers_written_by_other_workers(
+    db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "TRIGGER_INDEX_REFRESH_INTERVAL", 0.05)
+    trigger_ctrl = TriggerController(db)
+    context: EventContext = {"url": "https://example.com/page"}
+    assert await trigger_ctrl.match("page_opened", context) == []
+
+    # Written straight to the database, as another worker would
+    trigger = await trigger_faker.create_fake(db, TriggerFields(event="page_opened"))
+    assert await trigger_ctrl.match("page_opened", context) == []
+
+    await asyncio.sleep(0.1)
+    matched = await trigger_ctrl.match("page_opened", context)
+    assert [t.id for t in matched] == [trigger.id]
+
+    # Edited within the same second: updated_at alone would not change
+    trigger_row = await db.get(Trigger, trigger.id)
+    assert trigger_row is not None
+    trigger_row.url_regex = "^https://other\\.example\\.com"
+    trigger_row.updated_at = trigger_row.updated_at
+    await db.commit()
+    await asyncio.sleep(0.1)
+    assert await trigger_ctrl.match("page_opened", context) == []
+
+    trigger_row.url_regex = None
+    trigger_row.updated_at = trigger_row.updated_at
+    await db.commit()
+    await asyncio.sleep(0.1)
+    assert len(await trigger_ctrl.match("page_opened", context)) == 1
+
+    await db.delete(trigger_row)
+    await db.commit()
+    await asyncio.sleep(0.1)
+    assert await trigger_ctrl.match("page_opened", context) == []
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_only_matches_own_user_triggers(
+    db: AsyncSession, client_auth: TestClient, test_api_url: str, test_user: User
+):
+    webhook = await webhook_faker.create_fake(
+        db,
+        WebhookFields(url=f"{test_api_url}/test_webhook"),
+    )
+
+    await trigger_faker.create_fake(
+        db,
+        TriggerFields(webhook_id=webhook.id, event="page_opened", user_id="someone"),
+    )
+    await trigger_faker.create_fake(
+        db,
+        TriggerFields(webhook_id=webhook.id, event="page_opened", user_id=test_user.id),
+    )
+    await trigger_faker.create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    response = client_auth.post(
+        "/api/v1/triggers/event",
+        json={"event": "page_opened", "context": {"url": "https://example.com"}},
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_concurrent_keeps_order_and_isolates_errors(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "WEBHOOK_DISPATCH_MODE", "concurrent")
+
+    webhook_paths = ["test_show_console_action", "test_webhook_error", "test_webhook"]
+    webhook_ids: list[str] = []
+    for path in webhook_paths:
+        webhook = await webhook_faker.create_fake(
+            db, WebhookFields(url=f"{test_api_url}/{path}")
+        )
+        webhook_ids.append(webhook.id)
+        await trigger_faker.create_fake(
+            db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+        )
+
+    response = client_auth.post(
+        "/api/v1/triggers/event",
+        json={"event": "page_opened", "context": {"url": "https://example.com"}},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 3
+    assert data[0]["actions"][0]["type"] == "show_console"
+    assert data[1]["status"] == "error"
+    assert data[1]["detail"]["status"] == 500
+    assert data[2]["status"] == "success"
+
+    webhook_usages = await db.execute(select(WebhookUsage))
+    statuses = {
+        usage.webhook_id: usage.status for usage in webhook_usages.scalars().all()
+    }
+    assert statuses == {
+        webhook_ids[0]: "success",
+        webhook_ids[1]: "pending",
+        webhook_ids[2]: "success",
+    }
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_concurrent_deadline(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "WEBHOOK_DISPATCH_MODE", "concurrent")
+    monkeypatch.setattr(settings, "WEBHOOK_DISPATCH_DEADLINE", 0.5)
+
+    for path in ["test_webhook", "test_webhook_slow"]:
+        webhook = await webhook_faker.create_fake(
+            db, WebhookFields(url=f"{test_api_url}/{path}")
+        )
+        await trigger_faker.create_fake(
+            db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+        )
+
+    response = client_auth.post(
+        "/api/v1/triggers/event",
+        json={"event": "page_opened", "context": {"url": "https://example.com"}},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data[0]["status"] == "success"
+    # Cut by the deadline: left for the outbox, as stored
+    assert data[1]["status"] == "pending"
+    result = await db.execute(
+        select(WebhookUsage.status).where(
+            WebhookUsage.id == data[1]["webhook_usage_id"]
+        )
+    )
+    assert result.scalar_one() == "pending"
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_async_mode_returns_pending_usages(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "WEBHOOK_DISPATCH_MODE", "async")
+
+    webhook = await webhook_faker.create_fake(
+        db, WebhookFields(url=f"{test_api_url}/test_webhook")
+    )
+    await trigger_faker.create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    response = client_auth.post(
+        "/api/v1/triggers/event",
+        json={"event": "page_opened", "context": {"url": "https://example.com"}},
+    )
+
+    assert response.status_code == 202
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["status"] == "pending"
+    webhook_usage_id = data[0]["webhook_usage_id"]
+
+    status = None
+    for _ in range(50):
+        result = await db.execute(
+            select(WebhookUsage.status).where(WebhookUsage.id == webhook_usage_id)
+        )
+        status = result.scalar_one()
+        if status != "pending":
+            break
+        await asyncio.sleep(0.1)
+
+    assert status == "success"
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_async_mode_queue_full(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "WEBHOOK_DISPATCH_MODE", "async")
+    monkeypatch.setattr(DeliveryQueue, "free_slots", property(lambda self: 0))
+
+    webhook = await webhook_faker.create_fake(
+        db, WebhookFields(url=f"{test_api_url}/test_webhook")
+    )
+    await trigger_faker.create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    response = client_auth.post(
+        "/api/v1/triggers/event",
+        json={"event": "page_opened", "context": {"url": "https://example.com"}},
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_trigger_event_async_mode_queue_fills_up_midway(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "WEBHOOK_DISPATCH_MODE", "async")
+    enqueue = DeliveryQueue.enqueue
+    enqueued: list[str] = []
+
+    def enqueue_once(self: DeliveryQueue, delivery: Any) -> None:
+        # Another request takes the last slot after the free slots check
+        if enqueued:
+            raise DeliveryQueueFull()
+        enqueued.append(delivery.webhook_usage_id)
+        enqueue(self, delivery)
+
+    monkeypatch.setattr(DeliveryQueue, "enqueue", enqueue_once)
+
+    for _ in range(2):
+        webhook = await webhook_faker.create_fake(
+            db, WebhookFields(url=f"{test_api_url}/test_webhook")
+        )
+        await trigger_faker.create_fake(
+            db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+        )
+
+    response = client_auth.post(
+        "/api/v1/triggers/event",
+        json={"event": "page_opened", "context": {"url": "https://example.com"}},
+    )
+
+    assert response.status_code == 202
+    data = response.json()
+    assert sorted(result["status"] for result in data) == ["error", "pending"]
+    assert [
+        result["webhook_usage_id"] for result in data if result["status"] == "pending"
+    ] == enqueued
+    statuses = await db.execute(select(WebhookUsage.status))
+    assert "error" in statuses.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_trigger_events_batch(
+    db: AsyncSession, client_auth: TestClient, test_api_url: str
+):
+    ok_webhook = await webhook_faker.create_fake(
+        db, WebhookFields(url=f"{test_api_url}/test_webhook")
+    )
+    error_webhook = await webhook_faker.create_fake(
+        db, WebhookFields(url=f"{test_api_url}/test_webhook_error")
+    )
+    await trigger_faker.create_fake(
+        db,
+        TriggerFields(
+            webhook_id=ok_webhook.id,
+            event="page_opened",
+            url_regex="https://example\\.com/.*",
+        ),
+    )
+    await trigger_faker.create_fake(
+        db,
+        TriggerFields(
+            webhook_id=error_webhook.id,
+            event="page_opened",
+            url_regex="https://example\\.com/error",
+        ),
+    )
+
+    response = client_auth.post(
+        "/api/v1/triggers/events",
+        json=[
+            {"event": "page_opened", "context": {"url": "https://example.com/a"}},
+            {"event": "page_opened", "context": {"url": "https://other.com"}},
+            {"event": "page_opened", "context": {"url": "https://example.com/error"}},
+            {"event": "button_clicked", "context": {"trigger_id": str(uuid4())}},
+        ],
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 4
+    assert [result["status"] for result in data[0]] == ["success"]
+    assert data[1] == []
+    assert sorted(str(result["status"]) for result in data[2]) == ["error", "success"]
+    assert data[3][0]["status"] == "error"
+    assert data[3][0]["detail"] == "Trigger not found"
+
+    webhook_usages = await db.execute(select(WebhookUsage))
+    statuses = sorted(
+        (usage.webhook_id == ok_webhook.id, usage.status)
+        for usage in webhook_usages.scalars().all()
+    )
+    assert statuses == [(False, "pending"), (True, "success"), (True, "success")]
+
+
+@pytest.mark.asyncio
+async def test_trigger_events_batch_async_mode(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "WEBHOOK_DISPATCH_MODE", "async")
+
+    webhook = await webhook_faker.create_fake(
+        db, WebhookFields(url=f"{test_api_url}/test_webhook")
+    )
+    await trigger_faker.create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    event = {"event": "page_opened", "context": {"url": "https://example.com"}}
+    response = client_auth.post("/api/v1/triggers/events", json=[event, event])
+
+    assert response.status_code == 202
+    data = response.json()
+    assert [result[0]["status"] for result in data] == ["pending", "pending"]
+    assert data[0][0]["webhook_usage_id"] != data[1][0]["webhook_usage_id"]
+
+
+@pytest.mark.asyncio
+async def test_trigger_events_batch_coalesces_batched_webhook(
+    db: AsyncSession,
+    client_auth: TestClient,
+    test_api_url: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    webhook = await webhook_faker.create_fake(
+        db,
+        WebhookFields(
+            url=f"{test_api_url}/test_webhook_batch",
+            batch_max_size=3,
+            batch_linger_ms=5000,
+        ),
+    )
+    await trigger_faker.create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    requests: list[dict[str, Any]] = []
+    post = http_client_manager.post
+
+    async def recording_post(url: str, **kwargs: Any) -> httpx.Response:
+        requests.append(kwargs)
+        return await post(url, **kwargs)
+
+    monkeypatch.setattr(http_client_manager, "post", recording_post)
+
+    event = {"event": "page_opened", "context": {"url": "https://example.com"}}
+    response = client_auth.post("/api/v1/triggers/events", json=[event] * 3)
+
+    assert response.status_code == 200
+    data = response.json()
+
+    # The three events reached the webhook as one signed JSON array
+    [request] = requests
+    body = json.loads(request["content"])
+    assert len(body) == 3
+    assert request["headers"]["X-Hercule-Batch-Size"] == "3"
+    assert (
+        request["headers"]["X-Hercule-Auth-Key"]
+        == hmac.new(
+            webhook.auth_token.encode(), request["content"], hashlib.sha256
+        ).hexdigest()
+    )
+
+    # Each event still gets its own usage and its own answer
+    usage_ids = [result[0]["webhook_usage_id"] for result in data]
+    assert usage_ids == [item["webhook_usage_id"] for item in body]
+    webhook_usages = await db.execute(
+        select(WebhookUsage).where(WebhookUsage.webhook_id == webhook.id)
+    )
+    assert sorted(
+        (usage.id, usage.status, usage.attempts)
+        for usage in webhook_usages.scalars().all()
+    ) == sorted((usage_id, "success", 1) for usage_id in usage_ids)
+
+
+def test_trigger_events_batch_too_large(client_auth: TestClient):
+    event = {"event": "page_opened", "context": {"url": "https://example.com"}}
+    response = client_auth.post(
+        "/api/v1/triggers/events",
+        json=[event] * (settings.EVENTS_BATCH_MAX_SIZE + 1),
+    )
+    assert response.status_code == 422
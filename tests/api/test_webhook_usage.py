@@ -0,0 +1,386 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from pytest import MonkeyPatch
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.controllers import trigger as trigger_module
+from src.app.controllers import webhook_usage as webhook_usage_module
+from src.app.controllers.trigger import TriggerController
+from src.app.controllers.webhook import deliver_queued, dispatch_outbox_batch
+from src.app.controllers.webhook_usage import (
+    WebhookUsageController,
+    renew_usage_leases,
+)
+from src.app.core.config import settings
+from src.app.core.delivery import DeliveryQueue, WebhookDelivery
+from src.app.core.http import http_client_manager
+from src.app.core.outbox import compute_backoff, lease_keeper, utc_now
+from src.app.core.usage_buffer import UsageAttempt
+from src.app.crud.webhook_usage import WebhookUsageCRUD
+from src.app.helpers.cache import webpush_subscription_cache
+from src.app.models import WebhookUsage, WebPushSubscription
+from src.app.schemas.webhook_usage import (
+    WebhookUsageCallbackPayload,
+    WebhookUsageCreate,
+)
+from tests.helpers.fakers.trigger import TriggerFaker, TriggerFields
+from tests.helpers.fakers.webhook import WebhookFaker, WebhookFields
+
+webhook_faker = WebhookFaker()
+
+SUBSCRIPTION = {
+    "endpoint": "https://push.example.com/1",
+    "keys": {"p256dh": "BGoQYQ", "auth": "MTIzNDU2"},
+}
+
+
+@pytest_asyncio.fixture  # type: ignore
+async def http_client():
+    http_client_manager.init(settings)
+    yield http_client_manager
+    await http_client_manager.close()
+
+
+async def create_pending_usage(
+    db: AsyncSession, webhook_id: str, attempts: int = 0, delay: float = -1
+) -> str:
+    webhook_usage = WebhookUsage(
+        webhook_id=webhook_id,
+        event="page_opened",
+        status="pending",
+        payload={"url": "https://example.com"},
+        attempts=attempts,
+        next_attempt_at=utc_now() + timedelta(seconds=delay),
+    )
+    db.add(webhook_usage)
+    await db.commit()
+    return webhook_usage.id
+
+
+async def get_usage(db: AsyncSession, webhook_usage_id: str) -> WebhookUsage:
+    result = await db.execute(
+        select(WebhookUsage)
+        .where(WebhookUsage.id == webhook_usage_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_outbox_dispatch_delivers_due_rows(
+    db: AsyncSession, test_api_url: str, http_client: None
+):
+    webhook = await webhook_faker.create_fake(
+        db, WebhookFields(url=f"{test_api_url}/test_webhook")
+    )
+    due_id = await create_pending_usage(db, webhook.id, attempts=2)
+    later_id = await create_pending_usage(db, webhook.id, delay=3600)
+
+    assert await dispatch_outbox_batch() == 1
+
+    due = await get_usage(db, due_id)
+    assert due.status == "success"
+    assert due.attempts == 3
+
+    later = await get_usage(db, later_id)
+    assert later.status == "pending"
+    assert later.attempts == 0
+
+
+@pytest.mark.asyncio
+async def test_outbox_dispatch_backs_off_then_gives_up(
+    db: AsyncSession,
+    test_api_url: str,
+    http_client: None,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 3)
+    webhook = await webhook_faker.create_fake(
+        db, WebhookFields(url=f"{test_api_url}/test_webhook_error")
+    )
+    webhook_usage_id = await create_pending_usage(db, webhook.id, attempts=1)
+
+    before = utc_now()
+    assert await dispatch_outbox_batch() == 1
+    webhook_usage = await get_usage(db, webhook_usage_id)
+    assert webhook_usage.status == "pending"
+    assert webhook_usage.attempts == 2
+    assert webhook_usage.next_attempt_at is not None
+    assert webhook_usage.next_attempt_at >= before + timedelta(
+        seconds=settings.OUTBOX_BACKOFF_BASE
+    )
+
+    # Not due yet: nothing to claim
+    assert await dispatch_outbox_batch() == 0
+
+    webhook_usage.next_attempt_at = utc_now() - timedelta(seconds=1)
+    await db.commit()
+
+    assert await dispatch_outbox_batch() == 1
+    webhook_usage = await get_usage(db, webhook_usage_id)
+    assert webhook_usage.status == "error"
+    assert webhook_usage.attempts == 3
+
+
+@pytest.mark.asyncio
+async def test_queued_deliveries_keep_their_lease(
+    db: AsyncSession,
+    test_api_url: str,
+    http_client: None,
+    monkeypatch: MonkeyPatch,
+):
+    monkeypatch.setattr(settings, "OUTBOX_LEASE_SECONDS", 0.2)
+    webhook = await webhook_faker.create_fake(
+        db, WebhookFields(url=f"{test_api_url}/test_webhook")
+    )
+    trigger = await TriggerFaker().create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+
+    # A backed up queue: nothing is sent until the test lets it
+    unblocked = asyncio.Event()
+
+    async def slow_delivery(delivery: WebhookDelivery) -> None:
+        await unblocked.wait()
+        await deliver_queued(delivery)
+
+    queue = DeliveryQueue()
+    queue.start(slow_delivery, workers=1, maxsize=10)
+    monkeypatch.setattr(trigger_module, "delivery_queue", queue)
+    lease_keeper.start(renew_usage_leases, interval=0.05)
+    try:
+        [queued] = await TriggerController(db).enqueue(
+            [trigger], "page_opened", {"url": "https://example.com"}
+        )
+        await asyncio.sleep(0.5)
+
+        # Long past the first lease, the outbox still cannot claim the row
+        assert await WebhookUsageController(db).claim_due() == []
+
+        unblocked.set()
+        await queue.drain(timeout=5)
+    finally:
+        await lease_keeper.stop()
+
+    usage = await get_usage(db, queued["webhook_usage_id"])  # type: ignore
+    assert usage.status == "success"
+    assert usage.attempts == 1
+    assert lease_keeper.held == []
+
+
+@pytest.mark.asyncio
+async def test_finished_usages_drop_their_payload(db: AsyncSession):
+    webhook = await webhook_faker.create_fake(db)
+    done, retried, failed, limited = [
+        await create_pending_usage(db, webhook.id) for _ in range(4)
+    ]
+    crud = WebhookUsageCRUD(db)
+
+    await crud.record_attempts(
+        [UsageAttempt(done, "success", 1), UsageAttempt(retried, "pending", 1)]
+    )
+    await crud.record_attempt(failed, "error", 1)
+    await crud.update_status(limited, "rate_limited")
+
+    cleared = await db.scalars(
+        select(WebhookUsage.id).where(WebhookUsage.payload.is_(None))
+    )
+    assert set(cleared) == {done, failed, limited}
+    retried_usage = await crud.read_safe(retried)
+    assert retried_usage.payload == {"url": "https://example.com"}
+
+    # Listings leave the payload unloaded
+    listed = {usage.id: usage for usage in (await crud.list()).items}
+    assert listed[retried].payload is None
+
+
+def test_compute_backoff_is_bounded_and_jittered():
+    delays = {compute_backoff(4, base=1, cap=5).total_seconds() for _ in range(50)}
+
+    assert all(1 <= delay <= 5 for delay in delays)
+    assert len(delays) > 1
+    assert compute_backoff(30, base=1, cap=5).total_seconds() <= 5
+
+
+def list_all_usages(client: TestClient, **params: Any) -> list[dict[str, Any]]:
+    usages: list[dict[str, Any]] = []
+    cursor = None
+    while True:
+        page_params = {**params, "limit": 2}
+        if cursor is not None:
+            page_params["cursor"] = cursor
+        response = client.get("/api/v1/webhook-usages", params=page_params)
+        assert response.status_code == 200
+        usages += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return usages
+
+
+@pytest.mark.asyncio
+async def test_list_webhook_usages(db: AsyncSession, client_admin: TestClient):
+    webhook = await webhook_faker.create_fake(db)
+    other_webhook = await webhook_faker.create_fake(db)
+    crud = WebhookUsageCRUD(db)
+    first = await crud.create(
+        WebhookUsageCreate(webhook_id=webhook.id, event="page_opened")
+    )
+    usages = await crud.create_many(
+        [
+            WebhookUsageCreate(webhook_id=webhook.id, event="page_opened"),
+            WebhookUsageCreate(webhook_id=webhook.id, event="button_clicked"),
+            WebhookUsageCreate(
+                webhook_id=other_webhook.id, event="page_opened", status="success"
+            ),
+        ]
+    )
+
+    listed = list_all_usages(client_admin)
+    assert len(listed) == 4
+    # Newest first
+    assert listed[-1]["id"] == first.id
+    assert [usage["created_at"] for usage in listed] == sorted(
+        (usage["created_at"] for usage in listed), reverse=True
+    )
+
+    by_webhook = list_all_usages(client_admin, webhook_id=webhook.id)
+    assert {usage["id"] for usage in by_webhook} == {
+        first.id,
+        usages[0].id,
+        usages[1].id,
+    }
+
+    by_status = list_all_usages(client_admin, status="success")
+    assert [usage["id"] for usage in by_status] == [usages[2].id]
+
+    by_event = list_all_usages(
+        client_admin, webhook_id=webhook.id, event="button_clicked"
+    )
+    assert [usage["id"] for usage in by_event] == [usages[1].id]
+
+    since_first = list_all_usages(
+        client_admin, created_after=usages[0].created_at.isoformat()
+    )
+    assert first.id not in {usage["id"] for usage in since_first}
+    assert len(since_first) == 3
+    assert (
+        list_all_usages(client_admin, created_before=first.created_at.isoformat()) == []
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_webhook_usages(db: AsyncSession, client_admin: TestClient):
+    webhook = await webhook_faker.create_fake(db)
+    crud = WebhookUsageCRUD(db)
+    usages = await crud.create_many(
+        [
+            WebhookUsageCreate(webhook_id=webhook.id, event="page_opened")
+            for _ in range(3)
+        ]
+        + [WebhookUsageCreate(webhook_id=webhook.id, event="button_clicked")]
+    )
+    streamed = [usage.id async for usage in crud.stream(event="page_opened")]
+    assert sorted(streamed) == sorted(usage.id for usage in usages[:3])
+
+    response = client_admin.get("/api/v1/webhook-usages/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(row["id"] for row in rows) == sorted(usage.id for usage in usages)
+    assert rows[0]["webhook_id"] == webhook.id
+    assert "webpush_subscription_id" not in rows[0]
+
+    response = client_admin.get(
+        "/api/v1/webhook-usages/export",
+        params={"format": "csv", "gzip": True, "event": "button_clicked"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert "webhook_usage.csv.gz" in response.headers["content-disposition"]
+    header, row = list(
+        csv.reader(io.StringIO(gzip.decompress(response.content).decode()))
+    )
+    assert header[:4] == ["id", "webhook_id", "event", "status"]
+    assert row[:4] == [usages[3].id, webhook.id, "button_clicked", "pending"]
+
+
+def test_export_webhook_usages_requires_admin(client_auth: TestClient):
+    response = client_auth.get("/api/v1/webhook-usages/export")
+    assert response.status_code == 403
+
+
+def test_list_webhook_usages_requires_admin(client_auth: TestClient):
+    response = client_auth.get("/api/v1/webhook-usages")
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_usages_share_webpush_subscriptions(db: AsyncSession):
+    ctrl = WebhookUsageController(db)
+    other = {**SUBSCRIPTION, "endpoint": "https://push.example.com/2"}
+
+    first, none, second, again, no_endpoint = await ctrl.resolve_subscriptions(
+        [SUBSCRIPTION, None, other, SUBSCRIPTION, {"keys": {}}]
+    )
+
+    assert first is not None and second is not None and first != second
+    assert again == first
+    assert none is None and no_endpoint is None
+    assert await ctrl.resolve_subscription(SUBSCRIPTION) == first
+    count = await db.scalar(select(func.count()).select_from(WebPushSubscription))
+    assert count == 2
+
+
+@pytest.mark.asyncio
+async def test_callback_caches_webpush_subscription(
+    db: AsyncSession, monkeypatch: MonkeyPatch
+):
+    sent: list[Any] = []
+
+    async def send_webpush(subscription: Any, payload: Any) -> bool:
+        sent.append(subscription)
+        return True
+
+    monkeypatch.setattr(webhook_usage_module, "send_webpush", send_webpush)
+    webhook = await webhook_faker.create_fake(db)
+    ctrl = WebhookUsageController(db)
+    usage = await ctrl.create(
+        WebhookUsageCreate(
+            webhook_id=webhook.id,
+            event="page_opened",
+            webpush_subscription_id=await ctrl.resolve_subscription(SUBSCRIPTION),
+        )
+    )
+    payload = WebhookUsageCallbackPayload(
+        action={"type": "show_alert", "params": {"message": "Hello"}}
+    )
+
+    assert await ctrl.callback(usage.id, payload)
+    assert await ctrl.callback(usage.id, payload)
+    assert sent[0] is sent[1]
+    assert str(sent[0].endpoint) == SUBSCRIPTION["endpoint"]
+    assert webpush_subscription_cache.stats()["hits"] == 1
+
+    # New keys for a known endpoint replace the stored and cached ones
+    renewed = {**SUBSCRIPTION, "keys": {"p256dh": "BGoQYg", "auth": "MTIzNDU3"}}
+    assert await ctrl.resolve_subscription(renewed) == usage.webpush_subscription_id
+    assert await ctrl.callback(usage.id, payload)
+    assert sent[2].keys.auth == "MTIzNDU3"
+
+    usage = await ctrl.create(
+        WebhookUsageCreate(webhook_id=webhook.id, event="page_opened")
+    )
+    with pytest.raises(HTTPException) as error:
+        await ctrl.callback(usage.id, payload)
+    assert error.value.status_code == 400
@@ -23,6 +23,10 @@ from src.app.core.config import Settings, settings
 from src.app.core.db.database import async_get_db, session_manager
 from src.app.core.security import create_access_token
 from src.app.core.setup import init_app
+from src.app.helpers.cache import user_cache, webpush_subscription_cache
+from src.app.helpers.circuit_breaker import circuit_breakers
+from src.app.helpers.rate_limit import rate_limiter
+from src.app.helpers.trigger_index import trigger_index
 from src.app.models.user import User
 
 from .helpers.seed import get_test_admin_user_fields, get_test_user_fields, seed_db
@@ -94,8 +98,8 @@ def client_admin(client: TestClient):
 
 @pytest_asyncio.fixture(scope="session", autouse=True)  # type: ignore
 async def connection_test():
-    host = settings.SQLITE_URI
-    session_manager.init(host)
+    host = settings.DATABASE_URI
+    session_manager.init(host, settings)
     yield
     await session_manager.close()
 
@@ -106,6 +110,12 @@ async def create_tables(db: AsyncSession):
         await session_manager.drop_all(connection)
         await session_manager.create_all(connection)
 
+    trigger_index.clear()
+    circuit_breakers.clear()
+    rate_limiter.clear()
+    user_cache.clear()
+    webpush_subscription_cache.clear()
+
     async with session_manager.session() as session:
         await seed_db(session)
 
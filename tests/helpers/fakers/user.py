@@ -5,7 +5,7 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app import models
-from src.app.core.security import get_password_hash
+from src.app.core.security import get_password_hash, password_hasher
 from src.app.models.user import UserRole
 
 from .base import BaseFaker
@@ -44,5 +44,10 @@ class UserFaker(BaseFaker[models.User]):
     async def create_fake(
         self, db: AsyncSession, fields: UserFields | None = None
     ) -> models.User:
+        fields = fields.model_copy() if fields is not None else UserFields()
+        if fields.hashed_password is None:
+            fields.hashed_password = await password_hasher.hash(
+                fields.password or self.fake.password(length=12)
+            )
         new_user = await self.create_fake_object(db, self.get_fake, fields)
         return new_user
@@ -18,6 +18,12 @@ class WebhookFields(BaseModel):
     name: str | None = None
     auth_token: str | None = None
     url: str | None = None
+    batch_max_size: int | None = None
+    batch_linger_ms: int | None = None
+    gzip_body: bool = False
+    html_by_reference: bool = False
+    rate_limit_per_second: float | None = None
+    rate_limit_burst: int | None = None
     created_at: datetime.datetime | None = None
     updated_at: datetime.datetime | None = None
 
@@ -32,6 +38,12 @@ class WebhookFaker(BaseFaker[models.Webhook]):
             name=fields.name or self.fake.name(),
             auth_token=fields.auth_token or cast(str, self.fake.uuid4()),
             url=fields.url or self.fake.url(),
+            batch_max_size=fields.batch_max_size,
+            batch_linger_ms=fields.batch_linger_ms or 100,
+            gzip_body=fields.gzip_body,
+            html_by_reference=fields.html_by_reference,
+            rate_limit_per_second=fields.rate_limit_per_second,
+            rate_limit_burst=fields.rate_limit_burst,
             created_at=fields.created_at or datetime.datetime.now(),
             updated_at=fields.updated_at or datetime.datetime.now(),
         )
@@ -1,11 +1,15 @@
 from fastapi import FastAPI
 
+from src.app.core.middleware import RequestBodyMiddleware
+
 from .router import router
 
 
 def create_test_api() -> FastAPI:
     # Define a new FastAPI app specifically for testing
     test_app = FastAPI()
+    # Accepts the gzip bodies sent to webhooks that opted in
+    test_app.add_middleware(RequestBodyMiddleware, max_body_size=10 * 1024 * 1024)
     test_app.include_router(router)
 
     return test_app
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Mapping
 
 from fastapi import APIRouter, HTTPException
@@ -15,9 +16,23 @@ async def test_webhook_error(payload: Mapping[str, Any]):
     raise HTTPException(status_code=500, detail="Test Error")
 
 
+@router.post("/test_webhook_slow")
+async def test_webhook_slow(payload: Mapping[str, Any]):
+    await asyncio.sleep(2)
+    return {"status": "success"}
+
+
 @router.post("/test_show_console_action")
 async def test_show_console_action(payload: Mapping[str, Any]):
     return {
         "status": "success",
         "actions": [{"type": "show_console", "params": {"message": "Test Works"}}],
     }
+
+
+@router.post("/test_webhook_batch")
+async def test_webhook_batch(payload: list[Mapping[str, Any]]):
+    return [
+        {"status": "success", "webhook_usage_id": event["webhook_usage_id"]}
+        for event in payload
+    ]
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from src.app.core.batcher import BatchedEvent, WebhookBatcher
+from src.app.schemas.webhook import Webhook as WebhookSchema
+
+
+def make_webhook(batch_max_size: int, batch_linger_ms: int) -> WebhookSchema:
+    return WebhookSchema(
+        id="webhook-0",
+        name="Batched",
+        url="https://example.com/hook",
+        auth_token="secret",
+        batch_max_size=batch_max_size,
+        batch_linger_ms=batch_linger_ms,
+    )
+
+
+def make_event(index: int) -> BatchedEvent:
+    return BatchedEvent(f"usage-{index}", "page_opened", {"index": index})
+
+
+@pytest.mark.asyncio
+async def test_webhook_batcher_flushes_full_batches():
+    sent: list[list[str]] = []
+
+    async def sender(webhook: WebhookSchema, events: list[BatchedEvent]):
+        sent.append([event.webhook_usage_id for event in events])
+        return [{"usage": event.webhook_usage_id} for event in events]
+
+    batcher = WebhookBatcher()
+    batcher.start(sender)
+    webhook = make_webhook(batch_max_size=2, batch_linger_ms=60_000)
+
+    results = await asyncio.gather(
+        *[batcher.submit(webhook, make_event(i)) for i in range(4)]
+    )
+    await batcher.stop()
+
+    assert sent == [["usage-0", "usage-1"], ["usage-2", "usage-3"]]
+    assert results == [{"usage": f"usage-{i}"} for i in range(4)]
+    assert not batcher.is_running
+
+
+@pytest.mark.asyncio
+async def test_webhook_batcher_flushes_after_linger():
+    sent: list[int] = []
+
+    async def sender(webhook: WebhookSchema, events: list[BatchedEvent]):
+        sent.append(len(events))
+        return [None] * len(events)
+
+    batcher = WebhookBatcher()
+    batcher.start(sender)
+    webhook = make_webhook(batch_max_size=10, batch_linger_ms=10)
+
+    await asyncio.wait_for(batcher.submit(webhook, make_event(0)), timeout=1)
+    await batcher.stop()
+
+    assert sent == [1]
+
+
+@pytest.mark.asyncio
+async def test_webhook_batcher_raises_per_event_errors():
+    async def sender(webhook: WebhookSchema, events: list[BatchedEvent]):
+        return [ValueError("rejected"), "ok"]
+
+    batcher = WebhookBatcher()
+    batcher.start(sender)
+    webhook = make_webhook(batch_max_size=2, batch_linger_ms=60_000)
+
+    results = await asyncio.gather(
+        batcher.submit(webhook, make_event(0)),
+        batcher.submit(webhook, make_event(1)),
+        return_exceptions=True,
+    )
+    await batcher.stop()
+
+    assert isinstance(results[0], ValueError)
+    assert results[1] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_webhook_batcher_stop_sends_buffered_events():
+    sent: list[int] = []
+
+    async def sender(webhook: WebhookSchema, events: list[BatchedEvent]):
+        sent.append(len(events))
+        return [None] * len(events)
+
+    batcher = WebhookBatcher()
+    batcher.start(sender)
+    webhook = make_webhook(batch_max_size=10, batch_linger_ms=60_000)
+
+    pending = asyncio.create_task(batcher.submit(webhook, make_event(0)))
+    await asyncio.sleep(0)
+    await batcher.stop()
+
+    await pending
+    assert sent == [1]
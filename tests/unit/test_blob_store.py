@@ -0,0 +1,100 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.app.core.blob_store import BlobStore
+from src.app.core.config import Settings
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> BlobStore:
+    settings = Settings()
+    settings.BLOB_STORE_DIR = str(tmp_path)
+    settings.BLOB_STORE_MAX_BYTES = 25
+    # Signed URLs expire at once, so every blob can be evicted
+    settings.BLOB_URL_TTL = 0
+    store = BlobStore()
+    store.init(settings)
+    return store
+
+
+@pytest.mark.asyncio
+async def test_blob_store_deduplicates_by_content(store: BlobStore):
+    digest = await store.put(b"<p>same page</p>")
+
+    assert await store.put(b"<p>same page</p>") == digest
+    assert store.size == len(b"<p>same page</p>")
+    path = store.path(digest)
+    assert path is not None and path.read_bytes() == b"<p>same page</p>"
+
+
+@pytest.mark.asyncio
+async def test_blob_store_evicts_least_recently_used(store: BlobStore):
+    first = await store.put(b"a" * 10)
+    second = await store.put(b"b" * 10)
+    await store.put(b"a" * 10)  # reused, so no longer the oldest
+    third = await store.put(b"c" * 10)
+
+    assert store.path(second) is None
+    assert store.path(first) is not None and store.path(third) is not None
+    assert store.size == 20
+
+
+@pytest.mark.asyncio
+async def test_blob_store_reloads_existing_blobs(store: BlobStore, tmp_path: Path):
+    digest = await store.put(b"<p>kept</p>")
+
+    settings = Settings()
+    settings.BLOB_STORE_DIR = str(tmp_path)
+    reloaded = BlobStore()
+    reloaded.init(settings)
+
+    assert reloaded.path(digest) is not None
+    assert reloaded.size == len(b"<p>kept</p>")
+    assert not [name for name in os.listdir(tmp_path / digest[:2]) if name != digest]
+
+
+@pytest.mark.asyncio
+async def test_blob_store_is_shared_between_workers(store: BlobStore, tmp_path: Path):
+    settings = Settings()
+    settings.BLOB_STORE_DIR = str(tmp_path)
+    settings.BLOB_STORE_MAX_BYTES = 25
+    settings.BLOB_URL_TTL = 0
+    first = await store.put(b"a" * 10)
+    other = BlobStore()
+    other.init(settings)
+
+    assert other.path(first) is not None
+    # The other worker counts the blobs it did not write
+    second = await other.put(b"b" * 10)
+    await other.put(b"c" * 10)
+    assert store.path(first) is None
+    assert store.path(second) is not None
+    assert other.size == 20
+
+
+@pytest.mark.asyncio
+async def test_blob_store_keeps_blobs_with_live_urls(tmp_path: Path):
+    settings = Settings()
+    settings.BLOB_STORE_DIR = str(tmp_path)
+    settings.BLOB_STORE_MAX_BYTES = 15
+    store = BlobStore()
+    store.init(settings)
+
+    digests = [await store.put(data) for data in (b"a" * 10, b"b" * 10)]
+
+    assert all(store.path(digest) is not None for digest in digests)
+    assert store.size == 20
+
+
+def test_blob_store_signed_urls(store: BlobStore):
+    digest = "0" * 64
+    url = store.signed_url(digest, now=1000)
+    query = dict(part.split("=") for part in url.split("?")[1].split("&"))
+    expires = int(query["expires"])
+
+    assert store.verify(digest, expires, query["signature"], now=1000)
+    assert not store.verify(digest, expires, query["signature"], now=expires + 1)
+    assert not store.verify("1" * 64, expires, query["signature"], now=1000)
+    assert not store.verify(digest, expires + 1, query["signature"], now=1000)
@@ -0,0 +1,57 @@
+from src.app.helpers.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 59
+    assert cache.get("a") == 1
+    clock.now = 60
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_respects_absolute_expiry():
+    clock, wall_clock = FakeClock(), FakeClock(1_000)
+    cache: TTLCache[str, int] = TTLCache(
+        maxsize=10, ttl=60, clock=clock, wall_clock=wall_clock
+    )
+    cache.set("token", 1, expires_at=1_010)
+    cache.set("expired", 2, expires_at=999)
+
+    assert cache.get("expired") is None
+    clock.now = 10
+    assert cache.get("token") is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_invalidate():
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 1)
+    cache.set("c", 2)
+
+    assert cache.invalidate(lambda value: value == 1) == 2
+    assert len(cache) == 1
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from src.app.helpers import canonical_json
+
+BODY = {
+    "webhook_usage_id": "usage-0",
+    "event": "page_opened",
+    "context": {"url": "https://example.com", "html_content": "<p>Déjà vu</p>"},
+    "attempts": [1, 2.5, None, True],
+}
+
+
+def test_dumps_is_compact_sorted_utf8():
+    content = canonical_json.dumps(BODY)
+
+    assert content.startswith(b'{"attempts":[1,2.5,null,true],"context":{')
+    assert "Déjà vu".encode() in content
+    assert json.loads(content) == BODY
+
+
+def test_dumps_gives_the_same_bytes_without_orjson(monkeypatch: pytest.MonkeyPatch):
+    if canonical_json.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    fast = canonical_json.dumps(BODY)
+    monkeypatch.setattr(canonical_json, "orjson", None)
+
+    assert canonical_json.dumps(BODY) == fast
+
+
+def test_join_object_matches_dumps():
+    context_json = canonical_json.dumps(BODY["context"])
+
+    content = canonical_json.join_object(
+        {
+            "webhook_usage_id": canonical_json.dumps(BODY["webhook_usage_id"]),
+            "event": canonical_json.dumps(BODY["event"]),
+            "context": context_json,
+            "attempts": canonical_json.dumps(BODY["attempts"]),
+        }
+    )
+
+    assert content == canonical_json.dumps(BODY)
+    assert canonical_json.join_array([content, content]) == canonical_json.dumps(
+        [BODY, BODY]
+    )
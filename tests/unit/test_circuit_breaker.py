@@ -0,0 +1,108 @@
+from src.app.helpers.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_circuit_breaker_opens_after_threshold():
+    clock = FakeClock()
+    breaker = CircuitBreaker("webhook", 3, 30, clock=clock)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_after == 30
+
+    clock.now = 10
+    assert breaker.retry_after == 20
+
+
+def test_circuit_breaker_success_resets_failures():
+    breaker = CircuitBreaker("webhook", 2, 30, clock=FakeClock())
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["failures"] == 1
+
+
+def test_circuit_breaker_half_open_allows_one_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker("webhook", 1, 30, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_circuit_breaker_lost_trial_expires():
+    clock = FakeClock()
+    breaker = CircuitBreaker("webhook", 1, 30, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 30
+    assert breaker.allow()
+    # The trial never reports back, e.g. it was cancelled
+    clock.now = 59
+    assert not breaker.allow()
+    clock.now = 60
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_circuit_breaker_released_trial_lets_another_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker("webhook", 1, 30, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 30
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.release_trial()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def test_circuit_breaker_half_open_failure_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker("webhook", 5, 30, clock=clock)
+    for _ in range(5):
+        breaker.record_failure()
+
+    clock.now = 31
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert breaker.retry_after == 30
+    assert not breaker.allow()
+
+
+def test_circuit_breaker_registry_reuses_breakers():
+    registry = CircuitBreakerRegistry()
+    breaker = registry.get("a", failure_threshold=1, recovery_timeout=10)
+    breaker.record_failure()
+
+    assert registry.get("a", failure_threshold=1, recovery_timeout=10) is breaker
+    assert [snapshot["state"] for snapshot in registry.snapshots()] == ["open"]
+
+    registry.clear()
+    assert registry.snapshots() == []
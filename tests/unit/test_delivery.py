@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from src.app.core.delivery import DeliveryQueue, DeliveryQueueFull, WebhookDelivery
+
+
+def make_delivery(i: int) -> WebhookDelivery:
+    return WebhookDelivery(
+        webhook_usage_id=f"usage-{i}",
+        webhook_id="webhook",
+        event="page_opened",
+        context={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_delivery_queue_backpressure_and_drain():
+    delivered: list[str] = []
+    release = asyncio.Event()
+
+    async def handler(delivery: WebhookDelivery):
+        await release.wait()
+        delivered.append(delivery.webhook_usage_id)
+
+    queue = DeliveryQueue()
+    queue.start(handler, workers=1, maxsize=2)
+
+    queue.enqueue(make_delivery(0))
+    await asyncio.sleep(0)  # the worker picks up the first delivery
+
+    queue.enqueue(make_delivery(1))
+    queue.enqueue(make_delivery(2))
+    with pytest.raises(DeliveryQueueFull):
+        queue.enqueue(make_delivery(3))
+    assert queue.free_slots == 0
+
+    release.set()
+    await queue.drain(timeout=1)
+
+    assert delivered == ["usage-0", "usage-1", "usage-2"]
+    assert not queue.is_running
+    with pytest.raises(Exception):
+        queue.enqueue(make_delivery(4))
+
+
+@pytest.mark.asyncio
+async def test_delivery_queue_survives_handler_errors():
+    delivered: list[str] = []
+
+    async def handler(delivery: WebhookDelivery):
+        if delivery.webhook_usage_id == "usage-0":
+            raise RuntimeError("boom")
+        delivered.append(delivery.webhook_usage_id)
+
+    queue = DeliveryQueue()
+    queue.start(handler, workers=1, maxsize=10)
+    queue.enqueue(make_delivery(0))
+    queue.enqueue(make_delivery(1))
+    await queue.drain(timeout=1)
+
+    assert delivered == ["usage-1"]
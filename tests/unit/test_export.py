@@ -0,0 +1,66 @@
+import csv
+import gzip
+import io
+import json
+from typing import AsyncIterator
+
+import pytest
+from pydantic import BaseModel
+
+from src.app.helpers.export import ExportFormat, encode_rows, export_filename
+
+
+class Row(BaseModel):
+    id: int
+    name: str
+    note: str | None = None
+
+
+async def rows(count: int) -> AsyncIterator[Row]:
+    for i in range(count):
+        yield Row(id=i, name=f'row, "{i}"\n', note=None if i % 2 else "é")
+
+
+async def encode(format: ExportFormat, compress: bool, count: int = 50) -> bytes:
+    chunks = [
+        chunk
+        async for chunk in encode_rows(
+            rows(count), ("name", "id"), format, compress, chunk_size=100
+        )
+    ]
+    assert len(chunks) > 1
+    data = b"".join(chunks)
+    return gzip.decompress(data) if compress else data
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compress", [False, True])
+async def test_encode_ndjson(compress: bool):
+    lines = (await encode("ndjson", compress)).decode().splitlines()
+
+    assert len(lines) == 50
+    assert json.loads(lines[0]) == {"id": 0, "name": 'row, "0"\n'}
+    assert json.loads(lines[1]) == {"id": 1, "name": 'row, "1"\n'}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compress", [False, True])
+async def test_encode_csv(compress: bool):
+    reader = csv.reader(io.StringIO((await encode("csv", compress)).decode()))
+
+    assert next(reader) == ["name", "id"]
+    records = list(reader)
+    assert len(records) == 50
+    assert records[3] == ['row, "3"\n', "3"]
+
+
+@pytest.mark.asyncio
+async def test_encode_empty():
+    assert [c async for c in encode_rows(rows(0), ("id",), "ndjson")] == []
+    [data] = [c async for c in encode_rows(rows(0), ("id",), "csv", compress=True)]
+    assert gzip.decompress(data) == b"id\r\n"
+
+
+def test_export_filename():
+    assert export_filename("usage", "csv", False) == "usage.csv"
+    assert export_filename("usage", "ndjson", True) == "usage.ndjson.gz"
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from src.app.core.config import Settings
+from src.app.core.http import HttpClientManager
+
+
+@pytest.mark.asyncio
+async def test_http_client_manager_limits_connections_per_host():
+    settings = Settings(HTTP_MAX_CONNECTIONS_PER_HOST=1)
+    manager = HttpClientManager()
+    manager.init(settings)
+
+    active: dict[str, int] = {"example.com": 0, "other.com": 0}
+    peaks: dict[str, int] = {"example.com": 0, "other.com": 0}
+
+    async def use(url: str, host: str):
+        async with manager.host_slot(url):
+            active[host] += 1
+            peaks[host] = max(peaks[host], active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+    await asyncio.gather(
+        *[use(f"https://example.com/{i}", "example.com") for i in range(3)],
+        *[use(f"https://other.com/{i}", "other.com") for i in range(3)],
+    )
+
+    assert peaks == {"example.com": 1, "other.com": 1}
+    # Idle hosts do not keep their semaphore
+    assert manager._host_semaphores == {}
+    assert manager.client.is_closed is False
+
+    await manager.close()
+    with pytest.raises(Exception):
+        manager.client
@@ -0,0 +1,116 @@
+import gzip
+import sys
+import zlib
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pytest import MonkeyPatch
+
+from src.app.core.middleware import RequestBodyMiddleware
+
+MAX_BODY_SIZE = 1024
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RequestBodyMiddleware, max_body_size=MAX_BODY_SIZE)
+
+    @app.post("/echo")
+    async def echo(payload: dict[str, Any]):
+        return payload
+
+    return TestClient(app)
+
+
+def test_plain_body_passes_through(client: TestClient):
+    response = client.post("/echo", json={"html_content": "<p>hello</p>"})
+    assert response.status_code == 200
+    assert response.json() == {"html_content": "<p>hello</p>"}
+
+
+@pytest.mark.parametrize(
+    "encoding,compress",
+    [("gzip", gzip.compress), ("deflate", zlib.compress)],
+)
+def test_compressed_body_is_decoded(client: TestClient, encoding: str, compress: Any):
+    response = client.post(
+        "/echo",
+        content=compress(b'{"html_content": "<p>hello</p>"}'),
+        headers={"Content-Type": "application/json", "Content-Encoding": encoding},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"html_content": "<p>hello</p>"}
+
+
+def test_body_over_the_cap_is_rejected(client: TestClient):
+    response = client.post("/echo", json={"html_content": "x" * MAX_BODY_SIZE})
+    assert response.status_code == 413
+
+
+def test_decompressed_size_is_capped(client: TestClient):
+    body = b'{"html_content": "' + b"x" * 100 * MAX_BODY_SIZE + b'"}'
+    compressed = gzip.compress(body)
+    assert len(compressed) < MAX_BODY_SIZE
+
+    response = client.post(
+        "/echo",
+        content=compressed,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert response.status_code == 413
+
+
+def test_invalid_or_unknown_encoding_is_rejected(client: TestClient):
+    headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    response = client.post("/echo", content=b"not gzip", headers=headers)
+    assert response.status_code == 400
+
+    headers["Content-Encoding"] = "zstd"
+    response = client.post("/echo", content=b"{}", headers=headers)
+    assert response.status_code == 415
+
+
+def test_brotli_decompressed_size_is_capped(client: TestClient):
+    brotli = pytest.importorskip("brotli")
+    if not hasattr(brotli.Decompressor(), "can_accept_more_data"):
+        pytest.skip("brotli cannot bound its output")
+    headers = {"Content-Type": "application/json", "Content-Encoding": "br"}
+
+    response = client.post(
+        "/echo",
+        content=brotli.compress(b'{"html_content": "<p>hello</p>"}'),
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    body = b'{"html_content": "' + b"x" * 100 * MAX_BODY_SIZE + b'"}'
+    response = client.post("/echo", content=brotli.compress(body), headers=headers)
+    assert response.status_code == 413
+
+
+def test_brotli_without_output_limit_is_not_accepted(monkeypatch: MonkeyPatch):
+    class Decompressor:
+        def process(self, chunk: bytes) -> bytes:
+            return chunk
+
+    for name in ("brotli", "brotlicffi"):
+        monkeypatch.setitem(
+            sys.modules, name, SimpleNamespace(Decompressor=Decompressor)
+        )
+    app = FastAPI()
+    app.add_middleware(RequestBodyMiddleware, max_body_size=MAX_BODY_SIZE)
+
+    @app.post("/echo")
+    async def echo(payload: dict[str, Any]):
+        return payload
+
+    response = TestClient(app).post(
+        "/echo",
+        content=b"{}",
+        headers={"Content-Type": "application/json", "Content-Encoding": "br"},
+    )
+    assert response.status_code == 415
@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect, select, text
+
+from src.app.core.config import settings
+from src.app.core.db.database import DatabaseSessionManager
+from src.app.core.db.migrations import add_missing_columns, move_webpush_subscriptions
+from src.app.models import WebhookUsage, WebPushSubscription
+from tests.helpers.fakers.webhook import WebhookFaker
+
+
+@pytest.mark.asyncio
+async def test_migrate_adds_missing_indexes(tmp_path: Path):
+    manager = DatabaseSessionManager()
+    manager.init(f"sqlite+aiosqlite:///{tmp_path}/old.db", settings)
+    try:
+        async with manager.connect() as connection:
+            await manager.create_all(connection)
+            await connection.execute(text("DROP INDEX ix_triggers_event_user_id"))
+
+        async with manager.connect() as connection:
+            added = await manager.migrate(connection)
+            indexes = await connection.run_sync(
+                lambda sync: {i["name"] for i in inspect(sync).get_indexes("triggers")}
+            )
+
+        assert added == ["triggers.ix_triggers_event_user_id"]
+        assert "ix_triggers_event_user_id" in indexes
+
+        async with manager.connect() as connection:
+            assert await manager.migrate(connection) == []
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_migrate_moves_webpush_subscriptions(tmp_path: Path):
+    manager = DatabaseSessionManager()
+    manager.init(f"sqlite+aiosqlite:///{tmp_path}/old.db", settings)
+    subscription = {"endpoint": "https://push.example.com/1", "keys": {}}
+    legacy_data = [
+        subscription,
+        {"endpoint": "https://push.example.com/2", "keys": {}},
+        subscription,
+        {"keys": {}},
+        None,
+    ]
+    try:
+        async with manager.connect() as connection:
+            await manager.create_all(connection)
+            await connection.execute(
+                text("ALTER TABLE webhook_usage ADD COLUMN webpush_subscription_data")
+            )
+
+        async with manager.session() as session:
+            webhook = await WebhookFaker().create_fake(session)
+            usages = [
+                WebhookUsage(
+                    webhook_id=webhook.id, event="page_opened", status="success"
+                )
+                for _ in legacy_data
+            ]
+            session.add_all(usages)
+            await session.commit()
+            for usage, data in zip(usages, legacy_data):
+                await session.execute(
+                    text(
+                        "UPDATE webhook_usage SET webpush_subscription_data = :data "
+                        "WHERE id = :id"
+                    ),
+                    {"data": json.dumps(data) if data else None, "id": usage.id},
+                )
+            await session.commit()
+
+        async with manager.connect() as connection:
+            await connection.run_sync(add_missing_columns)
+            changes = await connection.run_sync(move_webpush_subscriptions, 2)
+            columns = await connection.run_sync(
+                lambda sync: {
+                    c["name"] for c in inspect(sync).get_columns("webhook_usage")
+                }
+            )
+
+        assert changes == ["webhook_usage.webpush_subscription_data"]
+        assert "webpush_subscription_data" not in columns
+
+        async with manager.session() as session:
+            stored = {
+                subscription.id: subscription.data
+                for subscription in await session.scalars(select(WebPushSubscription))
+            }
+            links = [
+                await session.scalar(
+                    select(WebhookUsage.webpush_subscription_id).where(
+                        WebhookUsage.id == usage.id
+                    )
+                )
+                for usage in usages
+            ]
+
+        assert len(stored) == 2
+        assert links[0] == links[2] and stored[links[0]] == subscription
+        assert stored[links[1]] == legacy_data[1]
+        assert links[3:] == [None, None]
+
+        async with manager.connect() as connection:
+            assert await manager.migrate(connection) == []
+    finally:
+        await manager.close()
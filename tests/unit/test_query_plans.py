@@ -0,0 +1,146 @@
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.db.database import session_manager
+from src.app.core.usage_buffer import UsageAttempt
+from src.app.crud.rate_limit import RateLimitCRUD
+from src.app.crud.trigger import TriggerCRUD
+from src.app.crud.user import UserCRUD
+from src.app.crud.webhook import WebhookCRUD
+from src.app.crud.webhook_usage import WebhookUsageCRUD
+from src.app.crud.webpush_subscription import WebPushSubscriptionCRUD
+from src.app.schemas.webhook_usage import WebhookUsageCreate
+from tests.helpers.fakers.trigger import TriggerFaker, TriggerFields
+from tests.helpers.fakers.webhook import WebhookFaker
+
+Statement = tuple[str, Any]
+
+
+@pytest_asyncio.fixture  # type: ignore
+async def statements() -> AsyncIterator[list[Statement]]:
+    """Statements sent to SQLite while the fixture is active."""
+    engine = session_manager._engine  # type: ignore
+    assert engine is not None
+    if engine.dialect.name != "sqlite":
+        pytest.skip("Query plans are checked on SQLite")
+
+    recorded: list[Statement] = []
+
+    def record(conn: Any, cursor: Any, statement: str, parameters: Any, *_: Any):
+        recorded.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def full_scans(db: AsyncSession, statements: list[Statement]) -> list[str]:
+    scans: list[str] = []
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            continue
+        if isinstance(parameters, list):  # executemany
+            parameters = parameters[0]
+
+        connection = await db.connection()
+        plan = await connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+        for row in plan:
+            detail: str = row[-1]
+            if detail.startswith("SCAN") and detail != "SCAN CONSTANT ROW":
+                scans.append(f"{detail}: {statement}")
+    return scans
+
+
+@pytest.mark.asyncio
+async def test_crud_hot_queries_use_indexes(
+    db: AsyncSession, statements: list[Statement]
+):
+    webhook = await WebhookFaker().create_fake(db)
+    trigger = await TriggerFaker().create_fake(
+        db, TriggerFields(webhook_id=webhook.id, event="page_opened")
+    )
+    statements.clear()
+
+    trigger_crud = TriggerCRUD(db)
+    await trigger_crud.read(trigger.id)
+    await trigger_crud.list(event="page_opened")
+
+    webhook_crud = WebhookCRUD(db)
+    await webhook_crud.read(webhook.id)
+    await webhook_crud.read_many([webhook.id])
+
+    user_crud = UserCRUD(db)
+    await user_crud.get_by_email("user@test.com")
+
+    usage_crud = WebhookUsageCRUD(db)
+    usage = await usage_crud.create(
+        WebhookUsageCreate(webhook_id=webhook.id, event="page_opened")
+    )
+    await usage_crud.read(usage.id)
+    await usage_crud.list(webhook_id=webhook.id)
+    await usage_crud.update_status(usage.id, "pending")
+    await usage_crud.record_attempt(usage.id, "pending", 1, datetime(2000, 1, 1))
+    await usage_crud.record_attempts([UsageAttempt(usage.id, "pending", 1)])
+    await usage_crud.claim_due(datetime.now(), datetime.now(), limit=10)
+    await usage_crud.expired("success", datetime.now(), datetime.now(), limit=10)
+    await usage_crud.delete_many([usage.id])
+
+    subscription_crud = WebPushSubscriptionCRUD(db)
+    subscription = {"endpoint": "https://push.example.com/1", "keys": {}}
+    [subscription_id] = await subscription_crud.get_or_create_many([subscription])
+    await subscription_crud.get_or_create_many([{**subscription, "keys": {"a": 1}}])
+    await subscription_crud.read_data(subscription_id)
+
+    await RateLimitCRUD(db).take("user:1", 1, 10, 1, time.time())
+
+    assert statements
+    assert await full_scans(db, statements) == []
+
+
+@pytest.mark.asyncio
+async def test_list_pages_use_indexes(db: AsyncSession, statements: list[Statement]):
+    webhook = await WebhookFaker().create_fake(db)
+    await TriggerFaker().create_fake(db, TriggerFields(webhook_id=webhook.id))
+    await TriggerFaker().create_fake(db, TriggerFields(webhook_id=webhook.id))
+    usage_crud = WebhookUsageCRUD(db)
+    await usage_crud.create_many(
+        [WebhookUsageCreate(webhook_id=webhook.id, event="page_opened")] * 2
+    )
+    cursor = (await TriggerCRUD(db).list(limit=1)).next_cursor
+    usage_cursor = (await usage_crud.list(limit=1)).next_cursor
+    assert cursor is not None and usage_cursor is not None
+    statements.clear()
+
+    # Without a cursor, unfiltered pages read the (created_at, id) index from
+    # its start, which full_scans reports although the read stops at the limit
+    await TriggerCRUD(db).list(cursor, event="page_opened")
+    await TriggerCRUD(db).list(cursor)
+    await WebhookCRUD(db).list(cursor)
+    await UserCRUD(db).list(cursor)
+
+    since = datetime(2000, 1, 1)
+    await usage_crud.list(usage_cursor)
+    await usage_crud.list(webhook_id=webhook.id)
+    await usage_crud.list(usage_cursor, webhook_id=webhook.id, created_after=since)
+    await usage_crud.list(status="pending")
+    await usage_crud.list(usage_cursor, status="pending", created_before=since)
+    await usage_crud.list(event="page_opened")
+    await usage_crud.list(created_after=since)
+
+    assert await full_scans(db, statements) == []
+
+
+@pytest.mark.asyncio
+async def test_full_scan_detection(db: AsyncSession, statements: list[Statement]):
+    await db.execute(text("SELECT * FROM webhook_usage WHERE last_error = 'x'"))
+
+    [scan] = await full_scans(db, statements)
+    assert scan.startswith("SCAN webhook_usage")
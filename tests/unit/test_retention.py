@@ -0,0 +1,116 @@
+import gzip
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from pytest import MonkeyPatch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.controllers.webhook_usage import purge_expired_usages
+from src.app.core.config import settings
+from src.app.core.retention import retention_cutoffs, usage_archive
+from src.app.crud.webpush_subscription import WebPushSubscriptionCRUD
+from src.app.models import WebhookUsage
+from src.app.models.webhook_usage import WebhookUsageStatus
+from tests.helpers.fakers.webhook import WebhookFaker
+
+NOW = datetime(2026, 6, 15, 12, tzinfo=UTC)
+SUBSCRIPTION = {"endpoint": "https://push.example.com/1", "keys": {}}
+
+
+@pytest.fixture
+def archive_dir(tmp_path: Path, monkeypatch: MonkeyPatch) -> Iterator[Path]:
+    monkeypatch.setattr(settings, "RETENTION_ARCHIVE_ENABLED", True)
+    monkeypatch.setattr(settings, "RETENTION_ARCHIVE_DIR", str(tmp_path))
+    usage_archive.init(settings)
+    yield tmp_path
+    monkeypatch.setattr(settings, "RETENTION_ARCHIVE_ENABLED", False)
+    usage_archive.init(settings)
+
+
+def test_retention_cutoffs(monkeypatch: MonkeyPatch):
+    monkeypatch.setattr(settings, "RETENTION_SUCCESS_DAYS", 7)
+    monkeypatch.setattr(settings, "RETENTION_ERROR_DAYS", 0)
+
+    cutoffs = retention_cutoffs(settings, NOW)
+
+    assert cutoffs["success"] == NOW - timedelta(days=7)
+    assert "error" not in cutoffs
+    assert "pending" not in cutoffs
+
+
+@pytest.mark.asyncio
+async def test_purge_expired_usages(
+    db: AsyncSession, archive_dir: Path, monkeypatch: MonkeyPatch
+):
+    monkeypatch.setattr(settings, "RETENTION_SUCCESS_DAYS", 10)
+    monkeypatch.setattr(settings, "RETENTION_ERROR_DAYS", 0)
+    monkeypatch.setattr(settings, "RETENTION_CALLBACK_DAYS", 30)
+    monkeypatch.setattr(settings, "RETENTION_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "RETENTION_BATCH_PAUSE", 0)
+    webhook = await WebhookFaker().create_fake(db)
+    [subscription_id] = await WebPushSubscriptionCRUD(db).get_or_create_many(
+        [SUBSCRIPTION]
+    )
+
+    def usage(
+        status: WebhookUsageStatus, days: float, subscription: bool = False
+    ) -> WebhookUsage:
+        created_at = NOW - timedelta(days=days)
+        return WebhookUsage(
+            webhook_id=webhook.id,
+            event="page_opened",
+            status=status,
+            webpush_subscription_id=subscription_id if subscription else None,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+    expired = [usage("success", 11), usage("success", 12), usage("success", 40)]
+    expired.append(usage("success", 31, subscription=True))
+    kept = [
+        usage("success", 9),
+        usage("success", 20, subscription=True),
+        usage("error", 400),
+        usage("pending", 400),
+    ]
+    db.add_all(expired + kept)
+    await db.commit()
+    expired_ids = {usage.id for usage in expired}
+
+    assert await purge_expired_usages(NOW) == 4
+
+    result = await db.execute(select(WebhookUsage.id))
+    assert set(result.scalars().all()) == {usage.id for usage in kept}
+
+    archives = sorted(archive_dir.glob("webhook_usage/*/*/*.ndjson.gz"))
+    assert [path.name for path in archives] == [
+        "2026-05-06.ndjson.gz",
+        "2026-05-15.ndjson.gz",
+        "2026-06-03.ndjson.gz",
+        "2026-06-04.ndjson.gz",
+    ]
+    archived = [
+        json.loads(line)
+        for path in archives
+        for line in gzip.decompress(path.read_bytes()).splitlines()
+    ]
+    assert {row["id"] for row in archived} == expired_ids
+    assert all(row["status"] == "success" for row in archived)
+    assert "webpush_subscription_id" not in archived[0]
+
+    assert await purge_expired_usages(NOW) == 0
+
+
+def test_usage_archive_appends_gzip_members(archive_dir: Path):
+    path = usage_archive.path(NOW)
+    assert path == archive_dir / "webhook_usage/2026/06/2026-06-15.ndjson.gz"
+
+    usage_archive._append({path: [b'{"batch":1}\n']})
+    usage_archive._append({path: [b'{"batch":2}\n']})
+
+    with gzip.open(path) as archive_file:
+        assert archive_file.read() == b'{"batch":1}\n{"batch":2}\n'
@@ -0,0 +1,14 @@
+import pytest
+
+from src.app.core.security import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_round_trip():
+    hasher = PasswordHasher()
+    try:
+        hashed_password = await hasher.hash("password")
+        assert await hasher.verify("password", hashed_password)
+        assert not await hasher.verify("invalid", hashed_password)
+    finally:
+        hasher.shutdown()
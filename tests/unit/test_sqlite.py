@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from src.app.core.config import settings
+from src.app.core.db.database import DatabaseSessionManager
+from src.app.core.db.sqlite import incremental_vacuum
+
+
+async def read_pragma(manager: DatabaseSessionManager, name: str):
+    async with manager.connect() as connection:
+        return (await connection.execute(text(f"PRAGMA {name}"))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_profile_applies_pragmas(tmp_path: Path):
+    manager = DatabaseSessionManager()
+    manager.init(f"sqlite+aiosqlite:///{tmp_path}/tuned.db", settings)
+    try:
+        assert await read_pragma(manager, "journal_mode") == "wal"
+        assert await read_pragma(manager, "synchronous") == 1  # NORMAL
+        assert await read_pragma(manager, "busy_timeout") == 5000
+        assert await read_pragma(manager, "cache_size") == -65536
+        assert await read_pragma(manager, "temp_store") == 2  # MEMORY
+        assert await read_pragma(manager, "auto_vacuum") == 2  # INCREMENTAL
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_profile_can_be_disabled(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "SQLITE_TUNING_ENABLED", False)
+    manager = DatabaseSessionManager()
+    manager.init(f"sqlite+aiosqlite:///{tmp_path}/default.db", settings)
+    try:
+        assert await read_pragma(manager, "journal_mode") == "delete"
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_profile_in_memory():
+    manager = DatabaseSessionManager()
+    manager.init("sqlite+aiosqlite:///:memory:", settings)
+    try:
+        assert await read_pragma(manager, "journal_mode") == "memory"
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("auto_vacuum", ["INCREMENTAL", "NONE"])
+async def test_incremental_vacuum(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, auto_vacuum: str
+):
+    monkeypatch.setattr(settings, "SQLITE_AUTO_VACUUM", auto_vacuum)
+    manager = DatabaseSessionManager()
+    manager.init(f"sqlite+aiosqlite:///{tmp_path}/vacuum.db", settings)
+    try:
+        async with manager.connect() as connection:
+            await connection.execute(text("CREATE TABLE rows (value TEXT)"))
+            await connection.execute(
+                text("INSERT INTO rows VALUES (:value)"),
+                [{"value": "x" * 1000}] * 500,
+            )
+        async with manager.connect() as connection:
+            await connection.execute(text("DELETE FROM rows"))
+
+        async with manager.connect() as connection:
+            freed = await incremental_vacuum(connection, pages=10)
+            if auto_vacuum == "NONE":
+                assert freed is None
+                return
+            assert freed == 10
+            assert await incremental_vacuum(connection) > 0
+            assert await incremental_vacuum(connection) == 0
+        assert await read_pragma(manager, "freelist_count") == 0
+    finally:
+        await manager.close()
@@ -0,0 +1,63 @@
+import pytest
+
+from src.app.helpers.rate_limit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+
+    assert [bucket.take() for _ in range(3)] == [0, 0, 0]
+    assert bucket.take() == pytest.approx(0.5)
+
+    clock.now = 0.5
+    assert bucket.take() == 0
+    assert bucket.take() == pytest.approx(0.5)
+
+
+def test_token_bucket_refused_take_costs_nothing():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, burst=2, clock=clock)
+
+    assert bucket.take(2) == 0
+    assert bucket.take(2) == pytest.approx(2)
+    clock.now = 1
+    assert bucket.take(2) == pytest.approx(1)
+    clock.now = 2
+    assert bucket.take(2) == 0
+
+
+def test_token_bucket_never_holds_more_than_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=2, clock=clock)
+
+    clock.now = 100
+    assert bucket.take(2) == 0
+    assert bucket.take() == pytest.approx(0.1)
+
+
+def test_rate_limiter_drops_refilled_buckets():
+    clock = FakeClock()
+    limiter = RateLimiter(sweep_interval=10, clock=clock)
+
+    assert limiter.take("idle", rate=1, burst=5, cost=5) == 0
+    assert limiter.take("busy", rate=0.01, burst=5, cost=5) == 0
+    clock.now = 10
+    assert limiter.take("new", rate=1, burst=5) == 0
+
+    # "idle" has refilled; "busy" still remembers what it was charged
+    assert len(limiter) == 2
+    assert limiter.take("busy", rate=0.01, burst=5) > 0
+
+
+def test_rate_limiter_charges_the_full_cost():
+    limiter = RateLimiter()
+    assert limiter.take("key", rate=1, burst=2, cost=3) > 0
@@ -0,0 +1,76 @@
+import re
+
+import pytest
+
+from src.app.helpers.url_matcher import UrlMatcher, split_literal_prefix
+
+
+@pytest.mark.parametrize(
+    "url_regex, expected",
+    [
+        (".*", ("", True)),
+        ("https://example\\.com", ("https://example.com", True)),
+        ("https://example\\.com/.*", ("https://example.com/", True)),
+        ("^https://example\\.com/.*", ("https://example.com/", True)),
+        ("https://example.com/.*", ("https://example", False)),
+        ("https?://example.com", ("http", False)),
+        ("https://example\\.com/\\d+", ("https://example.com/", False)),
+        ("https://example\\.com/$", ("https://example.com/", False)),
+        ("https://a.com|https://b.com", ("", False)),
+        ("(?i)https://example.com", ("", False)),
+    ],
+)
+def test_split_literal_prefix(url_regex: str, expected: tuple[str, bool]):
+    assert split_literal_prefix(url_regex) == expected
+
+
+def test_url_matcher_agrees_with_re_match():
+    url_regexes = {
+        "all": ".*",
+        "none": None,
+        "prefix": "https://example\\.com",
+        "unescaped": "https://example.com/blog/.*",
+        "path": "https://example\\.com/blog/.*",
+        "digits": "https://example.com/blog/\\d+$",
+        "optional": "https?://example.com/.*",
+        "anywhere": ".*utm_source=.*",
+        "alternation": "https://(foo|bar).com/.*",
+        "other": "https://other.com/.*",
+    }
+    urls = [
+        "https://example.com",
+        "https://example.com/blog/42",
+        "https://example.com/blog/post",
+        "http://example.com/?utm_source=x",
+        "https://bar.com/page",
+        "https://other.com/",
+        "",
+    ]
+
+    matcher = UrlMatcher()
+    for key, url_regex in url_regexes.items():
+        assert matcher.add(key, url_regex)
+
+    for url in urls:
+        expected = {
+            key
+            for key, url_regex in url_regexes.items()
+            if url_regex is None or re.match(url_regex, url)
+        }
+        assert matcher.match(url) == expected, url
+
+
+def test_url_matcher_remove_and_invalid():
+    matcher = UrlMatcher()
+    matcher.add("a", "https://example.com/.*")
+    matcher.add("b", "https://example.com/.*")
+    assert not matcher.add("invalid", "https://example.com/(")
+
+    assert matcher.match("https://example.com/x") == {"a", "b"}
+    assert matcher.match(None) == {"a", "b", "invalid"}
+
+    matcher.remove("a")
+    matcher.add("b", "https://other.com/.*")
+    assert matcher.match("https://example.com/x") == set()
+    assert matcher.match("https://other.com/x") == {"b"}
+    assert len(matcher) == 2
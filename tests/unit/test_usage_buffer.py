@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from src.app.core.usage_buffer import UsageAttempt, UsageWriteBuffer
+
+
+@pytest.mark.asyncio
+async def test_usage_write_buffer_groups_concurrent_updates():
+    flushed: list[list[str]] = []
+
+    async def handler(attempts: list[UsageAttempt]):
+        flushed.append([attempt.webhook_usage_id for attempt in attempts])
+
+    buffer = UsageWriteBuffer()
+    buffer.start(handler, max_batch=3, flush_interval=0.01)
+
+    await asyncio.gather(
+        *[buffer.record(UsageAttempt(f"usage-{i}", "success", 1)) for i in range(5)]
+    )
+    await buffer.stop()
+
+    assert flushed == [["usage-0", "usage-1", "usage-2"], ["usage-3", "usage-4"]]
+    assert not buffer.is_running
+
+
+@pytest.mark.asyncio
+async def test_usage_write_buffer_propagates_write_errors():
+    async def handler(attempts: list[UsageAttempt]):
+        raise RuntimeError("database is locked")
+
+    buffer = UsageWriteBuffer()
+    buffer.start(handler, max_batch=10, flush_interval=0)
+
+    with pytest.raises(RuntimeError):
+        await buffer.record(UsageAttempt("usage-0", "error", 1))
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_usage_write_buffer_stop_writes_pending_updates():
+    flushed: list[str] = []
+
+    async def handler(attempts: list[UsageAttempt]):
+        flushed.extend(attempt.webhook_usage_id for attempt in attempts)
+
+    buffer = UsageWriteBuffer()
+    buffer.start(handler, max_batch=10, flush_interval=60)
+
+    pending = asyncio.create_task(buffer.record(UsageAttempt("usage-0", "success", 1)))
+    await asyncio.sleep(0)
+    await buffer.stop()
+
+    await pending
+    assert flushed == ["usage-0"]
+
+
+@pytest.mark.asyncio
+async def test_usage_write_buffer_retries_failed_batches():
+    calls: list[list[str]] = []
+
+    async def handler(attempts: list[UsageAttempt]):
+        calls.append([attempt.webhook_usage_id for attempt in attempts])
+        if len(calls) < 3:
+            raise RuntimeError("database is locked")
+
+    buffer = UsageWriteBuffer()
+    buffer.start(handler, max_batch=10, flush_interval=0.01, retry_backoff=0)
+
+    await asyncio.gather(
+        *[buffer.record(UsageAttempt(f"usage-{i}", "success", 1)) for i in range(2)]
+    )
+    await buffer.stop()
+
+    assert calls == [["usage-0", "usage-1"]] * 3
+
+
+@pytest.mark.asyncio
+async def test_usage_write_buffer_isolates_bad_updates():
+    written: list[str] = []
+
+    async def handler(attempts: list[UsageAttempt]):
+        if any(attempt.webhook_usage_id == "usage-1" for attempt in attempts):
+            raise ValueError("bad row")
+        written.extend(attempt.webhook_usage_id for attempt in attempts)
+
+    buffer = UsageWriteBuffer()
+    buffer.start(handler, max_batch=10, flush_interval=0.01, retry_backoff=0)
+
+    results = await asyncio.gather(
+        *[buffer.record(UsageAttempt(f"usage-{i}", "success", 1)) for i in range(3)],
+        return_exceptions=True,
+    )
+    await buffer.stop()
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], ValueError)
+    assert written == ["usage-0", "usage-2"]